@@ -0,0 +1,201 @@
+"""
+Materialized score table for the whole Job IQ answer space
+
+The questionnaire has a finite answer space (see batch_scoring.FIELD_RADICES),
+so every combination can be scored once, ahead of time. The table is a .npy
+file indexed by packed answer code; processes memory-map it read-only and
+share its pages through the OS cache, so scoring becomes one array index.
+
+Build it with:
+    python answer_table.py [output_path]
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+import config
+from batch_scoring import (
+    ANSWER_SPACE_SIZE,
+    SCORE_KEYS,
+    score_batch,
+    unpack_codes,
+)
+from scoring_spec import get_spec
+
+# Entry layout (uint32): dim1..dim7 in 3-bit fields (bits 0-20),
+# total in bits 21-25, maturity level in bits 26-28
+DIM_BITS = 3
+TOTAL_SHIFT = 21
+LEVEL_SHIFT = 26
+
+_BUILD_CHUNK = 1 << 21
+
+# Maturity level for every possible total
+_LEVELS = np.array(
+    [config.get_level_from_score(total) for total in range(config.MAX_SCORE + 1)],
+    dtype=np.uint32
+)
+
+
+def default_table_path():
+    """Resolve config.ANSWER_TABLE_PATH relative to the app directory"""
+    return Path(__file__).parent / config.ANSWER_TABLE_PATH
+
+
+def pack_entries(scores):
+    """
+    Pack score arrays (as returned by score_batch) into table entries
+
+    Returns:
+        uint32 NumPy array of packed entries
+    """
+    entries = np.zeros(len(scores['total']), dtype=np.uint32)
+    for i, key in enumerate(SCORE_KEYS[:7]):
+        entries |= scores[key].astype(np.uint32) << np.uint32(i * DIM_BITS)
+    total = scores['total'].astype(np.uint32)
+    entries |= total << np.uint32(TOTAL_SHIFT)
+    entries |= _LEVELS[total] << np.uint32(LEVEL_SHIFT)
+    return entries
+
+
+def unpack_entries(entries):
+    """
+    Inverse of pack_entries
+
+    Returns:
+        Dictionary of uint8 NumPy arrays keyed 'dim1' .. 'dim7', 'total', 'level'
+    """
+    entries = np.asarray(entries, dtype=np.uint32)
+    result = {}
+    for i, key in enumerate(SCORE_KEYS[:7]):
+        result[key] = ((entries >> np.uint32(i * DIM_BITS)) & np.uint32(0b111)).astype(np.uint8)
+    result['total'] = ((entries >> np.uint32(TOTAL_SHIFT)) & np.uint32(0b11111)).astype(np.uint8)
+    result['level'] = ((entries >> np.uint32(LEVEL_SHIFT)) & np.uint32(0b111)).astype(np.uint8)
+    return result
+
+
+def build_answer_table(path=None):
+    """
+    Enumerate the whole answer space and write the score table to disk
+
+    Args:
+        path: Output .npy path (defaults to config.ANSWER_TABLE_PATH)
+
+    Returns:
+        Path of the written table
+    """
+    path = Path(path) if path else default_table_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temporary file and rename, so readers never map a partial table
+    tmp_path = path.with_name(path.name + '.tmp')
+    table = np.lib.format.open_memmap(
+        tmp_path, mode='w+', dtype=np.uint32, shape=(ANSWER_SPACE_SIZE,)
+    )
+    for start in range(0, ANSWER_SPACE_SIZE, _BUILD_CHUNK):
+        codes = np.arange(start, min(start + _BUILD_CHUNK, ANSWER_SPACE_SIZE), dtype=np.uint32)
+        table[start:start + len(codes)] = pack_entries(score_batch(unpack_codes(codes)))
+    table.flush()
+    del table
+
+    tmp_path.replace(path)
+    with _tables_lock:
+        _tables.pop(path, None)  # remap the new file
+    return path
+
+
+_tables = {}  # path -> memory-mapped table; successful loads only
+_tables_lock = threading.Lock()
+
+
+def load_answer_table(path=None):
+    """
+    Memory-map the score table once per process
+
+    A missing or mismatched table is not remembered, so a table built after
+    the process started is picked up by the next call.
+
+    Returns:
+        Read-only uint32 NumPy array indexed by answer code, or None if the
+        table has not been built (or does not match the current answer space)
+    """
+    path = Path(path) if path else default_table_path()
+    table = _tables.get(path)
+    if table is not None:
+        return table
+    if not path.exists():
+        return None
+    table = np.load(path, mmap_mode='r')
+    if table.shape != (ANSWER_SPACE_SIZE,) or table.dtype != np.uint32:
+        return None
+    with _tables_lock:
+        return _tables.setdefault(path, table)
+
+
+def _check_codes(codes, size):
+    if codes.size and (codes.min() < 0 or codes.max() >= size):
+        raise ValueError(f"Answer codes must be in range(0, {size})")
+
+
+def score_codes(codes, version=None):
+    """
+    Score packed answer codes via the table, computing directly if it is absent
+
+    Args:
+        codes: Array-like of answer codes (see batch_scoring.pack_codes)
+        version: Assessment version of the answers (default: current). The
+            table covers the current version only; others are computed
+
+    Returns:
+        Dictionary of uint8 NumPy arrays keyed 'dim1' .. 'dim7', 'total', 'level'
+
+    Raises:
+        ValueError: if a code is outside the answer space
+    """
+    codes = np.asarray(codes)
+    _check_codes(codes, get_spec(version).answer_space_size)
+    codes = codes.astype(np.uint32, copy=False)
+    current = version in (None, config.ASSESSMENT_VERSION)
+    table = load_answer_table() if current else None
+    if table is not None:
+        entries = table[codes]
+    else:
+        entries = pack_entries(score_batch(unpack_codes(codes, version), version))
+    return unpack_entries(entries)
+
+
+def score_code(code):
+    """
+    Score a single packed answer code
+
+    Returns:
+        Dictionary keyed like calculate_jdmi_score's result plus 'level', with
+        plain int values
+
+    Raises:
+        ValueError: if the code is outside the answer space
+    """
+    code = int(code)
+    if not 0 <= code < ANSWER_SPACE_SIZE:
+        raise ValueError(f"Answer code out of range: {code}")
+    table = load_answer_table()
+    if table is not None:
+        entry = int(table[code])
+    else:
+        entry = int(pack_entries(score_batch(unpack_codes([code])))[0])
+
+    scores = {key: (entry >> (i * DIM_BITS)) & 0b111 for i, key in enumerate(SCORE_KEYS[:7])}
+    scores['total'] = (entry >> TOTAL_SHIFT) & 0b11111
+    scores['level'] = (entry >> LEVEL_SHIFT) & 0b111
+    return scores
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    output = build_answer_table(sys.argv[1] if len(sys.argv) > 1 else None)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {ANSWER_SPACE_SIZE:,} entries to {output} in {elapsed:.1f}s")
@@ -0,0 +1,328 @@
+"""
+Headless JSON API for Job IQ scoring
+
+A standalone HTTP entry point (standard library only) for integrations that
+only need scores, levels, recommendations and benchmarks, without the
+Streamlit UI's websocket and script reruns:
+
+    POST /score             one response dict, or a batch: a JSON list or
+                            {"responses": [...]}; items may also be packed
+                            answer codes (int or {"code": int})
+    GET  /levels            maturity levels with score ranges and descriptions
+    GET  /recommendations   recommendation catalog (id -> title, description)
+    GET  /benchmarks        current benchmarks (?industry=...&org_size=... for peers)
+    GET  /health
+
+Scoring uses the same utils functions as the app. Each result depends only
+on the 7 dimension scores, so its serialized JSON is cached per dimension
+vector (5^7 possible) and a batch is answered by joining cached fragments.
+Scores posted here are not recorded in the live benchmarks.
+
+Usage:
+    python api.py [--host 127.0.0.1] [--port 8600] [--warm-all]
+"""
+
+import argparse
+import json
+import textwrap
+import threading
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import config
+from answer_table import score_code
+from benchmarks import get_benchmark_service
+from scoring_spec import SPEC
+from utils import (
+    DIMENSION_KEYS,
+    DIMENSION_VECTOR_COUNT,
+    RECOMMENDATIONS,
+    calculate_jdmi_score,
+    dimension_vector_index,
+    get_level_info,
+    get_recommendation_ids,
+    recommendation_index,
+)
+
+
+class RequestError(ValueError):
+    """Invalid request; answered with a 4xx status and an error message"""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def _dumps(data):
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def score_item(item):
+    """
+    Score one batch item
+
+    Args:
+        item: Response dict (as built by the assessment form; checkboxes
+            true/false or 0/1, missing = unchecked), packed answer code, or
+            {"code": answer code}
+
+    Returns:
+        Scores dict keyed like calculate_jdmi_score's result
+
+    Raises:
+        ValueError: if the item is malformed or has an unknown answer
+    """
+    if isinstance(item, dict) and "code" in item:
+        item = item["code"]
+    if isinstance(item, int) and not isinstance(item, bool):
+        if not 0 <= item < SPEC.answer_space_size:
+            raise ValueError(f"Answer code out of range: {item}")
+        return score_code(item)
+    if not isinstance(item, dict):
+        raise ValueError("Expected a response object or an answer code")
+    for field, codes in SPEC.choice_codes.items():
+        answer = item.get(field)
+        # Options are strings; other JSON values (lists, objects) are not even hashable
+        if not isinstance(answer, str) or answer not in codes:
+            raise ValueError(f"Unknown {field} answer: {answer!r}")
+    for keys in SPEC.checkbox_groups.values():
+        for key in keys:
+            # Missing means unchecked; 0/1 are accepted as JSON-ish booleans
+            if key in item and not (isinstance(item[key], int) and item[key] in (0, 1)):
+                raise ValueError(f"Checkbox {key} must be true or false, not {item[key]!r}")
+    return calculate_jdmi_score(item)
+
+
+@lru_cache(maxsize=None)  # bounded by DIMENSION_VECTOR_COUNT
+def _result_json(index):
+    dim_scores = [(index // 5 ** i) % 5 for i in range(len(DIMENSION_KEYS))]
+    scores = dict(zip(DIMENSION_KEYS, dim_scores), total=sum(dim_scores))
+    level_info = get_level_info(scores["total"])
+    return _dumps({
+        "scores": scores,
+        "level": {"number": level_info["number"], "name": level_info["name"]},
+        "recommendations": get_recommendation_ids(scores),
+    })
+
+
+def result_json(scores):
+    """Serialized result (scores, level, recommendation ids) for a scores dict"""
+    return _result_json(dimension_vector_index(scores))
+
+
+def score_payload(payload):
+    """
+    Answer a POST /score body
+
+    A single item gets its result object (or a 400); a batch gets
+    {"results": [...]} with an {"error": ...} entry for each invalid item.
+
+    Returns:
+        Response body bytes
+    """
+    if isinstance(payload, dict) and "responses" in payload:
+        payload = payload["responses"]
+    if not isinstance(payload, list):
+        try:
+            return result_json(score_item(payload))
+        except ValueError as exc:
+            raise RequestError(str(exc)) from None
+
+    if len(payload) > config.SCORING_API_MAX_BATCH:
+        raise RequestError(
+            f"Batch of {len(payload)} exceeds {config.SCORING_API_MAX_BATCH} items",
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        )
+    parts = []
+    for item in payload:
+        try:
+            parts.append(result_json(score_item(item)))
+        except ValueError as exc:
+            parts.append(_dumps({"error": str(exc)}))
+    return b'{"results":[' + b",".join(parts) + b"]}"
+
+
+@lru_cache(maxsize=None)
+def levels_json():
+    """Serialized maturity levels, built once per process"""
+    levels = []
+    for number, (min_score, max_score) in config.LEVEL_THRESHOLDS.items():
+        level_info = get_level_info(min_score)
+        levels.append({
+            "number": number,
+            "name": level_info["name"],
+            "min_score": min_score,
+            "max_score": max_score,
+            "description": textwrap.dedent(level_info["description"]).strip(),
+        })
+    return _dumps({"levels": levels})
+
+
+@lru_cache(maxsize=None)
+def recommendations_json():
+    """Serialized recommendation catalog, built once per process"""
+    return _dumps({"recommendations": {rec_id: dict(entry) for rec_id, entry in RECOMMENDATIONS.items()}})
+
+
+_benchmark_json = {}  # segment -> (snapshot, serialized snapshot)
+_benchmark_lock = threading.Lock()
+
+
+def benchmarks_json(industry=None, org_size=None):
+    """
+    Serialized benchmarks: the overall snapshot, or a peer segment's
+
+    Re-serialized only when the service publishes a new snapshot.
+
+    Raises:
+        RequestError: 404 if the peer segment has too few assessments
+    """
+    service = get_benchmark_service()
+    segment = (industry or None, org_size or None)
+    if segment == (None, None):
+        snapshot = service.snapshot()
+    else:
+        snapshot = service.peer_snapshot(*segment)
+        if snapshot is None:
+            raise RequestError("Not enough assessments in this peer segment", HTTPStatus.NOT_FOUND)
+
+    cached = _benchmark_json.get(segment)
+    if cached is None or cached[0] is not snapshot:
+        data = snapshot._asdict()
+        data["level_distribution"] = dict(snapshot.level_distribution)
+        cached = (snapshot, _dumps(data))
+        with _benchmark_lock:
+            _benchmark_json[segment] = cached
+    return cached[1]
+
+
+def warm_up(all_vectors=False):
+    """
+    Load the per-process tables before serving
+
+    Args:
+        all_vectors: Also serialize the result for every dimension vector
+            (~1 s, ~35 MB), so no request pays for a cache miss
+    """
+    score_code(0)  # memory-maps the answer table
+    recommendation_index()
+    levels_json()
+    recommendations_json()
+    benchmarks_json()
+    if all_vectors:
+        for index in range(DIMENSION_VECTOR_COUNT):
+            _result_json(index)
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so batch clients reuse connections
+    server_version = "JobIQ"
+    # Headers and body are separate writes; with Nagle on, small keep-alive
+    # responses wait out the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    _ROUTES = {
+        "/levels": levels_json,
+        "/recommendations": recommendations_json,
+        "/health": lambda: b'{"status":"ok"}',
+    }
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path == "/benchmarks":
+                query = parse_qs(url.query)
+                body = benchmarks_json(query.get("industry", [None])[0], query.get("org_size", [None])[0])
+            elif url.path in self._ROUTES:
+                body = self._ROUTES[url.path]()
+            else:
+                raise RequestError(f"Unknown path: {url.path}", HTTPStatus.NOT_FOUND)
+        except RequestError as exc:
+            return self._send_error(exc)
+        self._send(HTTPStatus.OK, body)
+
+    def do_POST(self):
+        try:
+            if urlsplit(self.path).path != "/score":
+                self.close_connection = True  # body left unread
+                raise RequestError(f"Unknown path: {self.path}", HTTPStatus.NOT_FOUND)
+            body = score_payload(self._read_json())
+        except RequestError as exc:
+            return self._send_error(exc)
+        self._send(HTTPStatus.OK, body)
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.close_connection = True  # body length unknown, so it cannot be skipped
+            raise RequestError("Invalid Content-Length") from None
+        if length > config.SCORING_API_MAX_BODY_BYTES:
+            self.close_connection = True  # body left unread
+            raise RequestError("Request body too large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise RequestError("Request body is not valid JSON") from None
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")  # tell keep-alive clients to reconnect
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, exc):
+        self._send(exc.status, _dumps({"error": str(exc)}))
+
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+
+def make_server(host=None, port=None, access_log=False):
+    """
+    Build (but do not start) the API server; one thread per connection
+
+    Args:
+        host: Bind address (default: config.SCORING_API_HOST)
+        port: Port (default: config.SCORING_API_PORT; 0 picks a free port)
+        access_log: Log every request to stderr
+    """
+    server = ThreadingHTTPServer(
+        (host or config.SCORING_API_HOST, config.SCORING_API_PORT if port is None else port),
+        ScoringRequestHandler,
+    )
+    server.daemon_threads = True
+    server.access_log = access_log
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Job IQ scoring as JSON over HTTP")
+    parser.add_argument("--host", help=f"bind address (default: {config.SCORING_API_HOST})")
+    parser.add_argument("--port", type=int, help=f"port (default: {config.SCORING_API_PORT})")
+    parser.add_argument("--warm-all", action="store_true", help="serialize every dimension vector's result at startup")
+    parser.add_argument("--access-log", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    warm_up(all_vectors=args.warm_all)
+    server = make_server(args.host, args.port, access_log=args.access_log)
+    host, port = server.server_address[:2]
+    print(f"Job IQ scoring API on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Load benchmark for the headless scoring API (api.py)
+
+Starts the API in a subprocess (or targets a running one with --url) and
+drives POST /score from several client processes over keep-alive
+connections, with batches drawn from a pool of random response sets.
+Reports requests/s, scored items/s and latency percentiles.
+
+Usage:
+    python api_bench.py [--clients 4] [--batch 1] [--duration 10] [--url http://127.0.0.1:8600]
+"""
+
+import argparse
+import http.client
+import json
+import random
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from scoring_spec import SPEC
+
+
+def random_responses(rng):
+    """A random, valid response dict"""
+    responses = {field: rng.choice(options) for field, options in SPEC.choice_options.items()}
+    for keys in SPEC.checkbox_groups.values():
+        for key in keys:
+            responses[key] = rng.random() < 0.5
+    return responses
+
+
+def make_bodies(count, batch, distinct, seed=0):
+    """`count` request bodies of `batch` items each, drawn from `distinct` response sets"""
+    rng = random.Random(seed)
+    pool = [random_responses(rng) for _ in range(distinct)]
+    bodies = []
+    for _ in range(count):
+        items = [rng.choice(pool) for _ in range(batch)]
+        bodies.append(json.dumps(items[0] if batch == 1 else {"responses": items}).encode())
+    return bodies
+
+
+def _client(url, bodies, duration):
+    # Runs in a client process: POST bodies round-robin until the deadline
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port)
+    headers = {"Content-Type": "application/json"}
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    i = 0
+    while True:
+        started = time.perf_counter()
+        if started >= deadline:
+            break
+        connection.request("POST", "/score", bodies[i % len(bodies)], headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        errors += response.status != 200
+        i += 1
+    connection.close()
+    return latencies, errors
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_benchmark(url, clients=4, batch=1, duration=10.0, distinct=1000):
+    """
+    Drive POST /score from `clients` processes for `duration` seconds
+
+    Returns:
+        Dictionary with 'requests', 'items', 'errors', 'requests_per_s',
+        'items_per_s' and latency percentiles in milliseconds
+    """
+    bodies = make_bodies(256, batch, distinct)
+    _client(url, bodies[:1], 0.5)  # warm the server's caches and threads
+    with ProcessPoolExecutor(clients) as pool:
+        started = time.perf_counter()
+        futures = [pool.submit(_client, url, bodies[i::clients] or bodies, duration) for i in range(clients)]
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "items": requests * batch,
+        "errors": sum(errors for _, errors in results),
+        "requests_per_s": requests / elapsed,
+        "items_per_s": requests * batch / elapsed,
+        "p50_ms": 1000 * _percentile(latencies, 0.50),
+        "p95_ms": 1000 * _percentile(latencies, 0.95),
+        "p99_ms": 1000 * _percentile(latencies, 0.99),
+    }
+
+
+def start_server():
+    """Start api.py on a free port in a subprocess; returns (process, url)"""
+    process = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "api.py"), "--port", "0"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    match = re.search(r"http://\S+", line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"API server did not start: {line!r}")
+    return process, match.group(0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Job IQ scoring API")
+    parser.add_argument("--url", help="running API to target (default: start one)")
+    parser.add_argument("--clients", type=int, default=4, help="client processes")
+    parser.add_argument("--batch", type=int, default=1, help="items per request")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--distinct", type=int, default=1000, help="distinct response sets in the request pool")
+    args = parser.parse_args(argv)
+
+    process, url = (None, args.url) if args.url else start_server()
+    try:
+        result = run_benchmark(url, args.clients, args.batch, args.duration, args.distinct)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(
+        f"{result['requests']} requests ({result['items']} items, {result['errors']} errors) "
+        f"in {args.duration:.0f}s from {args.clients} clients, batch {args.batch}"
+    )
+    print(f"{result['requests_per_s']:,.0f} requests/s, {result['items_per_s']:,.0f} items/s")
+    print(f"latency p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,17 @@ Job IQ — Job Intelligence Index (powered by Oz)
 Interactive Streamlit application for assessing organizational job data maturity
 """
 
+import sys
+
 import streamlit as st
-import plotly.graph_objects as go
-import pandas as pd
-import streamlit.components.v1 as components
-import base64
-import json
-from fpdf import FPDF
-from streamlit import cache_data
-from streamlit_lottie import st_lottie
-from utils import (
-    calculate_jdmi_score,
-    get_level_info,
-    get_recommendations,
-    get_dimension_descriptions,
-)
-from pathlib import Path
+import config
+from assets import asset_url, get_lottie, lite_mode, script_html, stylesheet_html
+from caching import cache_stats, session_cache
+from rerun_stats import get_rerun_stats
+from response_codec import PackedResponses
+from scoring_spec import SPEC
+from session_result import SessionResult
+from utils import get_dimension_descriptions
 
 # Page configuration
 st.set_page_config(
@@ -28,334 +23,26 @@ st.set_page_config(
     menu_items=None
 )
 
-# Custom CSS
-st.markdown(
-    """
-<style>
-    :root {
-        --c-verylight: #E8FDFF;
-        --c-light: #BFFAFF;
-        --c-mid: #76E9F3;
-        --c-teal: #3AC1CC;
-        --c-deeper: #308B9A;
-        --c-dark: #0D5865;
-        --c-text-dark: #3C3C3C;
-        --c-text-light:#f9f9f9;
-        --c-background: #f9f9f9;
-        --c-button: #FF8743;
-        /* Streamlit accent override (affects some widgets' default red) */
-        --primary-color: #FF8743;
-        --c-panel-light: #FFBCAC; /* light gray panels */
-    }
-    .stApp {
-        background: var(--c-background) !important;
-        color: var(--c-text-dark) !important;
-    }
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: var(--c-text-dark);
-        margin-bottom: 0.5rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: var(--c-text-dark);
-        margin-bottom: 2rem;
-    }
-    .dimension-header {
-        font-size: 1.3rem;
-        font-weight: 600;
-        color: var(--c-text-dark);
-        margin-top: 1.5rem;
-        margin-bottom: 0.5rem;
-    }
-    .score-box {
-        padding: 2rem;
-        border-radius: 0.5rem;
-        background: var(--c-dark);
-        color: var(--c-text-light);
-        text-align: center;
-        margin: 1rem 0;
-        box-shadow: 0 8px 24px rgba(0,0,0,0.25);
-    }
-    .score-number {
-        font-size: 4rem;
-        font-weight: 700;
-        color: var(--c-text-light);
-    }
-    .level-badge {
-        display: inline-block;
-        padding: 0.5rem 1rem;
-        border-radius: 2rem;
-        font-weight: 600;
-        margin: 0.5rem 0;
-        background-color: var(--c-deeper);
-        color: var(--c-text-dark);
-    }
-    .recommendation-box {
-        padding: 1rem;
-        border-left: 4px solid var(--c-mid);
-        background-color: rgba(56, 139, 154, 0.35);
-        margin: 0.5rem 0;
-        border-radius: 0.25rem;
-        color: var(--c-text-dark);
-    }
-    .footer {
-        text-align: center;
-        color: var(--c-text-dark);
-        font-size: 0.875rem;
-        margin-top: 3rem;
-        padding: 2rem 0;
-        border-top: 1px solid rgba(255,255,255,0.15);
-    }
-    a, a:visited {
-        color: var(--c-light);
-    }
-    /* Buttons (primary and default) */
-    .stButton > button,
-    button[kind="primary"] {
-        background-color: var(--c-button) !important;
-        border: 1px solid var(--c-button) !important;
-        color: var(--c-text-dark) !important;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-    }
-    .stButton > button:hover,
-    button[kind="primary"]:hover {
-        filter: brightness(1.05);
-    }
-    /* Sidebar background and text */
-    [data-testid="stSidebar"], section[data-testid="stSidebar"] {
-        background-color: var(--c-dark) !important;
-        color: var(--c-text-light) !important;
-    }
-    [data-testid="stSidebar"] * {
-        color: var(--c-text-light) !important;
-    }
-    /* Top header bar */
-    header[data-testid="stHeader"] {
-        background: var(--c-dark) !important;
-        color: var(--c-text-dark) !important;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-    }
-    header[data-testid="stHeader"] * {
-        color: var(--c-text-dark) !important;
-    }
-    /* Plotly charts: remove dark paper/background inside, style container as boxed panel */
-    [data-testid="stPlotlyChart"] > div,
-    .stPlotlyChart > div {
-        background-color: transparent !important;
-    }
-    [data-testid="stPlotlyChart"] {
-        background-color: var(--c-dark) !important;
-        border-radius: 10px !important;
-        padding: 1rem 1.25rem !important;
-        color: var(--c-text-light) !important;
-        overflow: hidden !important;
-    }
-    /* Light gray background for st-ca containers */
-    .st-ca,
-    .stApp .st-ca {
-        background-color: var(--c-panel-light) !important;
-    }
-    /* ---- Form controls accent color overrides ---- */
-    /* Radios and checkboxes */
-    input[type="radio"],
-    input[type="checkbox"] {
-        accent-color: var(--c-button) !important;
-    }
-    /* Ensure question text/labels use dark text in main content */
-    section.main label,
-    section.main .stMarkdown,
-    section.main .stMarkdown p,
-    section.main [data-baseweb="radio"] label,
-    section.main [data-baseweb="checkbox"] label,
-    section.main [data-baseweb="slider"] [class*="Label"],
-    section.main [data-baseweb="slider"] [class*="tick"],
-    section.main [data-baseweb="slider"] [class*="mark"] {
-        color: var(--c-text-dark) !important;
-    }
-    /* Specific emotion class override for text color */
-    .stApp .st-emotion-cache-1j90q2q {
-        color: var(--c-text-dark) !important;
-    }
-    /* Benchmarking metrics text color */
-    .stMetric label, .stMetric div[data-testid="stMetricValue"], .stMetric div[data-testid="stMetricDelta"] {
-        color: var(--c-text-dark) !important;
-    }
-    /* Alternative metric selectors */
-    div[data-testid="stMetric"] label, div[data-testid="stMetric"] span, div[data-testid="stMetric"] div {
-        color: var(--c-text-dark) !important;
-    }
-    /* Specific style override for selection container */
-    .stApp .st-emotion-cache-11ofl8m {
-        position: relative !important;
-        display: flex !important;
-        width: 100% !important;
-        min-width: 0px !important;
-        overflow: hidden !important;
-        font-size: inherit !important;
-        padding: 0.25rem 0.75rem !important;
-        min-height: calc(-2px + 2.5rem) !important;
-        -webkit-box-align: center !important;
-        /* align-items: center; */
-        cursor: pointer !important;
-        list-style-type: none !important;
-        background-color: rgba(0, 0, 0, 0.2) !important;
-        border-radius: 0.5rem 0.5rem 0px 0px !important;
-        transition: border-radius 200ms cubic-bezier(0.23, 1, 0.32, 1), background-color 150ms !important;
-    }
-    /* Sliders (Streamlit/BaseWeb) */
-    div[data-baseweb="slider"] [role="slider"] {
-        background-color: var(--c-button) !important;   /* thumb */
-        border-color: var(--c-button) !important;
-    }
-    div[data-baseweb="slider"] > div > div {
-        background-color: rgba(255, 135, 67, 0.30) !important; /* active track */
-    }
-    /* Select slider pills */
-    .stSelectSlider [data-baseweb="tag"] {
-        background-color: var(--c-button) !important;
-        color: var(--c-text-dark) !important;
-        border-color: var(--c-button) !important;
-    }
-    /* BaseWeb Radio refinements (circle + checked state) */
-    div[data-baseweb="radio"] label > div:first-child {
-        border-color: var(--c-button) !important;
-    }
-    div[data-baseweb="radio"] label[aria-checked="true"] > div:first-child {
-        background-color: var(--c-button) !important;
-        border-color: var(--c-button) !important;
-    }
-    div[data-baseweb="radio"] svg {
-        color: var(--c-button) !important;
-        fill: var(--c-button) !important;
-    }
-    /* Slider mark/label color */
-    div[data-baseweb="slider"] [class*="tick"],
-    div[data-baseweb="slider"] [class*="mark"],
-    div[data-baseweb="slider"] [class*="Label"] {
-        color: var(--c-button) !important;
-    }
-    /* Catch-all override for Streamlit danger/red bg (e.g., .st-b9) */
-    .stApp .st-b9 {
-        background-color: var(--c-button) !important;
-        color: var(--c-text-dark) !important;
-        border-color: var(--c-button) !important;
-    }
-    /* Specific emotion class overrides from examples */
-    .stApp .st-emotion-cache-jigjfz {
-        color: var(--c-button) !important;
-    }
-    .stApp .st-ey {
-        background: linear-gradient(to right, var(--c-button) 0%, var(--c-button) 25%, rgba(172, 177, 195, 0.25) 25%, rgba(172, 177, 195, 0.25) 100%) !important;
-    }
-    /* Fallback: any element with inline red bg (covers background and background-image) */
-    .stApp [style*="rgb(255, 75, 75)"],
-    .stApp [style*="rgb(255,75,75)"],
-    .stApp [style*="rgba(255, 75, 75"],
-    .stApp [style*="#ff4b4b"] {
-        background: var(--c-button) !important;
-        background-color: var(--c-button) !important;
-        background-image: none !important;
-        color: var(--c-text-dark) !important;
-        border-color: var(--c-button) !important;
-    }
-    /* Fallback: any inline red text color */
-    .stApp [style*="color: rgb(255, 75, 75)"],
-    .stApp [style*="color:rgb(255,75,75)"] {
-        color: var(--c-button) !important;
-    }
-    /* Fallback: any inline red linear gradient track (generic matcher) */
-    .stApp [style*="linear-gradient"][style*="255, 75, 75"],
-    .stApp [style*="linear-gradient"][style*="255,75,75"] {
-        background-image: linear-gradient(to right, var(--c-button) 0%, var(--c-button) 50%, rgba(172, 177, 195, 0.25) 50%, rgba(172, 177, 195, 0.25) 100%) !important;
-    }
-
-    /* Hide the entire top header bar for clean, branded experience */
-    .stApp header {
-        display: none !important;
-    }
-
-    /* Hide any remaining header elements and toolbar */
-    .stApp [data-testid="stHeader"] {
-        display: none !important;
-    }
-
-    .stApp [data-testid="stToolbar"] {
-        display: none !important;
-    }
-
-    /* Hide app title and branding area */
-    .stApp .st-emotion-cache-1avcm0n {
-        display: none !important;
-    }
-
-    /* Additional header elements to hide */
-    .stApp .st-emotion-cache-1c7y2kd {
-        display: none !important;
-    }
-</style>
-""",
-    unsafe_allow_html=True,
-)
+# Branding CSS (theme.css + config.THEME_COLORS): a hashed static bundle the browser caches
+st.markdown(stylesheet_html(), unsafe_allow_html=True)
 
 
 def init_session_state():
     """Initialize session state variables"""
     if "assessment_complete" not in st.session_state:
         st.session_state.assessment_complete = False
-    if "results_ready" not in st.session_state:
-        st.session_state.results_ready = False
-    if "responses" not in st.session_state:
-        st.session_state.responses = {}
-    if "scores" not in st.session_state:
-        st.session_state.scores = None
-    if "level_info" not in st.session_state:
-        st.session_state.level_info = None
+    if "result" not in st.session_state:
+        st.session_state.result = None  # SessionResult once the form is submitted
+    if "script_runs" not in st.session_state:
+        st.session_state.script_runs = 0  # full runs since this assessment started
 
 
 def scroll_to_top():
     """Force the viewport to scroll to the top after layout is rendered."""
-    components.html(
-        """
-        <script>
-        (function() {
-          const goTop = () => {
-            try {
-              // Disable automatic scroll restoration
-              if ('scrollRestoration' in window.history) {
-                window.history.scrollRestoration = 'manual';
-              }
-
-              const doc = window.parent && window.parent.document ? window.parent.document : document;
-
-              // Try Streamlit main container first
-              let main = doc.querySelector('section.main')
-                        || doc.querySelector('main')
-                        || doc.body;
-
-              if (main && main.scrollTo) {
-                main.scrollTo({ top: 0, left: 0, behavior: 'auto' });
-              }
-
-              // Also scroll window as a fallback
-              window.scrollTo(0, 0);
-              if (window.parent && window.parent.scrollTo) {
-                window.parent.scrollTo(0, 0);
-              }
-            } catch (e) {
-              window.scrollTo(0, 0);
-            }
-          };
-
-          // Run immediately and once more after layout has likely settled
-          goTop();
-          setTimeout(goTop, 150);
-        })();
-        </script>
-        """,
-        height=0,
-    )
+    import streamlit.components.v1 as components
+
+    # The script lives in the cached theme.js bundle; the frame only references it
+    components.html(script_html(), height=0)
 
 
 def render_intro():
@@ -398,191 +85,84 @@ def render_assessment_form():
 
     responses = {}
 
-    # Dimension 1: Coverage/Completeness
-    st.markdown(
-        '<div class="dimension-header">1. Coverage/Completeness of Skills Data</div>',
-        unsafe_allow_html=True,
-    )
-    st.markdown(
-        "*What percentage of your job descriptions include defined skills or competencies?*"
-    )
-    responses["coverage"] = st.select_slider(
-        "Coverage Percentage",
-        options=["<25%", "25-49%", "50-74%", "75-89%", "≥90%"],
-        key="coverage",
-        label_visibility="collapsed",
-    )
-
-    # Dimension 2: Governance/Ownership
-    st.markdown(
-        '<div class="dimension-header">2. Governance Cadence/Process Ownership</div>',
-        unsafe_allow_html=True,
-    )
-    st.markdown("*How do you currently manage job and skills data?*")
-    responses["governance"] = st.radio(
-        "Operating Model",
-        options=[
-            "Ongoing governed program with clear ownership and regular reviews",
-            "Primarily project-based with temporary ownership",
-            "Decentralized — each function manages independently",
-            "We do not actively manage job/skills data today",
-        ],
-        key="governance",
-        label_visibility="collapsed",
-    )
-
-    # Dimension 3: Freshness/Velocity
-    st.markdown(
-        '<div class="dimension-header">3. Freshness/Change Velocity</div>',
-        unsafe_allow_html=True,
-    )
-    st.markdown("*When you need to update a job description, how quickly can it go live?*")
-    responses["velocity"] = st.select_slider(
-        "Time to Publish",
-        options=[
-            "More than 30 days",
-            "15-30 days",
-            "8-14 days",
-            "3-7 days",
-            "Less than 3 days",
-        ],
-        key="velocity",
-        label_visibility="collapsed",
-    )
-
-    # Dimension 4: Architecture Alignment
-    st.markdown(
-        '<div class="dimension-header">4. Architecture Alignment</div>',
-        unsafe_allow_html=True,
-    )
-    st.markdown(
-        "*Which of the following are linked to your job/skills data? (Select all that apply)*"
-    )
-    responses["arch_mobility"] = st.checkbox(
-        "Internal mobility and career paths", key="arch_mobility"
-    )
-    responses["arch_comp"] = st.checkbox(
-        "Compensation and job leveling", key="arch_comp"
-    )
-    responses["arch_planning"] = st.checkbox("Workforce planning", key="arch_planning")
-
-    # Dimension 5: System Integration
-    st.markdown(
-        '<div class="dimension-header">5. System Fragmentation/Integration</div>',
-        unsafe_allow_html=True,
-    )
-    st.markdown("*Are job data updates automatically propagated across your HR systems?*")
-    responses["integration"] = st.radio(
-        "System Synchronization",
-        options=[
-            "All core systems fully synchronized (HRIS, ATS, Comp, LMS)",
-            "Most systems integrated (3 of 4)",
-            "Some systems connected, but significant manual work",
-            "Systems operate independently (manual exports/imports)",
-        ],
-        key="integration",
-        label_visibility="collapsed",
-    )
+    for entry in SPEC.questionnaire:
+        st.markdown(
+            f'<div class="dimension-header">{entry["heading"]}</div>',
+            unsafe_allow_html=True,
+        )
+        if entry["prompt"]:
+            st.markdown(entry["prompt"])
+
+        if entry["type"] == "choice":
+            widget = st.select_slider if entry["widget"] == "select_slider" else st.radio
+            responses[entry["field"]] = widget(
+                entry["label"],
+                options=SPEC.choice_options[entry["field"]],
+                key=entry["field"],
+                label_visibility="collapsed",
+            )
+        else:
+            # Multiple checkbox groups are laid out side by side
+            groups = entry["groups"]
+            containers = st.columns(len(groups)) if len(groups) > 1 else [st.container()]
+            for container, group in zip(containers, groups):
+                with container:
+                    if group.get("prompt"):
+                        st.markdown(group["prompt"])
+                    for key, label in group["checkboxes"]:
+                        responses[key] = st.checkbox(label, key=key)
 
-    # Dimension 6: Controls/Compliance
-    st.markdown(
-        '<div class="dimension-header">6. Controls/Compliance (including Bias)</div>',
-        unsafe_allow_html=True,
-    )
-    st.markdown("*Which governance controls are in place? (Select all that apply)*")
-    responses["control_ownership"] = st.checkbox(
-        "Clear ownership of job/skills content", key="control_ownership"
-    )
-    responses["control_approvals"] = st.checkbox(
-        "Formal approval workflows", key="control_approvals"
-    )
-    responses["control_lineage"] = st.checkbox(
-        "Version history and audit trails", key="control_lineage"
-    )
-    responses["control_bias"] = st.checkbox(
-        "Bias review and compliance checks", key="control_bias"
-    )
+    st.markdown("---")
 
-    # Dimension 7: Ability to Act
-    st.markdown(
-        '<div class="dimension-header">7. Ability to Act (Analytics/Insights)</div>',
-        unsafe_allow_html=True,
-    )
+    # Organization info (optional) — feeds the "companies like you" benchmarks
+    if config.ENABLE_ORG_INFO_COLLECTION:
+        with st.expander("Optional: Organization Information", expanded=False):
+            col1, col2 = st.columns(2)
+            with col1:
+                responses["industry"] = st.selectbox(
+                    "Industry", config.INDUSTRY_OPTIONS, key="industry"
+                )
+            with col2:
+                responses["org_size"] = st.selectbox(
+                    "Organization Size", config.ORG_SIZE_OPTIONS, key="org_size"
+                )
 
-    col1, col2 = st.columns(2)
+    return responses
 
-    with col1:
-        st.markdown("*Skills data drives decisions for:* (Select all)")
-        responses["act_reskilling"] = st.checkbox(
-            "Reskilling/upskilling programs", key="act_reskilling"
-        )
-        responses["act_mobility"] = st.checkbox(
-            "Internal mobility decisions", key="act_mobility"
-        )
-        responses["act_comp"] = st.checkbox(
-            "Compensation decisions", key="act_comp"
-        )
-        responses["act_hiring"] = st.checkbox(
-            "Hiring/requisition requirements", key="act_hiring"
-        )
-        responses["act_planning"] = st.checkbox(
-            "Workforce planning", key="act_planning"
-        )
 
-    with col2:
-        st.markdown("*We track these metrics:* (Select all)")
-        responses["metric_cycle"] = st.checkbox(
-            "Cycle times (JD → Req → Hire)", key="metric_cycle"
-        )
-        responses["metric_exception"] = st.checkbox(
-            "Exception rates / MTTR", key="metric_exception"
-        )
-        responses["metric_ttp"] = st.checkbox(
-            "Time-to-publish", key="metric_ttp"
-        )
-        responses["metric_mobility"] = st.checkbox(
-            "Internal mobility rate", key="metric_mobility"
-        )
+def results_benchmarks(result):
+    """
+    Benchmark, peer snapshot and percentile label for this session's results
 
-    st.markdown("---")
+    Computed once per assessment (session cache), so the page, its reruns and
+    the PDF report show the same figures until the session submits again.
 
-    # Organization info (optional) — disabled per request
-    # with st.expander("Optional: Organization Information", expanded=False):
-    #     col1, col2 = st.columns(2)
-    #     with col1:
-    #         responses["org_name"] = st.text_input(
-    #             "Organization Name (optional)", key="org_name"
-    #         )
-    #         responses["industry"] = st.selectbox(
-    #             "Industry",
-    #             [
-    #                 "",
-    #                 "Technology",
-    #                 "Healthcare",
-    #                 "Financial Services",
-    #                 "Manufacturing",
-    #                 "Retail",
-    #                 "Education",
-    #                 "Professional Services",
-    #                 "Other",
-    #             ],
-    #             key="industry",
-    #         )
-    #     with col2:
-    #         responses["org_size"] = st.selectbox(
-    #             "Organization Size",
-    #             ["", "< 500", "500-2,000", "2,000-5,000", "5,000-10,000", "> 10,000"],
-    #             key="org_size",
-    #         )
-    #         responses["email"] = st.text_input(
-    #             "Email (optional, for results)", key="email"
-    #         )
+    Returns:
+        (BenchmarkSnapshot, peer BenchmarkSnapshot or None, percentile label)
+    """
+    from benchmarks import get_benchmark_service
+    from percentiles import get_percentile_label
+
+    cache = session_cache()
+    service = get_benchmark_service()
+    scores = result.scores
+    return (
+        cache.get("benchmark", service.snapshot),
+        # "Companies like you", when org info was given and enough peers exist
+        cache.get("peer", lambda: service.peer_snapshot(**result.org_info)),
+        # Labels repeat across sessions; keep one copy of each
+        cache.get("percentile_label", lambda: sys.intern(get_percentile_label(scores["total"]))),
+    )
 
-    return responses
 
+def render_results(result):
+    """Render the results section for a SessionResult"""
+    # Imported on first use (see import_budget.py): the form page never needs it
+    from charts import create_radar_chart, create_radar_svg
 
-def render_results(responses, scores, level_info):
-    """Render the results section"""
+    scores = result.scores
+    level_info = result.level_info
+    benchmark, peer, percentile_label = results_benchmarks(result)
 
     st.markdown("---")
     st.markdown('<h2 id="results-header">Your Job IQ Results</h2>', unsafe_allow_html=True)
@@ -591,15 +171,11 @@ def render_results(responses, scores, level_info):
     col1, col2, col3 = st.columns([1, 2, 1])
 
     with col2:
-        # Load wizard image
-        _assets_dir = Path(__file__).parent
-        _wizard_img = _assets_dir / "oz-grabbing-hat@3x.png"
+        # Wizard image (display-sized variant, encoded once per process)
+        wizard_url = asset_url("wizard")
         img_html = ""
-        if _wizard_img.exists():
-            # Convert to base64 for embedding in HTML
-            with open(_wizard_img, "rb") as f:
-                img_data = base64.b64encode(f.read()).decode()
-            img_html = f'<img src="data:image/png;base64,{img_data}" style="width: 180px; height: auto;" alt="Wizard">'
+        if wizard_url:
+            img_html = f'<img src="{wizard_url}" style="width: 180px; height: auto;" alt="Wizard">'
 
         st.markdown(
             f"""
@@ -623,17 +199,20 @@ def render_results(responses, scores, level_info):
     st.markdown("---")
     st.markdown("### Dimensional Breakdown")
 
-    # Radar chart inside styled panel
-    fig = create_radar_chart(scores)
-    st.plotly_chart(fig, use_container_width=True)
+    # Radar chart (memoized per score vector and benchmark). Lite clients get the
+    # native SVG rendering, which skips loading the plotly bundle
+    if lite_mode():
+        svg = create_radar_svg(scores, benchmark, peer=peer)
+        st.markdown(f'<div style="text-align: center;">{svg}</div>', unsafe_allow_html=True)
+    else:
+        fig = create_radar_chart(scores, benchmark, peer=peer)
+        st.plotly_chart(fig, use_container_width=True)
 
     # Recommendations
     st.markdown("---")
     st.markdown("### Personalized Recommendations")
 
-    recommendations = get_recommendations(scores, level_info["number"])
-
-    for i, rec in enumerate(recommendations, 1):
+    for i, rec in enumerate(result.recommendations, 1):
         st.markdown(
             f"""
         <div class="recommendation-box">
@@ -648,25 +227,31 @@ def render_results(responses, scores, level_info):
     st.markdown("---")
     st.markdown("### Benchmarking")
 
-    col1, col2, col3 = st.columns(3)
+    if peer is not None:
+        col1, col2, col_peer, col3 = st.columns(4)
+    else:
+        col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric("Your Level", f"Level {level_info['number']}")
 
     with col2:
-        # Based on research data
-        avg_score = 14.28
-        st.metric("Industry Average", "14.3 / 28", f"{scores['total'] - avg_score:+.1f}")
+        # Live benchmark (research data until enough assessments are stored)
+        avg_score = benchmark.mean_score
+        st.metric("Industry Average", f"{avg_score:.1f} / 28", f"{scores['total'] - avg_score:+.1f}")
+
+    if peer is not None:
+        with col_peer:
+            st.metric(
+                "Companies Like You",
+                f"{peer.mean_score:.1f} / 28",
+                f"{scores['total'] - peer.mean_score:+.1f}",
+                help=f"Based on {peer.count} assessments in your peer group",
+            )
 
     with col3:
-        # Percentile estimate
-        if scores["total"] >= 20:
-            percentile = "Top 10%"
-        elif scores["total"] >= 14:
-            percentile = "Top 50%"
-        else:
-            percentile = "Bottom 50%"
-        st.metric("Estimated Percentile", percentile)
+        # Percentile from the live population (research estimate until enough data)
+        st.metric("Estimated Percentile", percentile_label)
 
     # Key insights
     st.markdown("---")
@@ -722,29 +307,54 @@ def render_results(responses, scores, level_info):
 
     # Action buttons at the bottom of results
     st.markdown("---")
+    render_result_actions()
+
+
+@st.fragment
+def render_result_actions():
+    """
+    Retake / PDF / consultation buttons
+
+    A fragment: clicking "Download Report (PDF)" or "Schedule Consultation"
+    reruns only this function, not the whole results page.
+    """
+    # Count only runs of the fragment on its own (every full run also calls it)
+    if st.session_state.get("actions_script_run") == st.session_state.script_runs:
+        get_rerun_stats().record_run(fragment=True)
+    st.session_state.actions_script_run = st.session_state.script_runs
     col1, col2, col3 = st.columns([1, 1, 1])
 
     with col1:
         if st.button("Retake Assessment", use_container_width=True):
             st.session_state.assessment_complete = False
-            st.session_state.results_ready = False
-            st.session_state.responses = {}
-            st.session_state.scores = None
-            st.session_state.level_info = None
-            st.rerun()
+            st.session_state.result = None
+            st.session_state.script_runs = 0
+            session_cache().clear()
+            st.rerun()  # the whole app, not just the fragment
 
     with col2:
         if st.button("Download Report (PDF)", use_container_width=True):
+            # fpdf is only loaded once someone asks for a report
+            from report import ReportQueueFull, build_report_job, get_report_service
+
             try:
-                pdf_bytes = create_pdf_report(st.session_state.scores, st.session_state.level_info)
+                # Same figures as the page; rendered in a worker process (or
+                # served from the report cache)
+                result = st.session_state.result
+                benchmark, _, percentile_label = results_benchmarks(result)
+                job = build_report_job(result.scores, result.level_info, benchmark, percentile_label)
+                with st.spinner("Generating your report..."):
+                    pdf_bytes = get_report_service().generate(job)
 
                 st.download_button(
                     label="📄 Download Your Job IQ Report",
                     data=pdf_bytes,
-                    file_name=f"Job_IQ_Report_{st.session_state.scores['total']}_points.pdf",
+                    file_name=f"Job_IQ_Report_{result.scores['total']}_points.pdf",
                     mime="application/pdf"
                 )
                 st.success("PDF report generated successfully!")
+            except ReportQueueFull:
+                st.warning("We're generating a lot of reports right now. Please try again in a moment.")
             except Exception as e:
                 st.error(f"Error generating PDF: {str(e)}")
 
@@ -753,188 +363,31 @@ def render_results(responses, scores, level_info):
             st.markdown("[Book a meeting →](https://jdxpert.com/book-a-demo/?utm_campaign=skills-gov-2025&utm_source=job-iq-app&utm_medium=referral&utm_content=book-demo)")
 
 
-def create_pdf_report(scores, level_info):
-    """Generate a PDF report with Job IQ assessment results"""
-    pdf = FPDF()
-    pdf.add_page()
-
-    # Set up fonts and colors
-    pdf.set_font("Arial", "B", 20)
-    pdf.set_text_color(13, 88, 101)  # JDX teal color
-
-    # Title
-    pdf.cell(0, 20, "Job IQ Assessment Report", ln=True, align="C")
-    pdf.ln(10)
-
-    # Score section
-    pdf.set_font("Arial", "B", 16)
-    pdf.set_text_color(60, 60, 60)  # Dark gray
-    pdf.cell(0, 12, "Your Results:", ln=True)
-    pdf.ln(5)
-
-    # Main score
-    pdf.set_font("Arial", "B", 24)
-    pdf.set_text_color(255, 135, 67)  # JDX orange
-    pdf.cell(0, 15, f"Job IQ Score: {scores['total']}/28", ln=True, align="C")
-    pdf.ln(5)
-
-    # Level info
-    pdf.set_font("Arial", "B", 16)
-    pdf.set_text_color(60, 60, 60)
-    pdf.cell(0, 12, f"Level {level_info['number']}: {level_info['name']}", ln=True, align="C")
-    pdf.ln(10)
-
-    # Benchmarking
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 12, "Industry Benchmarking:", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "", 12)
-    avg_score = 14.28
-    percentile = "Top 10%" if scores["total"] >= 20 else ("Top 50%" if scores["total"] >= 14 else "Bottom 50%")
-
-    pdf.cell(0, 8, f"Your Score: {scores['total']}/28", ln=True)
-    pdf.cell(0, 8, f"Industry Average: 14.3/28", ln=True)
-    pdf.cell(0, 8, f"Estimated Percentile: {percentile}", ln=True)
-    pdf.ln(10)
-
-    # Dimension breakdown
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 12, "Dimension Scores:", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "", 12)
-    dimensions = [
-        "Coverage", "Governance", "Velocity", "Architecture",
-        "Integration", "Controls", "Ability to Act"
-    ]
-
-    for i, dimension in enumerate(dimensions, 1):
-        pdf.cell(0, 8, f"{dimension}: {scores[f'dim{i}']}/4", ln=True)
-
-    pdf.ln(10)
-
-    # Footer
-    pdf.set_font("Arial", "I", 10)
-    pdf.set_text_color(100, 100, 100)
-    pdf.cell(0, 8, "Generated by JDX Job IQ Assessment", ln=True, align="C")
-    pdf.cell(0, 8, "Learn more at jdxpert.com", ln=True, align="C")
-
-    return pdf.output(dest="S").encode("latin1")
-
-
-def create_radar_chart(scores):
-    """Create a radar chart for dimension scores"""
-
-    categories = [
-        "Coverage",
-        "Governance",
-        "Velocity",
-        "Architecture",
-        "Integration",
-        "Controls",
-        "Ability to Act",
-    ]
-
-    values = [
-        scores["dim1"],
-        scores["dim2"],
-        scores["dim3"],
-        scores["dim4"],
-        scores["dim5"],
-        scores["dim6"],
-        scores["dim7"],
-    ]
-
-    # Close the radar chart
-    values_closed = values + [values[0]]
-    categories_closed = categories + [categories[0]]
-
-    fig = go.Figure()
-
-    fig.add_trace(
-        go.Scatterpolar(
-            r=values_closed,
-            theta=categories_closed,
-            fill="toself",
-            name="Your Score",
-            line=dict(color="#76E9F3", width=2),
-            fillcolor="rgba(118, 233, 243, 0.30)",
-        )
-    )
-
-    # Add benchmark line (average from research)
-    avg_values = [1.95, 2.08, 1.94, 1.93, 2.52, 2.08, 1.78]
-    avg_values_closed = avg_values + [avg_values[0]]
-
-    fig.add_trace(
-        go.Scatterpolar(
-            r=avg_values_closed,
-            theta=categories_closed,
-            fill="toself",
-            name="Industry Avg",
-            line=dict(color="#3C3C3C", width=2, dash="dash"),
-            fillcolor="rgba(60, 60, 60, 0.15)",
-        )
-    )
-
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 4],
-                tickvals=[0, 1, 2, 3, 4],
-                showticklabels=True,
-                tickfont=dict(color="#3C3C3C", size=12),
-                gridcolor="#E0E0E0",
-            ),
-            angularaxis=dict(
-                tickfont=dict(color="var(--c-text-light)", size=11),
-            )
-        ),
-        showlegend=True,
-        legend=dict(
-            x=0.5,
-            y=-0.15,
-            xanchor="center",
-            yanchor="top",
-            orientation="h",
-            font=dict(color="var(--c-text-light)", size=12),
-        ),
-        title="Job IQ Dimension Scores",
-        title_font=dict(color="var(--c-text-light)", size=16),
-        height=450,
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        margin=dict(l=40, r=40, t=60, b=120),  # Add bottom margin for legend
-    )
-
-    return fig
-
-
-def load_lottie_file(filepath: str):
-    """Load a Lottie animation from a JSON file"""
-    try:
-        with open(filepath, "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return None
-    except json.JSONDecodeError:
-        return None
+def show_results():
+    """"View My Job IQ Results" callback"""
+    st.session_state.assessment_complete = True
 
 
 def render_results_ready_message():
     """Show results ready message with link to full results"""
 
-    # Load and display the wizard Lottie animation
-    # Place your Lottie JSON file (wizard Oz on broomstick) in the same directory as this app.py file
-    # and name it "wizard_broomstick.json" or update the filename below
-    _assets_dir = Path(__file__).parent
-    lottie_file = _assets_dir / "wizard_broomstick.json"
+    # Wizard Lottie animation (config.LOTTIE_ASSETS), parsed and minified once per process
+    lottie = get_lottie("wizard_broomstick")
+    wizard_url = asset_url("wizard")
 
-    lottie_data = load_lottie_file(str(lottie_file))
+    if lite_mode() and wizard_url:
+        # Low-power / Save-Data clients get a static frame instead of the animation
+        st.markdown(
+            f"""
+            <div style="background-color: var(--c-background); padding: 20px; border-radius: 10px; text-align: center;">
+                <img src="{wizard_url}" style="width: 180px; height: auto;" alt="Wizard">
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+    elif lottie:
+        from streamlit_lottie import st_lottie
 
-    if lottie_data:
         # Center the animation with background using CSS variable
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
@@ -944,29 +397,9 @@ def render_results_ready_message():
                 """,
                 unsafe_allow_html=True
             )
-            st_lottie(lottie_data, height=200, key="wizard_animation")
-            st.markdown(
-                """
-                </div>
-                <style>
-                /* Target the Lottie iframe specifically */
-                iframe.stCustomComponentV1.st-emotion-cache-1tvzk6f {
-                    background-color: var(--c-background) !important;
-                    border: none !important;
-                    border-radius: 10px !important;
-                }
-                /* Alternative selectors */
-                iframe[data-testid="stCustomComponentV1"] {
-                    background-color: var(--c-background) !important;
-                }
-                /* If the iframe has transparent background, this should show through */
-                div[data-testid="stCustomComponentV1"] {
-                    background-color: var(--c-background) !important;
-                }
-                </style>
-                """,
-                unsafe_allow_html=True
-            )
+            # Keyed by content hash: the component is reused until the animation changes
+            st_lottie(lottie.animation, height=200, key=f"wizard_animation_{lottie.cache_key}")
+            st.markdown("</div>", unsafe_allow_html=True)
     else:
         # Fallback to balloons if Lottie file not found
         st.balloons()
@@ -984,11 +417,12 @@ def render_results_ready_message():
 
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        if st.button("View My Job IQ Results",
-                    type="primary",
-                    use_container_width=True):
-            st.session_state.assessment_complete = True
-            st.rerun()
+        # Set before the run the click starts, so the results page takes one
+        # full run instead of a run of this page plus st.rerun()
+        st.button("View My Job IQ Results",
+                  type="primary",
+                  use_container_width=True,
+                  on_click=show_results)
 
     # Optional: Show a teaser/preview
     st.markdown("---")
@@ -999,21 +433,67 @@ def render_results_ready_message():
     st.markdown("- Industry benchmarking")
 
 
+def record_assessment(result):
+    """Feed a submitted SessionResult to every enabled sink"""
+    from assessment_log import log_assessment
+    from benchmarks import get_benchmark_service
+    from repository import store_assessment
+    from submission import submit_assessment
+
+    packed = result.packed
+    scores = result.scores
+    level_number = result.level_info["number"]
+    org_info = result.org_info
+
+    # Live benchmark and percentile population (global and peer segments)
+    get_benchmark_service().record(scores, **org_info)
+
+    # API submission (no-op unless API_BASE_URL is set)
+    submit_assessment(packed, scores, level_number, **org_info)
+
+    # Local segmented log (no-op unless LOG_ASSESSMENTS_LOCALLY)
+    log_assessment(packed, **org_info)
+
+    # SQLite repository (no-op unless ASSESSMENT_DB_PATH is set)
+    store_assessment(packed, scores, level_number, **org_info)
+
+
 def main():
     """Main application logic"""
 
     init_session_state()
-
-    # Sidebar
+    st.session_state.script_runs += 1
+    get_rerun_stats().record_run()
+
+    # Sidebar, intro and footer are static and are not fragments: the form and
+    # the result-actions fragment keep answering and the PDF/consultation
+    # buttons from rerunning the script, so the chrome only runs on page
+    # changes (submit, view results, retake). Those are full runs, which
+    # must re-emit every element anyway; a fragment would run in them too.
     with st.sidebar:
-        # JDX Logo at top of sidebar
-        _assets_dir = Path(__file__).parent
-        _jdx_logo = _assets_dir / "JDX White.png"
-        if _jdx_logo.exists():
-            st.image(str(_jdx_logo), use_container_width=True)
+        # JDX Logo at top of sidebar (display-sized variant, encoded once per process)
+        logo_url = asset_url("logo")
+        if logo_url:
+            st.markdown(
+                f'<img src="{logo_url}" style="width: 100%; height: auto;" alt="JDX">',
+                unsafe_allow_html=True,
+            )
         else:
             # Fallback text if logo not found
             st.markdown("**JDX**", unsafe_allow_html=True)
+        if config.DEBUG_MODE:
+            stats = get_rerun_stats().snapshot()
+            per_assessment = stats["runs_per_assessment"]
+            st.caption(
+                f"Script runs this assessment: {st.session_state.script_runs} · "
+                f"per completed assessment (process): "
+                f"{'n/a' if per_assessment is None else f'{per_assessment:.1f}'} · "
+                f"fragment runs: {stats['fragment_runs']}"
+            )
+            st.caption(" · ".join(
+                f"{namespace} cache: {counts['hits']} hits / {counts['misses']} misses"
+                for namespace, counts in sorted(cache_stats().items())
+            ))
         st.markdown("---")
         st.markdown("### About This Assessment")
         st.markdown(
@@ -1039,12 +519,8 @@ def main():
 
     if st.session_state.assessment_complete:
         # Show full results page
-        render_results(
-            st.session_state.responses,
-            st.session_state.scores,
-            st.session_state.level_info,
-        )
-    elif st.session_state.results_ready:
+        render_results(st.session_state.result)
+    elif st.session_state.result is not None:
         # Show "results ready" message with button to view full results
         render_intro()  # Keep intro for context
         render_results_ready_message()
@@ -1052,27 +528,35 @@ def main():
         # Show assessment form and button
         render_intro()
 
-        responses = render_assessment_form()
+        # Answers are batched in the browser and sent once, on submit, instead
+        # of rerunning the whole script for every radio, slider and checkbox
+        with st.form("assessment_form", border=False):
+            responses = render_assessment_form()
+
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col2:
+                submitted = st.form_submit_button("Calculate My Job IQ", type="primary", use_container_width=True)
+
+        if submitted:
+            with st.spinner("Calculating your Job IQ..."):
+                # Pack answers into a single code; the session keeps only the
+                # code and references to shared score / level objects
+                result = SessionResult.from_packed(
+                    PackedResponses.from_dict(responses),
+                    responses.get("industry"),
+                    responses.get("org_size"),
+                )
 
-        # Submit button
-        col1, col2, col3 = st.columns([1, 1, 1])
-        with col2:
-            if st.button("Calculate My Job IQ", type="primary", use_container_width=True):
-                with st.spinner("Calculating your Job IQ..."):
-                    # Calculate scores
-                    scores = calculate_jdmi_score(responses)
-                    level_info = get_level_info(scores["total"])
-
-                    # Store in session state
-                    st.session_state.responses = responses
-                    st.session_state.scores = scores
-                    st.session_state.level_info = level_info
-                    st.session_state.results_ready = True
-
-                    # Clear cache and force clean refresh
-                    cache_data.clear()
-
-                st.rerun()
+                record_assessment(result)
+                get_rerun_stats().record_assessment(st.session_state.script_runs)
+
+                st.session_state.result = result
+
+                # New results: drop this session's derived values (shared
+                # process-wide caches are left warm for everyone else)
+                session_cache().clear()
+
+            st.rerun()
 
     # Footer
     st.markdown(
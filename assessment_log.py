@@ -0,0 +1,432 @@
+"""
+Append-only, segmented local log of submitted assessments
+
+Each process appends JSON-lines records to its own segment files, so any
+number of Streamlit sessions and processes can log concurrently without
+file locks or interleaved writes. A writer thread batches appends into one
+write + fsync per commit interval (group commit). Segments are sealed when
+they reach SEGMENT_MAX_BYTES or go idle, and a background compactor rolls
+sealed segments into dictionary-encoded columnar .npz files for analytics.
+
+Layout of config.LOCAL_DATA_PATH:
+    seg-<writer>-<seq>.open    segment being written (flock-ed by its writer,
+                               so a dead writer's segment is unlocked)
+    seg-<writer>-<seq>.jsonl   sealed segment, waiting for compaction
+    part-<ns>-<id>.npz         compacted columns
+    rejected-<ns>-<id>.jsonl   records compaction could not score
+    compact-<ns>-<id>.manifest outputs and consumed segments of a compaction
+                               pass (present only while it is being applied)
+"""
+
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+import config
+from answer_table import score_codes
+from batch_scoring import SCORE_KEYS
+from scoring_spec import get_spec
+
+# Record fields stored as strings; dictionary-encoded on compaction
+STRING_FIELDS = ('version', 'industry', 'org_size')
+
+
+class _Commit:
+    """One group commit: set once its lines are written (error is the failure, if any)"""
+
+    __slots__ = ('done', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+def default_log_dir():
+    """Resolve config.LOCAL_DATA_PATH relative to the app directory"""
+    return Path(__file__).parent / config.LOCAL_DATA_PATH
+
+
+class AssessmentLog:
+    """
+    Group-committing writer for this process's segments
+
+    append() only queues the encoded line; the writer thread commits queued
+    lines together at most every commit_interval seconds. Pass wait=True to
+    block until the record is fsynced.
+
+    A failed write (disk full, I/O error) fails that commit only: waiting
+    appends raise OSError, the failure is counted in `failed` / `last_error`,
+    and the next commit starts a new segment.
+    """
+
+    def __init__(self, directory=None, segment_max_bytes=None, segment_max_age=None,
+                 commit_interval=None):
+        self.directory = Path(directory) if directory else default_log_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes or config.LOG_SEGMENT_MAX_BYTES
+        self.segment_max_age = segment_max_age or config.LOG_SEGMENT_MAX_AGE
+        self.commit_interval = config.LOG_COMMIT_INTERVAL if commit_interval is None else commit_interval
+        self.writer_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._cond = threading.Condition()
+        self._pending = []
+        self._commit = _Commit()  # commit the pending lines will be part of
+        self._appended = 0
+        self._closing = False
+        self.failed = 0  # records lost to failed commits
+        self.last_error = None
+        self.compactor = None  # set by get_assessment_log
+        self._segment_seq = 0
+        self._segment = None  # (path, file object, bytes written, opened at)
+        self._thread = threading.Thread(target=self._run, name="jobiq-log-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, record, wait=False):
+        """
+        Queue one record (a JSON-serializable dict)
+
+        Returns:
+            Sequence number of the record within this writer
+
+        Raises:
+            OSError: with wait=True, if the commit holding the record failed
+        """
+        line = (json.dumps(record, separators=(',', ':')) + '\n').encode()
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Assessment log is closed")
+            self._pending.append(line)
+            self._appended += 1
+            seq = self._appended
+            commit = self._commit
+            self._cond.notify_all()
+        if wait:
+            commit.done.wait()
+            if commit.error is not None:
+                raise OSError(f"Assessment log write failed: {commit.error}") from commit.error
+        return seq
+
+    def close(self):
+        """Commit everything queued, seal the open segment and stop the writer"""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending and not self._closing:
+                    self._cond.wait(timeout=self.segment_max_age)
+                # Let more appends join this commit
+                deadline = time.monotonic() + self.commit_interval
+                while self._pending and not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(timeout=remaining)
+                batch, self._pending = self._pending, []
+                commit, self._commit = self._commit, _Commit()
+                closing = self._closing
+
+            try:
+                if batch:
+                    self._write(batch)
+                if self._segment and (closing or self._segment_expired()):
+                    self._seal()
+            except Exception as e:
+                # Keep the thread alive for later commits; this one is lost
+                commit.error = e
+                self.failed += len(batch)
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._abandon_segment()
+            commit.done.set()
+            if closing:
+                return
+
+    def _segment_expired(self):
+        _, _, written, opened_at = self._segment
+        return written >= self.segment_max_bytes or time.monotonic() - opened_at >= self.segment_max_age
+
+    def _open_segment(self):
+        self._segment_seq += 1
+        path = self.directory / f"seg-{self.writer_id}-{self._segment_seq:06d}.open"
+        # Lock before the .open name appears, so the compactor never sees it unlocked
+        new_path = path.with_suffix('.new')
+        handle = open(new_path, 'ab')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            os.replace(new_path, path)
+        except BaseException:
+            handle.close()
+            raise
+        return path, handle
+
+    def _write(self, batch):
+        if self._segment is None:
+            path, handle = self._open_segment()
+            self._segment = (path, handle, 0, time.monotonic())
+        path, handle, written, opened_at = self._segment
+        data = b''.join(batch)
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+        self._segment = (path, handle, written + len(data), opened_at)
+        if written + len(data) >= self.segment_max_bytes:
+            self._seal()
+
+    def _seal(self):
+        path, handle, _, _ = self._segment
+        # Rename while still locked, so the compactor cannot take it as orphaned
+        os.replace(path, path.with_suffix('.jsonl'))
+        self._segment = None
+        handle.close()
+
+    def _abandon_segment(self):
+        # After a failed write: seal what the segment holds (a torn last line
+        # is skipped when read) and open a new one on the next commit
+        if self._segment is None:
+            return
+        path, handle, _, _ = self._segment
+        self._segment = None
+        try:
+            os.replace(path, path.with_suffix('.jsonl'))
+        except OSError:
+            pass  # Compacted as orphaned once this process exits
+        try:
+            handle.close()
+        except OSError:
+            pass
+
+
+def _writer_is_alive(path):
+    # An open segment's writer holds an exclusive flock on it until it seals
+    # the segment or exits; PIDs can be reused, locks die with the process
+    try:
+        with open(path, 'rb') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            fcntl.flock(f, fcntl.LOCK_UN)
+            return False
+    except FileNotFoundError:
+        return True  # Sealed meanwhile; picked up as .jsonl next time
+
+
+def _read_segment(path):
+    records = []
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break  # Torn final line from a crash; nothing valid follows it
+    return records
+
+
+def _dictionary_encode(values):
+    dictionary, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+    return codes.astype(np.int32), dictionary
+
+
+def _is_scorable(record):
+    # Records compaction cannot score (unknown version, missing or invalid
+    # code or timestamp) are set aside instead of failing the whole pass
+    try:
+        spec = get_spec(record.get('version'))
+        code = record['code']
+        float(record['ts'])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return False
+    return type(code) is int and 0 <= code < spec.answer_space_size
+
+
+def _columns(records):
+    codes = np.array([record['code'] for record in records], dtype=np.uint32)
+    columns = {
+        'ts': np.array([record['ts'] for record in records], dtype=np.float64),
+        'code': codes,
+    }
+    # Score each record with the questionnaire version it was answered under
+    versions = np.array([record.get('version') or config.ASSESSMENT_VERSION for record in records])
+    for key in SCORE_KEYS + ('level',):
+        columns[key] = np.zeros(len(records), dtype=np.uint8)
+    for version in np.unique(versions):
+        rows = versions == version
+        scores = score_codes(codes[rows], str(version))
+        for key in SCORE_KEYS + ('level',):
+            columns[key][rows] = scores[key]
+    for field in STRING_FIELDS:
+        codes_, dictionary = _dictionary_encode([record.get(field) or '' for record in records])
+        columns[f'{field}__codes'] = codes_
+        columns[f'{field}__dict'] = dictionary
+    return columns
+
+
+def _write_synced(path, write):
+    with open(path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _finish_interrupted(directory):
+    # A manifest is written once a pass's outputs are durable as .tmp files:
+    # roll those passes forward (without it, their segments would be compacted
+    # again into duplicate rows) and drop the .tmp files of passes that died
+    # before writing one
+    for manifest in sorted(directory.glob('compact-*.manifest')):
+        entry = json.loads(manifest.read_bytes())
+        for name in entry['outputs']:
+            tmp = directory / f"{name}.tmp"
+            if tmp.exists():
+                os.replace(tmp, directory / name)
+        for name in entry['segments']:
+            (directory / name).unlink(missing_ok=True)
+        manifest.unlink()
+    for tmp in directory.glob('*.tmp'):
+        tmp.unlink()
+
+
+def compact(directory=None):
+    """
+    Roll sealed segments (and segments orphaned by dead writers) into one .npz part
+
+    Safe to run from several processes; one compactor runs at a time. Records
+    that cannot be scored are moved to a rejected-*.jsonl file. A pass that
+    crashes is finished by the next one, so no segment is compacted twice.
+
+    Returns:
+        Path of the new part, or None if there was nothing to compact
+    """
+    directory = Path(directory) if directory else default_log_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with open(directory / 'compact.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            _finish_interrupted(directory)
+            segments = sorted(directory.glob('seg-*.jsonl'))
+            segments += [p for p in sorted(directory.glob('seg-*.open')) if not _writer_is_alive(p)]
+            records, rejected = [], []
+            for path in segments:
+                for record in _read_segment(path):
+                    (records if _is_scorable(record) else rejected).append(record)
+            if not records and not rejected:
+                for path in segments:
+                    path.unlink()
+                return None
+
+            token = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+            part = directory / f"part-{token}.npz" if records else None
+            outputs = []
+            if records:
+                columns = _columns(records)
+                _write_synced(directory / f"{part.name}.tmp", lambda f: np.savez_compressed(f, **columns))
+                outputs.append(part.name)
+            if rejected:
+                name = f"rejected-{token}.jsonl"
+                lines = b''.join(json.dumps(record, separators=(',', ':')).encode() + b'\n' for record in rejected)
+                _write_synced(directory / f"{name}.tmp", lambda f: f.write(lines))
+                outputs.append(name)
+
+            manifest = directory / f"compact-{token}.manifest"
+            entry = json.dumps({'outputs': outputs, 'segments': [path.name for path in segments]}).encode()
+            _write_synced(directory / f"{manifest.name}.tmp", lambda f: f.write(entry))
+            os.replace(directory / f"{manifest.name}.tmp", manifest)
+            _finish_interrupted(directory)
+            return part
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def read_columns(directory=None):
+    """
+    Load all compacted parts as columns
+
+    Returns:
+        Dictionary of NumPy arrays: 'ts', 'code', score keys, 'level', and each
+        STRING_FIELDS column decoded from its dictionary
+    """
+    directory = Path(directory) if directory else default_log_dir()
+    parts = []
+    for path in sorted(directory.glob('part-*.npz')):
+        with np.load(path) as data:
+            part = {name: data[name] for name in data.files if '__' not in name}
+            for field in STRING_FIELDS:
+                part[field] = data[f'{field}__dict'][data[f'{field}__codes']]
+            parts.append(part)
+    if not parts:
+        return {}
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+class Compactor(threading.Thread):
+    """
+    Background thread that compacts sealed segments every `interval` seconds
+
+    A failed pass is retried on the next interval; failures are counted in
+    `failed` / `last_error`.
+    """
+
+    def __init__(self, directory=None, interval=None):
+        super().__init__(name="jobiq-log-compactor", daemon=True)
+        self.directory = directory
+        self.interval = interval or config.LOG_COMPACT_INTERVAL
+        self.failed = 0
+        self.last_error = None
+        self._stopping = threading.Event()
+
+    def run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                compact(self.directory)
+            except Exception as e:
+                self.failed += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def stop(self):
+        self._stopping.set()
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_assessment_log():
+    """Return the process-wide AssessmentLog (and start its compactor)"""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                log = AssessmentLog()
+                log.compactor = Compactor(log.directory)
+                log.compactor.start()
+                atexit.register(log.close)
+                _log = log
+    return _log
+
+
+def log_assessment(packed, **fields):
+    """
+    Append a submitted assessment to the local log if LOG_ASSESSMENTS_LOCALLY is on
+
+    Args:
+        packed: PackedResponses for the assessment
+        fields: Extra string fields (see STRING_FIELDS), e.g. industry
+    """
+    if not config.LOG_ASSESSMENTS_LOCALLY:
+        return None
+    record = {'ts': time.time(), 'code': packed.code, 'version': config.ASSESSMENT_VERSION}
+    record.update(fields)
+    return get_assessment_log().append(record)
@@ -0,0 +1,317 @@
+"""
+Process-wide image assets for Job IQ
+
+Source images are stored at print resolution (the wizard is 1501 px square
+but shown 180 px wide). Each configured asset is resized to its display size
+once per process, compressed, and written to the static folder under a
+content-hashed name, so the browser fetches it once per URL and caches it
+instead of receiving an inline base64 copy on every rerun.
+
+When Streamlit's static file serving is off, the same pre-encoded variant is
+inlined as a data URI (still encoded only once per process).
+
+Lottie animations are parsed and minified once per process and shared
+read-only by every session. streamlit-lottie only accepts the animation data,
+so each render still sends it to the browser; minifying keeps that payload
+small.
+
+The branding stylesheet (theme.css, with color variables generated from
+config.THEME_COLORS) and helper scripts (theme.js) are minified once per
+process. They are inlined rather than served from the static folder: the
+static handler of the Tornado-based Streamlit releases sends .css and .js
+files as text/plain with nosniff, which browsers refuse to apply.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import config
+from caching import register_lru_caches
+
+APP_DIR = Path(__file__).parent
+
+# URL prefix Streamlit serves STATIC_DIR under (relative to the app's base URL)
+STATIC_URL_PREFIX = "app/static/"
+
+_MIME_TYPES = {"WEBP": "image/webp", "PNG": "image/png"}
+
+EncodedAsset = namedtuple(
+    "EncodedAsset",
+    [
+        "name",        # key in config.IMAGE_ASSETS
+        "filename",    # content-hashed file name in the static folder
+        "mime_type",
+        "data",        # encoded bytes
+        "width",       # pixel size of the variant
+        "height",
+    ],
+)
+
+_write_lock = threading.Lock()
+
+
+def static_dir():
+    """Resolve config.STATIC_DIR relative to the app directory"""
+    return APP_DIR / config.STATIC_DIR
+
+
+def write_static_file(filename, data):
+    """
+    Write bytes to the static folder (atomically; skipped if already present)
+
+    Returns:
+        Path of the file
+    """
+    path = static_dir() / filename
+    with _write_lock:
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{filename}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+    return path
+
+
+def hashed_filename(stem, data, suffix):
+    """File name carrying a content hash, e.g. wizard.3f2a9c1b7d4e.webp"""
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{suffix}"
+
+
+def _encode_variant(source, width, image_format):
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image.load()
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        buffer = io.BytesIO()
+        if image_format == "WEBP":
+            image.save(buffer, "WEBP", quality=85, method=6)
+        else:
+            image.save(buffer, "PNG", optimize=True)
+        return buffer.getvalue(), image.size
+
+
+@lru_cache(maxsize=None)
+def get_asset(name):
+    """
+    Display-sized, compressed variant of a configured image, built once per process
+
+    Args:
+        name: Key in config.IMAGE_ASSETS
+
+    Returns:
+        EncodedAsset, or None if the source image is missing
+    """
+    source_name, display_width = config.IMAGE_ASSETS[name]
+    source = APP_DIR / source_name
+    if not source.exists():
+        return None
+
+    image_format = config.IMAGE_ASSET_FORMAT.upper()
+    data, (width, height) = _encode_variant(source, display_width * config.IMAGE_ASSET_SCALE, image_format)
+    filename = hashed_filename(name, data, "." + image_format.lower())
+    write_static_file(filename, data)
+    return EncodedAsset(name, filename, _MIME_TYPES[image_format], data, width, height)
+
+
+def static_serving_enabled():
+    """True when Streamlit serves the static folder (server.enableStaticServing)"""
+    import streamlit as st
+
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+@lru_cache(maxsize=None)
+def _data_uri(name):
+    asset = get_asset(name)
+    return f"data:{asset.mime_type};base64,{base64.b64encode(asset.data).decode()}"
+
+
+def asset_url(name):
+    """
+    URL for an image asset: its hashed static URL, or a data URI without static serving
+
+    Returns:
+        URL string, or None if the source image is missing
+    """
+    asset = get_asset(name)
+    if asset is None:
+        return None
+    if static_serving_enabled():
+        return STATIC_URL_PREFIX + asset.filename
+    return _data_uri(name)
+
+
+LottieAsset = namedtuple(
+    "LottieAsset",
+    [
+        "name",        # key in config.LOTTIE_ASSETS
+        "cache_key",   # content hash; stable across processes for the same animation
+        "animation",   # minified animation dict (shared by all sessions: do not mutate)
+        "size",        # minified JSON size in bytes
+        "source_size",
+    ],
+)
+
+# Keys only used by the After Effects editor and by expressions (the bundled
+# animations have none); players ignore them
+_LOTTIE_STRIP_KEYS = frozenset(("nm", "mn", "ix", "cl"))
+
+
+def minify_lottie(node, precision):
+    """Round numbers to `precision` decimals and drop editor-only keys"""
+    if isinstance(node, dict):
+        return {
+            key: minify_lottie(value, precision)
+            for key, value in node.items()
+            if key not in _LOTTIE_STRIP_KEYS
+        }
+    if isinstance(node, list):
+        return [minify_lottie(value, precision) for value in node]
+    if isinstance(node, float):
+        value = round(node, precision)
+        return int(value) if value.is_integer() else value
+    return node
+
+
+@lru_cache(maxsize=None)
+def get_lottie(name):
+    """
+    Minified Lottie animation, parsed once per process
+
+    Args:
+        name: Key in config.LOTTIE_ASSETS
+
+    Returns:
+        LottieAsset, or None if the source file is missing or not valid JSON
+    """
+    source = APP_DIR / config.LOTTIE_ASSETS[name]
+    try:
+        text = source.read_text()
+        animation = minify_lottie(json.loads(text), config.LOTTIE_PRECISION)
+    except (OSError, ValueError):
+        return None
+
+    data = json.dumps(animation, separators=(",", ":")).encode()
+    cache_key = hashlib.sha256(data).hexdigest()[:12]
+    return LottieAsset(name, cache_key, animation, len(data), len(text.encode()))
+
+
+def lite_mode():
+    """
+    True when this client should get static images instead of animations
+
+    Set by config.LITE_MODE, a ?lite=1 query parameter or a "Save-Data: on"
+    request header.
+    """
+    import streamlit as st
+
+    query_params = getattr(st, "query_params", {})  # st.query_params: Streamlit >= 1.30
+    if config.LITE_MODE or query_params.get("lite") in ("1", "true"):
+        return True
+    context = getattr(st, "context", None)  # st.context: Streamlit >= 1.37
+    headers = getattr(context, "headers", None) or {}
+    return headers.get("Save-Data", "").lower() == "on"
+
+
+StaticBundle = namedtuple(
+    "StaticBundle",
+    [
+        "text",        # minified contents
+        "data_uri",    # the same contents as a base64 data URI
+    ],
+)
+
+
+def theme_variables():
+    """CSS :root block with one --c-<name> variable per config.THEME_COLORS entry"""
+    declarations = [f"--c-{name}:{color}" for name, color in config.THEME_COLORS.items()]
+    # Streamlit accent override (affects some widgets' default red)
+    declarations.append(f"--primary-color:{config.THEME_COLORS['button']}")
+    return ":root{" + ";".join(declarations) + "}"
+
+
+def minify_css(text):
+    """
+    Drop comments and redundant whitespace
+
+    Naive: quoted strings are not special-cased, so whitespace and comment-like
+    text inside them is collapsed too. theme.css only quotes attribute values
+    without spaces, which this leaves intact.
+    """
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
+    text = re.sub(r"\s+", " ", text)
+    return re.sub(r"\s*([{};])\s*", r"\1", text).replace(";}", "}").strip()
+
+
+def minify_js(text):
+    """Drop comments, indentation and blank lines (conservative: no renaming)"""
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+@lru_cache(maxsize=None)
+def get_bundle(kind):
+    """
+    Minified theme bundle, built once per process
+
+    Args:
+        kind: "css" (theme.css plus the color variables) or "js" (theme.js)
+
+    Returns:
+        StaticBundle
+    """
+    source = (APP_DIR / f"theme.{kind}").read_text()
+    if kind == "css":
+        text = theme_variables() + minify_css(source)
+    else:
+        text = minify_js(source)
+    mime_type = "text/css" if kind == "css" else "text/javascript"
+    return StaticBundle(text, f"data:{mime_type};base64,{base64.b64encode(text.encode()).decode()}")
+
+
+def stylesheet_html():
+    """Markup that applies the theme stylesheet (the minified CSS, inline)"""
+    return f"<style>{get_bundle('css').text}</style>"
+
+
+def script_html():
+    """Markup for a components.html frame that runs the helper scripts (from a data URI)"""
+    return f'<script src="{get_bundle("js").data_uri}"></script>'
+
+
+register_lru_caches("assets", get_asset, _data_uri, get_lottie, get_bundle)
+
+
+def build_assets():
+    """Build every configured image variant and animation (deploy-time warm-up)"""
+    for name in config.IMAGE_ASSETS:
+        asset = get_asset(name)
+        if asset is None:
+            print(f"{name}: source image missing")
+        else:
+            print(f"{name}: {asset.filename} ({asset.width}x{asset.height}, {len(asset.data) / 1024:.1f} KB)")
+    for name in config.LOTTIE_ASSETS:
+        asset = get_lottie(name)
+        if asset is None:
+            print(f"{name}: animation missing or invalid")
+        else:
+            print(f"{name}: {asset.source_size / 1024:.1f} KB -> {asset.size / 1024:.1f} KB minified")
+    for kind in ("css", "js"):
+        bundle = get_bundle(kind)
+        print(f"theme.{kind}: {len(bundle.text) / 1024:.1f} KB minified")
+
+
+if __name__ == "__main__":
+    build_assets()
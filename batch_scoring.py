@@ -0,0 +1,203 @@
+"""
+Vectorized batch scoring for Job IQ survey exports
+
+Scores whole columns of responses at once instead of one dict per respondent.
+Both this module and utils.calculate_jdmi_score are driven by the compiled
+questionnaire spec (scoring_spec), so both paths always agree.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from scoring_spec import SPEC, get_spec
+from utils import recommendation_index
+
+# Single-choice questions: response key -> point mapping (option code = position)
+CHOICE_FIELDS = SPEC.choice_points
+
+# Checkbox groups: encoded field -> response keys (bit i = keys[i] selected)
+CHECKBOX_FIELDS = SPEC.checkbox_groups
+
+ENCODED_FIELDS = SPEC.encoded_fields
+SCORE_KEYS = SPEC.dimension_keys + ('total',)
+
+# Text values read as a checked checkbox (case-insensitive), e.g. from CSV exports
+CHECKED_STRINGS = frozenset(('1', 'true', 'yes', 'y', 'x', 'on', 'checked'))
+
+# Number of distinct values per encoded field; a packed answer code is the
+# mixed-radix number formed from the fields, first field least significant
+FIELD_RADICES = SPEC.field_radices
+ANSWER_SPACE_SIZE = SPEC.answer_space_size
+
+
+def encode_frame(frame, version=None):
+    """
+    Encode a DataFrame of raw form answers into compact integer columns
+
+    Args:
+        frame: pandas DataFrame with the same column names as the form's response
+            dict (option strings for single-choice questions, booleans for checkboxes;
+            numeric or text checkbox columns are accepted, see _checked).
+            Missing columns are treated like missing keys in calculate_jdmi_score.
+        version: Assessment version of the answers (default: current)
+
+    Returns:
+        Dictionary of NumPy arrays keyed by the spec's encoded fields: int8 option
+        codes (-1 for unknown answers) and uint8 checkbox bitmasks
+    """
+    import pandas as pd
+
+    spec = get_spec(version)
+    n = len(frame)
+    encoded = {}
+
+    for field, labels in spec.choice_options.items():
+        if field in frame:
+            codes = pd.Categorical(frame[field], categories=list(labels)).codes
+            encoded[field] = np.asarray(codes, dtype=np.int8)
+        else:
+            encoded[field] = np.full(n, -1, dtype=np.int8)
+
+    for field, keys in spec.checkbox_groups.items():
+        mask = np.zeros(n, dtype=np.uint8)
+        for bit, key in enumerate(keys):
+            if key in frame:
+                mask |= _checked(frame[key]).astype(np.uint8) << bit
+        encoded[field] = mask
+
+    return encoded
+
+
+def _checked(column):
+    """Boolean array for a checkbox column: bools, numbers (non-zero) or CHECKED_STRINGS text"""
+    from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+    if is_bool_dtype(column):
+        return column.fillna(False).to_numpy(dtype=bool)
+    if is_numeric_dtype(column):
+        return column.fillna(0).to_numpy() != 0
+    # Text (e.g. "False" from a CSV) or mixed objects: astype(bool) would
+    # treat every non-empty string as checked
+    text = column.astype('string').str.strip().str.lower()
+    return text.isin(CHECKED_STRINGS).to_numpy(dtype=bool)
+
+
+def pack_codes(encoded):
+    """
+    Pack encoded answers into one answer code per respondent
+
+    Args:
+        encoded: Mapping of arrays keyed by ENCODED_FIELDS. Option codes must be
+            valid (0 .. radix-1); unknown answers have no packed representation.
+
+    Returns:
+        uint32 NumPy array of answer codes in range(ANSWER_SPACE_SIZE)
+    """
+    code = np.zeros(len(np.asarray(encoded[ENCODED_FIELDS[0]])), dtype=np.uint32)
+    weight = 1
+    for field, radix in zip(ENCODED_FIELDS, FIELD_RADICES):
+        values = np.asarray(encoded[field])
+        if values.size and (values.min() < 0 or values.max() >= radix):
+            raise ValueError(f"{field} codes must be in range 0..{radix - 1}")
+        code += values.astype(np.uint32) * np.uint32(weight)
+        weight *= radix
+    return code
+
+
+def unpack_codes(codes, version=None):
+    """
+    Inverse of pack_codes
+
+    Args:
+        codes: Array-like of answer codes
+        version: Assessment version the codes were packed with (default: current)
+
+    Returns:
+        Dictionary of NumPy arrays keyed by that version's encoded fields
+    """
+    spec = get_spec(version)
+    remaining = np.asarray(codes, dtype=np.uint32)
+    encoded = {}
+    for field, radix in zip(spec.encoded_fields, spec.field_radices):
+        remaining, value = np.divmod(remaining, np.uint32(radix))
+        encoded[field] = value.astype(np.int8 if field in spec.choice_options else np.uint8)
+    return encoded
+
+
+def score_batch(encoded, version=None):
+    """
+    Score many encoded responses at once
+
+    Args:
+        encoded: Mapping (dict or DataFrame) of equal-length arrays keyed by the
+            spec's encoded fields, as produced by encode_frame
+        version: Assessment version of the answers (default: current)
+
+    Returns:
+        Dictionary of uint8 NumPy arrays keyed like calculate_jdmi_score's result
+        ('dim1' .. 'dim7', 'total')
+    """
+    spec = get_spec(version)
+    scores = {}
+
+    for rule in spec.rules:
+        if rule[1] == 'choice':
+            dimension, _, field = rule
+            scores[dimension] = spec.points_tables[field][np.asarray(encoded[field])]
+        else:
+            dimension, _, groups, max_points = rule
+            points = None
+            for field, divisor in groups:
+                counts = spec.popcount[np.asarray(encoded[field])] // np.uint8(divisor)
+                points = counts if points is None else points + counts
+            scores[dimension] = np.minimum(points, np.uint8(max_points)).astype(np.uint8)
+
+    total = np.zeros(len(scores[spec.dimension_keys[0]]), dtype=np.uint8)
+    for key in spec.dimension_keys:
+        total += scores[key]
+    scores['total'] = total
+
+    return scores
+
+
+def score_frame(frame, version=None):
+    """
+    Score a DataFrame of raw form answers (see encode_frame)
+
+    Returns:
+        Dictionary of uint8 NumPy arrays keyed 'dim1' .. 'dim7', 'total'
+    """
+    return score_batch(encode_frame(frame, version), version)
+
+
+def dimension_vector_indices(scores):
+    """
+    Vectorized utils.dimension_vector_index
+
+    Returns:
+        int32 NumPy array of base-5 dimension vector indices
+    """
+    index = np.zeros(len(scores['dim1']), dtype=np.int32)
+    for key in reversed(SCORE_KEYS[:7]):
+        index = index * 5 + scores[key]
+    return index
+
+
+def recommendation_ids_batch(scores):
+    """
+    Look up recommendation IDs for many score vectors via utils.recommendation_index
+
+    Returns:
+        Object NumPy array of ID tuples (shared, not copied per row)
+    """
+    return _recommendation_id_array()[dimension_vector_indices(scores)]
+
+
+@lru_cache(maxsize=None)
+def _recommendation_id_array():
+    ids_by_vector = recommendation_index()[0]
+    array = np.empty(len(ids_by_vector), dtype=object)
+    for index, ids in enumerate(ids_by_vector):
+        array[index] = ids
+    return array
@@ -0,0 +1,181 @@
+"""
+Live benchmark aggregates for Job IQ
+
+Benchmarks are derived from the process-wide score histograms in
+percentiles.py, which every stored assessment already updates in O(1). The
+histograms hold everything the benchmarks need: counts, sums and sums of
+squares (hence means and variances) per dimension, and the level histogram.
+A snapshot is rebuilt from them (a constant ~60 buckets) only when the
+population changes, and published as an immutable BenchmarkSnapshot that
+readers share without locking.
+
+Until BENCHMARK_MIN_LIVE_SAMPLE assessments exist, the research benchmarks in
+config.py are served instead.
+
+Peer ("companies like you") snapshots come from the same store's segment
+cube (industry x org size x framework version, with roll-ups), so they cost
+the same O(1) lookup; a segment is only published once it holds
+PEER_BENCHMARK_MIN_SAMPLE assessments.
+"""
+
+import math
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+import config
+from caching import CacheCounter, register_cache
+from percentiles import get_percentile_store
+from utils import DIMENSION_KEYS
+
+BenchmarkSnapshot = namedtuple(
+    'BenchmarkSnapshot',
+    [
+        'version',              # increases whenever the published numbers change
+        'source',               # 'live', 'peer' or 'research'
+        'count',                # assessments behind the numbers
+        'mean_score',           # mean total score (0-28)
+        'score_stddev',         # population standard deviation of the total
+        'dimension_means',      # tuple of 7 means (0-4), in dimension order
+        'dimension_stddevs',    # tuple of 7 standard deviations
+        'level_distribution',   # read-only {level: percentage}
+    ],
+)
+
+RESEARCH_BENCHMARK = BenchmarkSnapshot(
+    version=0,
+    source='research',
+    count=config.RESEARCH_SAMPLE_SIZE,
+    mean_score=config.BENCHMARK_MEAN_SCORE,
+    score_stddev=None,
+    dimension_means=tuple(config.BENCHMARK_DIMENSION_SCORES),
+    dimension_stddevs=None,
+    level_distribution=MappingProxyType(dict(config.BENCHMARK_LEVEL_DISTRIBUTION)),
+)
+
+
+def _moments(histogram):
+    """Mean and population standard deviation of a ScoreHistogram"""
+    count = sum_ = sum_sq = 0
+    for value, weight in enumerate(histogram.counts):
+        count += weight
+        sum_ += value * weight
+        sum_sq += value * value * weight
+    mean = sum_ / count
+    return mean, math.sqrt(max(sum_sq / count - mean * mean, 0.0))
+
+
+def snapshot_from_sketch(sketch, version, source='live'):
+    """Build a BenchmarkSnapshot from a PercentileSketch"""
+    mean_score, score_stddev = _moments(sketch.total)
+    dimension_moments = [_moments(sketch.dimensions[key]) for key in DIMENSION_KEYS]
+
+    levels = dict.fromkeys(config.LEVEL_THRESHOLDS, 0)
+    for total, weight in enumerate(sketch.total.counts):
+        levels[config.get_level_from_score(total)] += weight
+    count = sketch.count
+
+    return BenchmarkSnapshot(
+        version=version,
+        source=source,
+        count=count,
+        mean_score=mean_score,
+        score_stddev=score_stddev,
+        dimension_means=tuple(mean for mean, _ in dimension_moments),
+        dimension_stddevs=tuple(stddev for _, stddev in dimension_moments),
+        level_distribution=MappingProxyType(
+            {level: 100.0 * weight / count for level, weight in levels.items()}
+        ),
+    )
+
+
+class BenchmarkService:
+    """
+    Publishes the current BenchmarkSnapshot for the process
+
+    record() is O(1); snapshot() and peer_snapshot() return shared immutable
+    snapshots and only rebuild one when the underlying population has changed.
+    """
+
+    def __init__(self, store=None, min_live_sample=None, min_peer_sample=None):
+        self._store = store or get_percentile_store()
+        self.min_live_sample = (
+            config.BENCHMARK_MIN_LIVE_SAMPLE if min_live_sample is None else min_live_sample
+        )
+        self.min_peer_sample = (
+            config.PEER_BENCHMARK_MIN_SAMPLE if min_peer_sample is None else min_peer_sample
+        )
+        self._snapshots = {}  # (industry, org_size) -> (store version, snapshot or None)
+        self._lock = threading.Lock()
+        self.counter = CacheCounter()  # snapshot reuses vs rebuilds
+
+    def record(self, scores, industry=None, org_size=None):
+        """Add one stored assessment's scores dict and its (optional) peer segment"""
+        self._store.record(scores, industry or None, org_size or None)
+
+    def _cached(self, segment, build):
+        version, sketch = self._store.versioned_sketch(*segment)
+        cached = self._snapshots.get(segment)
+        if cached is not None and cached[0] == version:
+            self.counter.hit()
+            return cached[1]
+        with self._lock:
+            cached = self._snapshots.get(segment)
+            if cached is None or cached[0] != version:
+                self.counter.miss()
+                cached = self._snapshots[segment] = (version, build(sketch, version))
+            else:
+                self.counter.hit()
+            return cached[1]
+
+    def cache_counts(self):
+        """(hits, misses, entries) of the snapshot cache (see caching.register_cache)"""
+        return self.counter.hits, self.counter.misses, len(self._snapshots)
+
+    def snapshot(self):
+        """Current benchmarks (live, or research until enough data)"""
+        def build(sketch, version):
+            if sketch.count >= self.min_live_sample:
+                return snapshot_from_sketch(sketch, version)
+            return RESEARCH_BENCHMARK
+
+        return self._cached((None, None), build)
+
+    def peer_snapshot(self, industry=None, org_size=None):
+        """
+        Benchmarks for companies in the same industry and/or size band
+
+        Returns:
+            BenchmarkSnapshot with source 'peer', or None when no segment is
+            given or it has fewer than min_peer_sample assessments
+        """
+        segment = (industry or None, org_size or None)
+        if segment == (None, None):
+            return None
+
+        def build(sketch, version):
+            if sketch.count >= self.min_peer_sample:
+                return snapshot_from_sketch(sketch, version, source='peer')
+            return None
+
+        return self._cached(segment, build)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_benchmark_service():
+    """Return the process-wide BenchmarkService"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = BenchmarkService()
+                register_cache("benchmarks", _service.cache_counts)
+    return _service
+
+
+def get_benchmark_snapshot():
+    """Shortcut for get_benchmark_service().snapshot()"""
+    return get_benchmark_service().snapshot()
@@ -0,0 +1,192 @@
+"""
+Bulk PDF reports from exported responses
+
+Streams a CSV or JSON-lines export of form responses (one row per
+respondent, columns named like the form's response dict), scores each row
+with calculate_jdmi_score / get_level_info, renders the reports across a
+pool of worker processes and streams them into a zip archive as they
+complete. Rows with the same score vector share one rendering (through the
+ReportService cache), and at most `window` reports are held in memory.
+
+Usage:
+    python bulk_reports.py responses.csv -o reports.zip [--id-column email] [--workers 4]
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from pathlib import Path
+
+from batch_scoring import CHECKED_STRINGS
+from benchmarks import get_benchmark_snapshot
+from percentiles import get_percentile_label
+from report import ReportQueueFull, ReportService, build_report_job
+from scoring_spec import SPEC
+from utils import DIMENSION_KEYS, calculate_jdmi_score, get_level_info
+
+_CHECKBOX_KEYS = frozenset(key for keys in SPEC.checkbox_groups.values() for key in keys)
+
+SCORE_KEYS = DIMENSION_KEYS + ("total",)
+MANIFEST_COLUMNS = ("row_id", "filename") + SCORE_KEYS + ("level",)
+
+
+def read_rows(path):
+    """
+    Yield response dicts from a .csv or .jsonl file, one at a time
+
+    CSV checkbox cells are read as booleans (batch_scoring.CHECKED_STRINGS are
+    checked); JSON values are used as-is.
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                for key in _CHECKBOX_KEYS.intersection(row):
+                    row[key] = (row[key] or "").strip().lower() in CHECKED_STRINGS
+                yield row
+
+
+def _safe_name(value):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(value)).strip("._") or "report"
+
+
+class ThroughputReporter:
+    """Prints progress to stderr at most every `interval` seconds"""
+
+    def __init__(self, interval=2.0, stream=None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def update(self, done, rendered, force=False):
+        now = time.perf_counter()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        elapsed = max(now - self.started, 1e-9)
+        print(
+            f"{done} reports ({rendered} rendered, {done - rendered} deduplicated) "
+            f"in {elapsed:.1f}s: {done / elapsed:.1f} reports/s",
+            file=self.stream,
+        )
+
+
+def generate_reports(rows, output, id_column=None, workers=None, window=64, reporter=None):
+    """
+    Render a report per response row into a zip archive
+
+    The archive holds one PDF per row plus manifest.csv (row id, file name,
+    scores and level).
+
+    Args:
+        rows: Iterable of response dicts (see read_rows)
+        output: Path of the zip archive to write
+        id_column: Row field used to name each PDF (default: row number)
+        workers: Report worker processes (default: config.PDF_WORKERS)
+        window: Reports in flight (queued, rendering or waiting to be written)
+        reporter: Optional ThroughputReporter
+
+    Returns:
+        Dictionary with 'reports', 'rendered' and 'seconds'
+    """
+    started = time.perf_counter()
+    # Headroom over the window: a job leaves the service's pending set in a
+    # done-callback that can run after its future.result() has returned
+    service = ReportService(max_workers=workers, max_pending=window * 2, cache_size=window * 4)
+    benchmark = get_benchmark_snapshot()
+    in_flight = deque()
+    names = set()
+    done = rendered = 0
+
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive, \
+            tempfile.TemporaryFile("w+", newline="") as manifest_file:
+        manifest = csv.writer(manifest_file)
+        manifest.writerow(MANIFEST_COLUMNS)
+
+        def write_oldest():
+            nonlocal done, rendered
+            row_id, filename, scores, level, fresh, future = in_flight.popleft()
+            archive.writestr(filename, future.result())
+            manifest.writerow((row_id, filename) + tuple(scores[key] for key in SCORE_KEYS) + (level,))
+            done += 1
+            rendered += fresh
+            if reporter:
+                reporter.update(done, rendered)
+
+        try:
+            for number, row in enumerate(rows, 1):
+                row_id = row.get(id_column) if id_column else None
+                row_id = str(row_id) if row_id not in (None, "") else str(number)
+                filename = f"Job_IQ_Report_{_safe_name(row_id)}.pdf"
+                if filename in names:
+                    filename = f"Job_IQ_Report_{_safe_name(row_id)}_{number}.pdf"
+                names.add(filename)
+
+                scores = calculate_jdmi_score(row)
+                level_info = get_level_info(scores["total"])
+                job = build_report_job(scores, level_info, benchmark, get_percentile_label(scores["total"]))
+
+                if len(in_flight) >= window:
+                    write_oldest()
+                misses = service.stats()["misses"]
+                while True:
+                    try:
+                        future = service.submit(job)
+                        break
+                    except ReportQueueFull:
+                        # Finished jobs not yet cleared from pending: free a slot and retry
+                        if in_flight:
+                            write_oldest()
+                        else:
+                            time.sleep(0.01)
+                fresh = service.stats()["misses"] > misses  # False: cached or shared rendering
+                in_flight.append((row_id, filename, scores, level_info["number"], fresh, future))
+            while in_flight:
+                write_oldest()
+        finally:
+            service.shutdown()
+
+        manifest_file.seek(0)
+        with archive.open("manifest.csv", "w") as entry:
+            for line in manifest_file:
+                entry.write(line.encode())
+
+    if reporter:
+        reporter.update(done, rendered, force=True)
+    return {"reports": done, "rendered": rendered, "seconds": time.perf_counter() - started}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Job IQ PDF reports for exported responses")
+    parser.add_argument("input", help="CSV or JSONL file of form responses")
+    parser.add_argument("-o", "--output", default="reports.zip", help="zip archive to write")
+    parser.add_argument("--id-column", help="column used to name each report (default: row number)")
+    parser.add_argument("--workers", type=int, help="report worker processes (default: config.PDF_WORKERS)")
+    parser.add_argument("--window", type=int, default=64, help="reports in flight at once")
+    args = parser.parse_args(argv)
+
+    result = generate_reports(
+        read_rows(args.input),
+        args.output,
+        id_column=args.id_column,
+        workers=args.workers,
+        window=args.window,
+        reporter=ThroughputReporter(),
+    )
+    print(f"Wrote {result['reports']} reports ({result['rendered']} rendered) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Namespaced caches for Job IQ
+
+Cached values live in one of two scopes:
+
+- Process-wide namespaces ("figures", "assets", "benchmarks", "reports")
+  hold immutable values shared by every session: the lru_caches and services
+  in charts.py, assets.py, benchmarks.py and report.py register themselves
+  here. Each is bounded by its own size limit and never cleared by a user
+  action.
+- The "session" namespace holds values derived for one session's assessment
+  (the benchmark and percentile its results were shown with). It lives in
+  that session's state and is cleared when the session submits or retakes.
+
+Every namespace reports hits and misses (cache_stats(); shown in the sidebar
+in DEBUG_MODE).
+"""
+
+import threading
+from functools import partial
+
+SESSION = "session"
+
+
+class CacheCounter:
+    """Thread-safe hit/miss counter"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+
+_providers = {}  # namespace -> callables returning (hits, misses, entries or None)
+_providers_lock = threading.Lock()
+
+
+def register_cache(namespace, provider):
+    """
+    Report a cache's counters under a namespace
+
+    Args:
+        namespace: e.g. "figures"
+        provider: Callable returning (hits, misses, entries); entries may be
+            None when the size is not known
+    """
+    with _providers_lock:
+        _providers.setdefault(namespace, []).append(provider)
+
+
+def _lru_counts(function):
+    info = function.cache_info()
+    return info.hits, info.misses, info.currsize
+
+
+def register_lru_caches(namespace, *functions):
+    """Report functools.lru_cache-decorated functions under a namespace"""
+    for function in functions:
+        register_cache(namespace, partial(_lru_counts, function))
+
+
+def cache_stats():
+    """
+    Counters per namespace, summed over its registered caches
+
+    Returns:
+        {namespace: {'hits', 'misses', 'entries', 'hit_rate'}}; 'entries'
+        and 'hit_rate' are None when unknown
+    """
+    with _providers_lock:
+        providers = {namespace: list(items) for namespace, items in _providers.items()}
+    stats = {}
+    for namespace, items in providers.items():
+        hits = misses = 0
+        entries = 0
+        for provider in items:
+            provider_hits, provider_misses, provider_entries = provider()
+            hits += provider_hits
+            misses += provider_misses
+            entries = None if entries is None or provider_entries is None else entries + provider_entries
+        stats[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "entries": entries,
+            "hit_rate": hits / (hits + misses) if hits + misses else None,
+        }
+    return stats
+
+
+_session_counter = CacheCounter()
+register_cache(SESSION, lambda: (_session_counter.hits, _session_counter.misses, None))
+
+
+class SessionCache:
+    """Values computed once per session assessment; cleared on submit and retake"""
+
+    __slots__ = ("_values",)
+
+    def __init__(self):
+        self._values = {}
+
+    def get(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        try:
+            value = self._values[key]
+        except KeyError:
+            _session_counter.miss()
+            value = self._values[key] = compute()
+            return value
+        _session_counter.hit()
+        return value
+
+    def clear(self):
+        self._values.clear()
+
+
+def session_cache():
+    """The current Streamlit session's SessionCache"""
+    import streamlit as st
+
+    if "session_cache" not in st.session_state:
+        st.session_state.session_cache = SessionCache()
+    return st.session_state.session_cache
@@ -11,10 +11,28 @@ COMPANY_NAME = "JDX"
 PRODUCT_NAME = "Job IQ — Job Intelligence Index (powered by Oz)"
 LOGO_URL = "https://via.placeholder.com/150x50/667eea/ffffff?text=JDX"  # Replace with your logo URL
 
+# Bump when the report layout or branding changes (invalidates cached PDF reports)
+BRANDING_VERSION = "1"
+
 # Primary brand colors (used in gradients and accents)
 PRIMARY_COLOR_1 = "#0D5865"  # Dark teal
 PRIMARY_COLOR_2 = "#3AC1CC"  # Teal
 
+# Page palette, emitted as CSS variables (--c-<name>) in the theme bundle (assets.py, theme.css)
+THEME_COLORS = {
+    "verylight": "#E8FDFF",
+    "light": "#BFFAFF",
+    "mid": "#76E9F3",
+    "teal": PRIMARY_COLOR_2,
+    "deeper": "#308B9A",
+    "dark": PRIMARY_COLOR_1,
+    "text-dark": "#3C3C3C",
+    "text-light": "#f9f9f9",
+    "background": "#f9f9f9",
+    "button": "#FF8743",
+    "panel-light": "#FFBCAC",
+}
+
 # Contact information
 CONTACT_EMAIL = "info@jdxpert.com"
 CONTACT_PHONE = ""
@@ -36,6 +54,146 @@ FRAMEWORK_VERSION = "Job IQ v1.0"
 RESEARCH_SAMPLE_SIZE = 227
 RESEARCH_REPORT_NAME = "State of Job & Skills Data Governance 2026"
 
+# Questionnaire and scoring spec for ASSESSMENT_VERSION (compiled by scoring_spec.py).
+# One entry per dimension, in form order:
+#   - "choice" dimensions score the points of the selected option
+#   - "checkboxes" dimensions score min(max_points, sum of checked_count // divisor per group)
+# Option order is part of the packed answer code, so changing it needs a new version.
+QUESTIONNAIRE = [
+    {
+        "dimension": "dim1",
+        "heading": "1. Coverage/Completeness of Skills Data",
+        "prompt": "*What percentage of your job descriptions include defined skills or competencies?*",
+        "type": "choice",
+        "field": "coverage",
+        "widget": "select_slider",
+        "label": "Coverage Percentage",
+        "options": [
+            ("<25%", 0),
+            ("25-49%", 1),
+            ("50-74%", 2),
+            ("75-89%", 3),
+            ("≥90%", 4),
+        ],
+    },
+    {
+        "dimension": "dim2",
+        "heading": "2. Governance Cadence/Process Ownership",
+        "prompt": "*How do you currently manage job and skills data?*",
+        "type": "choice",
+        "field": "governance",
+        "widget": "radio",
+        "label": "Operating Model",
+        "options": [
+            ("Ongoing governed program with clear ownership and regular reviews", 4),
+            ("Primarily project-based with temporary ownership", 2),
+            ("Decentralized — each function manages independently", 1),
+            ("We do not actively manage job/skills data today", 0),
+        ],
+    },
+    {
+        "dimension": "dim3",
+        "heading": "3. Freshness/Change Velocity",
+        "prompt": "*When you need to update a job description, how quickly can it go live?*",
+        "type": "choice",
+        "field": "velocity",
+        "widget": "select_slider",
+        "label": "Time to Publish",
+        "options": [
+            ("More than 30 days", 0),
+            ("15-30 days", 1),
+            ("8-14 days", 2),
+            ("3-7 days", 3),
+            ("Less than 3 days", 4),
+        ],
+    },
+    {
+        "dimension": "dim4",
+        "heading": "4. Architecture Alignment",
+        "prompt": "*Which of the following are linked to your job/skills data? (Select all that apply)*",
+        "type": "checkboxes",
+        "max_points": 4,
+        "groups": [
+            {
+                "field": "architecture",
+                "divisor": 1,
+                "checkboxes": [
+                    ("arch_mobility", "Internal mobility and career paths"),
+                    ("arch_comp", "Compensation and job leveling"),
+                    ("arch_planning", "Workforce planning"),
+                ],
+            },
+        ],
+    },
+    {
+        "dimension": "dim5",
+        "heading": "5. System Fragmentation/Integration",
+        "prompt": "*Are job data updates automatically propagated across your HR systems?*",
+        "type": "choice",
+        "field": "integration",
+        "widget": "radio",
+        "label": "System Synchronization",
+        "options": [
+            ("All core systems fully synchronized (HRIS, ATS, Comp, LMS)", 4),
+            ("Most systems integrated (3 of 4)", 3),
+            ("Some systems connected, but significant manual work", 1),
+            ("Systems operate independently (manual exports/imports)", 0),
+        ],
+    },
+    {
+        "dimension": "dim6",
+        "heading": "6. Controls/Compliance (including Bias)",
+        "prompt": "*Which governance controls are in place? (Select all that apply)*",
+        "type": "checkboxes",
+        "max_points": 4,
+        "groups": [
+            {
+                "field": "controls",
+                "divisor": 1,
+                "checkboxes": [
+                    ("control_ownership", "Clear ownership of job/skills content"),
+                    ("control_approvals", "Formal approval workflows"),
+                    ("control_lineage", "Version history and audit trails"),
+                    ("control_bias", "Bias review and compliance checks"),
+                ],
+            },
+        ],
+    },
+    {
+        "dimension": "dim7",
+        "heading": "7. Ability to Act (Analytics/Insights)",
+        "prompt": "",
+        "type": "checkboxes",
+        "max_points": 4,
+        # decisions/2 + metrics gives weight to both making decisions AND tracking metrics
+        "groups": [
+            {
+                "field": "decisions",
+                "prompt": "*Skills data drives decisions for:* (Select all)",
+                "divisor": 2,
+                "checkboxes": [
+                    ("act_reskilling", "Reskilling/upskilling programs"),
+                    ("act_mobility", "Internal mobility decisions"),
+                    ("act_comp", "Compensation decisions"),
+                    ("act_hiring", "Hiring/requisition requirements"),
+                    ("act_planning", "Workforce planning"),
+                ],
+            },
+            {
+                "field": "metrics",
+                "prompt": "*We track these metrics:* (Select all)",
+                "divisor": 1,
+                "checkboxes": [
+                    ("metric_cycle", "Cycle times (JD → Req → Hire)"),
+                    ("metric_exception", "Exception rates / MTTR"),
+                    ("metric_ttp", "Time-to-publish"),
+                    ("metric_mobility", "Internal mobility rate"),
+                ],
+            },
+        ],
+    },
+]
+
 # Scoring parameters
 MAX_SCORE = 28
 NUM_DIMENSIONS = 7
@@ -55,6 +213,8 @@ LEVEL_THRESHOLDS = {
 # BENCHMARKS (from research)
 # ===========================
 
+# Served until BENCHMARK_MIN_LIVE_SAMPLE assessments are stored (see benchmarks.py)
+
 # Overall benchmarks
 BENCHMARK_MEAN_SCORE = 14.28
 BENCHMARK_MEDIAN_SCORE = 14.0
@@ -85,7 +245,7 @@ HIGH_COVERAGE_PLANNING_OVERHAUL_PCT = 57.4  # % planning major governance change
 # Enable/disable features
 ENABLE_PDF_DOWNLOAD = False  # PDF generation not yet implemented
 ENABLE_EMAIL_DELIVERY = False  # Email delivery not yet implemented
-ENABLE_ORG_INFO_COLLECTION = True  # Collect optional organization info
+ENABLE_ORG_INFO_COLLECTION = False  # Collect optional organization info (enables peer benchmarks)
 ENABLE_BENCHMARKING = True  # Show benchmark comparisons
 ENABLE_INSIGHTS = True  # Show auto-generated insights
 SHOW_INDUSTRY_AVERAGE_ON_RADAR = True  # Add benchmark line to radar chart
@@ -106,8 +266,30 @@ NUM_RECOMMENDATIONS = 5  # Number of recommendations to display
 
 # Visualization
 RADAR_CHART_HEIGHT = 450  # pixels
+RADAR_CACHE_SIZE = 1024  # radar figures memoized per process (charts.py)
 USE_GRADIENT_COLORS = True  # Use gradient colors in visualizations
 
+# Image assets (assets.py): name -> (source file, display width in CSS pixels).
+# Each is resized once per process to width x IMAGE_ASSET_SCALE and written to
+# STATIC_DIR under a content-hashed name (served by Streamlit's static serving).
+IMAGE_ASSETS = {
+    "wizard": ("oz-grabbing-hat@3x.png", 180),
+    "logo": ("JDX White.png", 300),
+}
+IMAGE_ASSET_SCALE = 2  # pixel density of the variants (2 = sharp on HiDPI screens)
+IMAGE_ASSET_FORMAT = "WEBP"  # or "PNG"
+STATIC_DIR = "./static"  # must be ./static next to app.py for server.enableStaticServing
+
+# Lottie animations (assets.py): name -> source JSON. Minified once per process:
+# numbers rounded to LOTTIE_PRECISION decimals, names/expression indices stripped.
+LOTTIE_ASSETS = {
+    "wizard_broomstick": "wizard_broomstick.json",
+}
+LOTTIE_PRECISION = 2
+# Lite mode (static images instead of animations) for clients sending "Save-Data: on"
+# or opening the app with ?lite=1; True forces it for everyone
+LITE_MODE = False
+
 
 # ===========================
 # COPY/MESSAGING
@@ -138,6 +320,14 @@ API_BASE_URL = ""  # e.g., "https://api.jdxpert.com"
 API_ENDPOINT_SUBMIT_ASSESSMENT = "/api/assessments"
 API_ENDPOINT_SEND_EMAIL = "/api/send-results"
 
+# Submission outbox (submission.py); only used when API_BASE_URL is set
+OUTBOX_PATH = "./data/outbox.sqlite3"
+OUTBOX_BATCH_SIZE = 50  # assessments per POST
+OUTBOX_BACKOFF_BASE = 1.0  # seconds; doubles per failed attempt
+OUTBOX_BACKOFF_MAX = 300.0  # seconds
+OUTBOX_POLL_INTERVAL = 5.0  # seconds between checks for retries when idle
+OUTBOX_HIGH_WATER_MARK = 1000  # queue depth reported as saturated
+
 # Analytics/tracking
 ENABLE_ANALYTICS = False
 GOOGLE_ANALYTICS_ID = ""  # e.g., "G-XXXXXXXXXX"
@@ -148,8 +338,59 @@ GOOGLE_ANALYTICS_ID = ""  # e.g., "G-XXXXXXXXXX"
 # ===========================
 
 DEBUG_MODE = False  # Show debug info (scores, session state)
-LOG_ASSESSMENTS_LOCALLY = False  # Save assessments to local CSV (for testing)
-LOCAL_DATA_PATH = "./data/assessments.csv"
+LOG_ASSESSMENTS_LOCALLY = False  # Save assessments to the local segmented log (assessment_log.py)
+LOCAL_DATA_PATH = "./data/assessment_log"  # Log directory (segments + compacted .npz parts)
+LOG_COMMIT_INTERVAL = 0.05  # seconds; appends within this window share one fsync
+LOG_SEGMENT_MAX_BYTES = 4 * 1024 * 1024  # seal segments at this size...
+LOG_SEGMENT_MAX_AGE = 60.0  # ...or after this many seconds
+LOG_COMPACT_INTERVAL = 300.0  # seconds between background compactions
+
+# Cold-start budget for `import app` (check with `python import_budget.py`)
+IMPORT_TIME_BUDGET_MS = 400
+# Loaded on the page or action that needs them, never by the form page
+DEFERRED_IMPORTS = ("pandas", "fpdf", "streamlit_lottie", "charts", "report")
+
+# SQLite assessment repository (repository.py); leave empty to disable
+ASSESSMENT_DB_PATH = ""  # e.g., "./data/assessments.sqlite3"
+ASSESSMENT_DB_POOL_SIZE = 4  # connections per process
+
+# Precomputed score table for every possible answer combination
+# (build with `python answer_table.py`; scoring falls back to computing when absent)
+ANSWER_TABLE_PATH = f"./data/answer_table_v{ASSESSMENT_VERSION}.npy"
+
+# PDF reports (report.py): rendered in a pool of worker processes
+PDF_WORKERS = 2  # 0 renders reports inline in the script thread
+PDF_MAX_PENDING = 16  # distinct reports queued or running before new requests are turned away
+PDF_CACHE_SIZE = 128  # finished reports kept per process
+PDF_TIMEOUT = 60  # seconds a session waits for its report
+
+# Headless JSON API (api.py)
+SCORING_API_HOST = "127.0.0.1"
+SCORING_API_PORT = 8600
+SCORING_API_MAX_BATCH = 1000  # items per POST /score
+SCORING_API_MAX_BODY_BYTES = 4 * 1024 * 1024
+
+# Live percentiles (percentiles.py): one snapshot file per process, merged across processes
+PERCENTILE_SNAPSHOT_DIR = "./data/percentiles"
+PERCENTILE_SNAPSHOT_INTERVAL = 30  # seconds between snapshot writes/refreshes
+PERCENTILE_CONSOLIDATE_INTERVAL = 600  # seconds between folding exited processes' snapshots into base.json
+PERCENTILE_MIN_SAMPLE = 30  # below this many assessments, fall back to get_percentile()
+BENCHMARK_MIN_LIVE_SAMPLE = 100  # below this many assessments, show the research benchmarks above
+PEER_BENCHMARK_MIN_SAMPLE = 20  # below this many assessments in a peer segment, hide "companies like you"
+
+# Peer segments (ENABLE_ORG_INFO_COLLECTION); "" = not provided
+INDUSTRY_OPTIONS = [
+    "",
+    "Technology",
+    "Healthcare",
+    "Financial Services",
+    "Manufacturing",
+    "Retail",
+    "Education",
+    "Professional Services",
+    "Other",
+]
+ORG_SIZE_OPTIONS = ["", "< 500", "500-2,000", "2,000-5,000", "5,000-10,000", "> 10,000"]
 
 
 # ===========================
@@ -165,7 +406,7 @@ def get_level_from_score(score):
 
 
 def get_percentile(score):
-    """Estimate percentile based on score (rough approximation)"""
+    """Estimate percentile based on score (rough approximation, used until live data exists)"""
     if score >= 22:
         return "Top 5%"
     elif score >= 20:
@@ -0,0 +1,104 @@
+"""
+Import-time budget for the app's cold start
+
+Imports a module (default: app, which renders the form page's imports) in a
+fresh interpreter with `python -X importtime`, and reports what it cost per
+top-level package. Fails (exit status 1) if the total exceeds
+config.IMPORT_TIME_BUDGET_MS or if a module that should only load on a later
+page or action (config.DEFERRED_IMPORTS) was imported.
+
+Usage:
+    python import_budget.py [module] [--budget-ms 400] [--top 15]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import config
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def measure_imports(module):
+    """
+    Import `module` in a fresh interpreter and parse -X importtime's report
+
+    Returns:
+        List of (name, self_us, cumulative_us, depth), in import completion order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def check_budget(module="app", budget_ms=None, deferred=None):
+    """
+    Measure a module's cold import against the budget
+
+    Args:
+        module: Module to import
+        budget_ms: Total budget (default: config.IMPORT_TIME_BUDGET_MS)
+        deferred: Modules that must not be imported (default: config.DEFERRED_IMPORTS)
+
+    Returns:
+        Dictionary with 'total_ms', 'budget_ms', 'packages' ([(package, ms)],
+        most expensive first) and 'deferred_loaded' (offending module names)
+    """
+    budget_ms = config.IMPORT_TIME_BUDGET_MS if budget_ms is None else budget_ms
+    deferred = config.DEFERRED_IMPORTS if deferred is None else deferred
+    entries = measure_imports(module)
+
+    packages = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        packages[name.split(".")[0]] += self_us
+    total_us = next(cumulative for name, _, cumulative, depth in entries if name == module and depth <= 1)
+
+    loaded = {name for name, _, _, _ in entries}
+    return {
+        "total_ms": total_us / 1000,
+        "budget_ms": budget_ms,
+        "packages": sorted(((name, us / 1000) for name, us in packages.items()), key=lambda item: -item[1]),
+        "deferred_loaded": [name for name in deferred if name in loaded],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a module's cold import time against a budget")
+    parser.add_argument("module", nargs="?", default="app")
+    parser.add_argument("--budget-ms", type=float, help=f"default: config.IMPORT_TIME_BUDGET_MS ({config.IMPORT_TIME_BUDGET_MS})")
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    args = parser.parse_args(argv)
+
+    result = check_budget(args.module, args.budget_ms)
+    for name, ms in result["packages"][:args.top]:
+        print(f"{ms:8.1f} ms  {name}")
+    print(f"{result['total_ms']:8.1f} ms  total for `import {args.module}` (budget {result['budget_ms']:.0f} ms)")
+
+    failed = False
+    if result["total_ms"] > result["budget_ms"]:
+        print(f"Over budget by {result['total_ms'] - result['budget_ms']:.1f} ms")
+        failed = True
+    if result["deferred_loaded"]:
+        print(f"Imported at startup but should be deferred: {', '.join(result['deferred_loaded'])}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Job IQ command-line tools
+
+    python -m jobiq score responses.csv -o scores.parquet [--workers 4] [--keep email]
+
+`score` backfills scores for a CSV, JSON-lines or Parquet export of form
+responses (columns named like the form's response dict). The input is split
+into bounded chunks (byte ranges aligned to line starts for CSV/JSONL, row
+groups for Parquet), each read and scored by a worker process with the
+vectorized batch_scoring functions, and written to Parquet or CSV in input
+order. At most a few chunks are in flight, so memory stays flat whatever the
+input size.
+
+Output columns: any --keep columns, dim1 .. dim7, total, level, level_name
+and recommendations (";"-joined recommendation IDs, see utils.RECOMMENDATIONS).
+
+CSV chunks are split at line breaks, so quoted CSV fields must not contain
+newlines.
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+import config
+from batch_scoring import SCORE_KEYS, dimension_vector_indices, score_frame
+from scoring_spec import SPEC
+from utils import get_level_info, recommendation_index
+
+INPUT_COLUMNS = tuple(SPEC.choice_options) + tuple(
+    key for keys in SPEC.checkbox_groups.values() for key in keys
+)
+
+_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet", ".pq": "parquet"}
+
+
+def file_format(path):
+    """'csv', 'jsonl' or 'parquet', from the file extension"""
+    suffix = Path(path).suffix.lower()
+    if suffix not in _FORMATS:
+        raise ValueError(f"Unsupported file type: {path} (expected .csv, .jsonl or .parquet)")
+    return _FORMATS[suffix]
+
+
+def plan_chunks(path, fmt, chunk_bytes):
+    """
+    Split an input file into independently readable chunks
+
+    Returns:
+        List of (start, end) byte ranges aligned to line starts (CSV/JSONL,
+        header line excluded), or of Parquet row group numbers
+    """
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        return list(range(pq.ParquetFile(path).num_row_groups))
+
+    chunks = []
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = len(f.readline()) if fmt == "csv" else 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()  # move to the next line start
+            end = min(f.tell(), size)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def read_chunk(path, fmt, chunk, columns):
+    """
+    Read one planned chunk as a DataFrame
+
+    Args:
+        columns: Columns to keep (others are skipped when reading; missing
+            ones are left out)
+    """
+    import pandas as pd
+
+    wanted = set(columns)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        present = [name for name in parquet.schema_arrow.names if name in wanted]
+        return parquet.read_row_group(chunk, columns=present).to_pandas()
+
+    start, end = chunk
+    with open(path, "rb") as f:
+        header = f.readline() if fmt == "csv" else b""
+        f.seek(start)
+        data = header + f.read(end - start)
+    if fmt == "csv":
+        # Everything as text: checkbox cells are parsed by batch_scoring
+        return pd.read_csv(io.BytesIO(data), usecols=lambda name: name in wanted, dtype=str, keep_default_na=False)
+    frame = pd.read_json(io.BytesIO(data), lines=True, dtype=False)
+    return frame[[name for name in frame.columns if name in wanted]]
+
+
+@lru_cache(maxsize=None)
+def _lookup_tables():
+    # (level by total, level names, recommendation category by dimension
+    # vector, recommendation categories)
+    levels = [get_level_info(total) for total in range(config.MAX_SCORE + 1)]
+    level_numbers = np.array([level["number"] for level in levels], dtype=np.uint8)
+    level_names = [get_level_info(config.LEVEL_THRESHOLDS[number][0])["name"] for number in config.LEVEL_THRESHOLDS]
+
+    categories = {}
+    by_vector = np.array(
+        [categories.setdefault(ids, len(categories)) for ids in recommendation_index()[0]],
+        dtype=np.int16,
+    )
+    return level_numbers, level_names, by_vector, [";".join(ids) for ids in categories]
+
+
+def score_chunk_frame(frame, keep=()):
+    """
+    Score a DataFrame of responses into the output columns
+
+    Args:
+        frame: Responses (see batch_scoring.encode_frame)
+        keep: Input columns copied to the output first
+
+    Returns:
+        DataFrame with the keep columns, dim1 .. dim7, total, level,
+        level_name and recommendations (categoricals share their categories
+        across chunks)
+    """
+    import pandas as pd
+
+    level_numbers, level_names, by_vector, recommendations = _lookup_tables()
+    scores = score_frame(frame)
+    levels = level_numbers[scores["total"]]
+
+    output = {name: (frame[name] if name in frame else pd.Series([None] * len(frame))).to_numpy() for name in keep}
+    output.update((key, scores[key]) for key in SCORE_KEYS)
+    output["level"] = levels
+    output["level_name"] = pd.Categorical.from_codes(levels - 1, categories=level_names)
+    output["recommendations"] = pd.Categorical.from_codes(
+        by_vector[dimension_vector_indices(scores)], categories=recommendations
+    )
+    return pd.DataFrame(output)
+
+
+def _score_chunk(path, fmt, chunk, keep):
+    # Worker entry point: read and score one chunk
+    frame = read_chunk(path, fmt, chunk, INPUT_COLUMNS + tuple(keep))
+    return score_chunk_frame(frame, keep)
+
+
+class _ParquetOutput:
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pandas(frame, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _CsvOutput:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+def score_file(path, output, workers=None, chunk_mb=16, keep=(), progress=None):
+    """
+    Score every response in a CSV/JSONL/Parquet file into a Parquet or CSV file
+
+    Args:
+        path: Input file
+        output: Output file (.parquet or .csv)
+        workers: Worker processes (default: one per core; 0 scores inline)
+        chunk_mb: Approximate CSV/JSONL chunk size in megabytes
+        keep: Input columns copied to the output (e.g. a respondent id)
+        progress: Optional callable(rows, seconds), called after each chunk
+
+    Returns:
+        Dictionary with 'rows', 'chunks' and 'seconds'
+    """
+    import pandas as pd
+
+    started = time.perf_counter()
+    fmt = file_format(path)
+    output_fmt = file_format(output)
+    if output_fmt == "jsonl":
+        raise ValueError("Output must be .parquet or .csv")
+    workers = os.cpu_count() if workers is None else workers
+    chunks = plan_chunks(path, fmt, int(chunk_mb * 1024 * 1024))
+    keep = tuple(keep)
+
+    writer = _ParquetOutput(output) if output_fmt == "parquet" else _CsvOutput(output)
+    rows = 0
+
+    def write(frame):
+        nonlocal rows
+        writer.write(frame)
+        rows += len(frame)
+        if progress:
+            progress(rows, time.perf_counter() - started)
+
+    try:
+        if not workers:
+            for chunk in chunks:
+                write(_score_chunk(path, fmt, chunk, keep))
+        else:
+            # Two chunks per worker in flight: one running, one queued
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                in_flight = deque()
+                for chunk in chunks:
+                    if len(in_flight) >= 2 * workers:
+                        write(in_flight.popleft().result())
+                    in_flight.append(executor.submit(_score_chunk, path, fmt, chunk, keep))
+                while in_flight:
+                    write(in_flight.popleft().result())
+        if not chunks:
+            write(score_chunk_frame(pd.DataFrame(), keep))  # header / schema only
+    finally:
+        writer.close()
+
+    return {"rows": rows, "chunks": len(chunks), "seconds": time.perf_counter() - started}
+
+
+def _progress_printer(interval=2.0):
+    last = [0.0]
+
+    def progress(rows, seconds):
+        if seconds - last[0] >= interval:
+            last[0] = seconds
+            print(f"{rows:,} rows in {seconds:.1f}s: {rows / seconds:,.0f} rows/s", file=sys.stderr)
+
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m jobiq", description="Job IQ command-line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="score a CSV/JSONL/Parquet response export")
+    score.add_argument("input", help="responses (.csv, .jsonl or .parquet)")
+    score.add_argument("-o", "--output", required=True, help="scores file to write (.parquet or .csv)")
+    score.add_argument("--workers", type=int, help="worker processes (default: one per core; 0 = inline)")
+    score.add_argument("--chunk-mb", type=float, default=16, help="CSV/JSONL chunk size in MB")
+    score.add_argument("--keep", default="", help="comma-separated input columns to copy (e.g. email)")
+    args = parser.parse_args(argv)
+
+    if args.command == "score":
+        try:
+            result = score_file(
+                args.input,
+                args.output,
+                workers=args.workers,
+                chunk_mb=args.chunk_mb,
+                keep=[name for name in args.keep.split(",") if name],
+                progress=_progress_printer(),
+            )
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+        seconds = max(result["seconds"], 1e-9)
+        print(
+            f"Scored {result['rows']:,} rows ({result['chunks']} chunks) in {seconds:.1f}s: "
+            f"{result['rows'] / seconds:,.0f} rows/s -> {args.output}"
+        )
+
+
+if __name__ == "__main__":
+    main()
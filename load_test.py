@@ -0,0 +1,356 @@
+"""
+Concurrent-session load test for the Streamlit app
+
+Replays the whole assessment flow of app.py with Streamlit's testing API
+(AppTest): load the form, answer every question at random, submit ("Calculate
+My Job IQ"), view the results and download the PDF report. Each concurrency
+level runs that many sessions at once, each repeating the flow for
+--duration seconds; then the next level starts.
+
+AppTest swaps in a process-global runtime for every script run, so
+concurrent sessions run in separate worker processes rather than threads.
+They compete for the same cores and share the answer table and percentile
+snapshots (written to a temporary directory), but not the in-process caches
+one server's sessions would share, so the figures lean pessimistic. Reports
+render inline in each session's process (config.PDF_WORKERS = 0) so their
+CPU is counted with the session.
+
+Recorded per level: rerun latency percentiles (per step and overall),
+completed assessments and reruns per second, CPU per assessment, peak RSS
+per session process, and the memory a finished session holds until it is
+closed (tracemalloc, measured after the timed run). --output writes the same
+figures, plus the environment, as JSON so runs can be compared.
+
+Usage:
+    python load_test.py [--concurrency 1,2,4,8] [--duration 20] [--memory-sessions 10]
+                        [--output load_report.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import config
+from api_bench import random_responses
+
+APP_PATH = Path(__file__).parent / "app.py"
+
+STEPS = ("load", "submit", "view", "pdf")  # one script run each
+
+_WORKER_TIMEOUT = 600  # seconds for a worker's warm-up and memory phase, beyond --duration
+
+
+def fill_form(at, responses):
+    """Set the assessment form's widgets from a response dict (committed on submit)"""
+    widgets = {
+        widget.key: widget
+        for kind in (at.radio, at.select_slider, at.checkbox, at.selectbox)
+        for widget in kind
+    }
+    for key, value in responses.items():
+        widgets[key].set_value(value)
+
+
+def _click(at, label):
+    button = next((button for button in at.button if button.label == label), None)
+    if button is None:
+        raise RuntimeError(f"No {label!r} button")
+    button.click()
+
+
+def run_assessment(responses, app_path=APP_PATH, timeout=60):
+    """
+    Take one new session through the whole flow
+
+    Args:
+        responses: Answers, keyed like the form's widgets (see
+            api_bench.random_responses), plus 'industry' and 'org_size' when
+            config.ENABLE_ORG_INFO_COLLECTION shows those fields
+
+    Returns:
+        (AppTest, {step: seconds}) with one timed script run per step in STEPS
+
+    Raises:
+        RuntimeError: if the app raised, or a step's button or result is missing
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(app_path), default_timeout=timeout)
+    timings = {}
+
+    def run(step):
+        started = time.perf_counter()
+        at.run()
+        timings[step] = time.perf_counter() - started
+        if at.exception:
+            raise RuntimeError(f"{step}: {at.exception[0].message}")
+
+    run("load")
+    fill_form(at, responses)
+    _click(at, "Calculate My Job IQ")
+    run("submit")
+    _click(at, "View My Job IQ Results")
+    run("view")
+    _click(at, "Download Report (PDF)")
+    run("pdf")
+    if not at.get("download_button"):
+        raise RuntimeError(f"pdf: no download button ({[error.value for error in at.error]})")
+    return at, timings
+
+
+def _peak_rss():
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+def session_memory(responses, sessions, app_path=APP_PATH):
+    """
+    Bytes each finished session keeps until it is closed (tracemalloc)
+
+    Runs `sessions` sessions through the flow and keeps their session state,
+    as the server does for open tabs, then closes them all. Memory that is
+    released counts; caches the runs filled (process-wide) do not.
+
+    Args:
+        responses: Callable returning a new response dict per session
+    """
+    import gc
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        open_sessions = [run_assessment(responses(), app_path)[0].session_state for _ in range(sessions)]
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+        open_sessions.clear()
+        gc.collect()
+        return (held - tracemalloc.get_traced_memory()[0]) / sessions
+    finally:
+        tracemalloc.stop()
+
+
+def _session_worker(app_path, duration, seed, data_dir, memory_sessions, barrier, results):
+    # Worker process: one simulated session after another until the deadline
+    try:
+        config.PERCENTILE_SNAPSHOT_DIR = data_dir
+        config.PDF_WORKERS = 0
+        rng = random.Random(seed)
+
+        def responses():
+            answers = random_responses(rng)
+            if config.ENABLE_ORG_INFO_COLLECTION:
+                answers["industry"] = rng.choice(config.INDUSTRY_OPTIONS)
+                answers["org_size"] = rng.choice(config.ORG_SIZE_OPTIONS)
+            return answers
+
+        run_assessment(responses(), app_path)  # warm-up: imports, answer table, assets
+        latencies = {step: [] for step in STEPS}
+        assessments = 0
+        errors = []
+        barrier.wait(_WORKER_TIMEOUT)
+
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        while time.perf_counter() - started < duration:
+            try:
+                at, timings = run_assessment(responses(), app_path)
+            except Exception as exc:
+                errors.append(str(exc))
+                continue
+            assessments += 1
+            for step, seconds in timings.items():
+                latencies[step].append(seconds)
+
+        seconds = time.perf_counter() - started
+        cpu_seconds = time.process_time() - cpu_started
+
+        results.put({
+            "seconds": seconds,
+            "cpu_seconds": cpu_seconds,
+            "assessments": assessments,
+            "errors": errors,
+            "latencies": latencies,
+            "peak_rss": _peak_rss(),
+            # Untimed (tracemalloc slows every allocation)
+            "session_bytes": session_memory(responses, memory_sessions, app_path) if memory_sessions else None,
+        })
+    except Exception as exc:
+        barrier.abort()
+        results.put({"failed": f"{type(exc).__name__}: {exc}"})
+
+
+def _percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+
+    def pick(q):
+        return 1000 * values[min(len(values) - 1, int(q * len(values)))]
+
+    return {"p50": pick(0.50), "p90": pick(0.90), "p99": pick(0.99), "max": 1000 * values[-1], "count": len(values)}
+
+
+def run_level(concurrency, duration, app_path=APP_PATH, seed=0, memory_sessions=10):
+    """
+    Run `concurrency` simulated sessions in parallel for `duration` seconds
+
+    Args:
+        memory_sessions: Sessions per worker measured by session_memory()
+            after the timed run (0 skips the measurement)
+
+    Returns:
+        Dictionary with 'concurrency', 'seconds', 'assessments', 'errors',
+        'error_samples', 'assessments_per_s', 'reruns_per_s', 'latency_ms'
+        ({step or 'all': {'p50', 'p90', 'p99', 'max', 'count'}}),
+        'cpu_s_per_assessment', 'cpu_cores_busy', 'memory_per_session_kb'
+        and 'peak_rss_mb' (largest session process)
+
+    Raises:
+        RuntimeError: if a worker process failed to start its sessions
+    """
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(concurrency)
+    results = context.Queue()
+    with tempfile.TemporaryDirectory(prefix="jobiq-load-") as data_dir:
+        workers = [
+            context.Process(
+                target=_session_worker,
+                args=(str(app_path), duration, seed * 1000 + i, data_dir, memory_sessions, barrier, results),
+                daemon=True,
+            )
+            for i in range(concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            outcomes = [results.get(timeout=duration + _WORKER_TIMEOUT) for _ in workers]
+        except queue.Empty:
+            raise RuntimeError(f"Session workers did not finish within {duration + _WORKER_TIMEOUT:.0f}s") from None
+        finally:
+            for worker in workers:
+                worker.join(5)
+                if worker.is_alive():
+                    worker.terminate()
+
+    failed = [outcome["failed"] for outcome in outcomes if "failed" in outcome]
+    if failed:
+        raise RuntimeError(f"Session worker failed: {failed[0]}")
+
+    seconds = max(outcome["seconds"] for outcome in outcomes)
+    assessments = sum(outcome["assessments"] for outcome in outcomes)
+    errors = [error for outcome in outcomes for error in outcome["errors"]]
+    latencies = {step: [value for outcome in outcomes for value in outcome["latencies"][step]] for step in STEPS}
+    cpu_seconds = sum(outcome["cpu_seconds"] for outcome in outcomes)
+    session_bytes = [outcome["session_bytes"] for outcome in outcomes if outcome["session_bytes"] is not None]
+    return {
+        "concurrency": concurrency,
+        "seconds": seconds,
+        "assessments": assessments,
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "assessments_per_s": assessments / seconds,
+        "reruns_per_s": assessments * len(STEPS) / seconds,
+        "latency_ms": dict(
+            {step: _percentiles(values) for step, values in latencies.items()},
+            all=_percentiles([value for values in latencies.values() for value in values]),
+        ),
+        "cpu_s_per_assessment": cpu_seconds / assessments if assessments else None,
+        "cpu_cores_busy": cpu_seconds / seconds,
+        "memory_per_session_kb": sum(session_bytes) / len(session_bytes) / 1024 if session_bytes else None,
+        "peak_rss_mb": max(outcome["peak_rss"] for outcome in outcomes) / 1024 ** 2,
+    }
+
+
+def run_load_test(levels, duration, app_path=APP_PATH, seed=0, memory_sessions=10, progress=None):
+    """
+    Run each concurrency level in turn
+
+    Args:
+        levels: Concurrency levels, e.g. (1, 2, 4, 8)
+        duration: Seconds per level
+        memory_sessions: See run_level
+        progress: Optional callable(level result), called after each level
+
+    Returns:
+        Report dictionary: environment details and 'levels' (see run_level)
+    """
+    import streamlit
+
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "app": str(app_path),
+        "duration_s": duration,
+        "memory_sessions": memory_sessions,
+        "steps": list(STEPS),
+        "environment": {
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "levels": [],
+    }
+    for concurrency in levels:
+        level = run_level(concurrency, duration, app_path, seed, memory_sessions)
+        report["levels"].append(level)
+        if progress:
+            progress(level)
+    return report
+
+
+def _print_level(level):
+    latency = level["latency_ms"]["all"] or {"p50": 0, "p90": 0, "p99": 0}
+    cpu = level["cpu_s_per_assessment"]
+    memory = level["memory_per_session_kb"]
+    print(
+        f"{level['concurrency']:>4} sessions: {level['assessments_per_s']:6.2f} assessments/s "
+        f"({level['reruns_per_s']:6.1f} reruns/s), rerun p50 {latency['p50']:6.0f} ms "
+        f"p90 {latency['p90']:6.0f} ms p99 {latency['p99']:6.0f} ms, "
+        f"{'n/a' if cpu is None else f'{1000 * cpu:.0f} ms'} CPU/assessment, "
+        f"{level['cpu_cores_busy']:.1f} cores, "
+        f"{'n/a' if memory is None else f'{memory:.0f} KB'}/session, {level['errors']} errors",
+        flush=True,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test app.py with concurrent simulated sessions")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per level")
+    parser.add_argument("--memory-sessions", type=int, default=10, help="sessions per worker measured for memory (0 = skip)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+    try:
+        levels = [int(level) for level in args.concurrency.split(",") if level]
+    except ValueError:
+        parser.error(f"Invalid --concurrency: {args.concurrency}")
+    if not levels or min(levels) < 1:
+        parser.error("--concurrency levels must be positive")
+    if args.memory_sessions < 0:
+        parser.error("--memory-sessions must not be negative")
+
+    try:
+        report = run_load_test(
+            levels, args.duration, seed=args.seed, memory_sessions=args.memory_sessions, progress=_print_level
+        )
+    except RuntimeError as exc:
+        sys.exit(f"Load test failed: {exc}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
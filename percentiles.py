@@ -0,0 +1,415 @@
+"""
+Live score percentiles for Job IQ
+
+Scores are small integers (0-28 total, 0-4 per dimension), so the quantile
+sketch is an exact histogram: O(1) to update, trivially mergeable across
+processes, and O(1) to query once its cumulative counts are cached.
+
+Sketches are kept per peer segment (industry x org size x framework version)
+with every roll-up ("*" = all values) maintained on update, so any marginal
+is a dictionary lookup.
+
+Each process records into its own snapshot file under
+config.PERCENTILE_SNAPSHOT_DIR and periodically re-reads the other processes'
+files, so the live population is shared without any process scanning the
+stored assessments. Each process holds a flock on a companion .lock file
+while it runs; snapshots of processes that have exited are folded into one
+base snapshot, so a sync reads one file per live process plus the base.
+"""
+
+import atexit
+import fcntl
+import itertools
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import config
+from utils import DIMENSION_KEYS
+
+
+class ScoreHistogram:
+    """Exact, mergeable distribution of integer scores in 0..max_value"""
+
+    __slots__ = ('counts', '_below')
+
+    def __init__(self, max_value, counts=None):
+        self.counts = list(counts) if counts is not None else [0] * (max_value + 1)
+        if len(self.counts) != max_value + 1:
+            raise ValueError(f"Expected {max_value + 1} buckets, got {len(self.counts)}")
+        self._below = None
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def add(self, value, weight=1):
+        self.counts[value] += weight
+        self._below = None
+
+    def merge(self, other):
+        for value, weight in enumerate(other.counts):
+            self.counts[value] += weight
+        self._below = None
+
+    def _cumulative(self):
+        # _below[v] = number of scores strictly below v (last entry = total count)
+        if self._below is None:
+            below = [0]
+            for weight in self.counts:
+                below.append(below[-1] + weight)
+            self._below = below
+        return self._below
+
+    def percentile(self, value):
+        """
+        Mid-rank percentile of a score (0-100), or None if the histogram is empty
+        """
+        below = self._cumulative()
+        total = below[-1]
+        if not total:
+            return None
+        value = min(max(value, 0), len(self.counts) - 1)
+        return 100.0 * (below[value] + 0.5 * self.counts[value]) / total
+
+    def quantile(self, q):
+        """Smallest score with at least a fraction q of the population at or below it"""
+        below = self._cumulative()
+        total = below[-1]
+        if not total:
+            return None
+        target = q * total
+        for value in range(len(self.counts)):
+            if below[value + 1] >= target:
+                return value
+        return len(self.counts) - 1
+
+
+class PercentileSketch:
+    """Histograms for the total score and each dimension"""
+
+    def __init__(self):
+        self.total = ScoreHistogram(config.MAX_SCORE)
+        self.dimensions = {
+            key: ScoreHistogram(config.MAX_SCORE_PER_DIMENSION) for key in DIMENSION_KEYS
+        }
+
+    @property
+    def count(self):
+        return self.total.count
+
+    def histogram(self, dimension='total'):
+        return self.total if dimension == 'total' else self.dimensions[dimension]
+
+    def update(self, scores):
+        """Add one assessment's scores dict"""
+        self.total.add(scores['total'])
+        for key, histogram in self.dimensions.items():
+            histogram.add(scores[key])
+
+    def merge(self, other):
+        self.total.merge(other.total)
+        for key, histogram in self.dimensions.items():
+            histogram.merge(other.dimensions[key])
+
+    def to_dict(self):
+        return {
+            'total': self.total.counts,
+            'dimensions': {key: h.counts for key, h in self.dimensions.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls()
+        sketch.total = ScoreHistogram(config.MAX_SCORE, data['total'])
+        for key in DIMENSION_KEYS:
+            sketch.dimensions[key] = ScoreHistogram(
+                config.MAX_SCORE_PER_DIMENSION, data['dimensions'][key]
+            )
+        return sketch
+
+
+# Wildcard segment value: the roll-up over every value of that axis
+ALL = '*'
+
+
+class SegmentedSketch:
+    """
+    Cube of PercentileSketches over (industry, org_size, framework_version)
+
+    Each update touches the assessment's own cell and all of its roll-ups
+    (up to 2^3 = 8 cells); axes without a value only feed the ALL roll-up.
+    """
+
+    def __init__(self):
+        self.cells = {}
+
+    @staticmethod
+    def cell_keys(industry=None, org_size=None, version=None):
+        axes = [(value, ALL) if value else (ALL,) for value in (industry, org_size, version)]
+        return itertools.product(*axes)
+
+    @property
+    def count(self):
+        cell = self.cells.get((ALL, ALL, ALL))
+        return cell.count if cell else 0
+
+    def update(self, scores, industry=None, org_size=None, version=None):
+        for key in self.cell_keys(industry, org_size, version):
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = PercentileSketch()
+            cell.update(scores)
+
+    def cell(self, industry=None, org_size=None, version=None):
+        """Sketch for one segment (None/empty = ALL), or None if it has no data"""
+        return self.cells.get((industry or ALL, org_size or ALL, version or ALL))
+
+    def merge(self, other):
+        for key, sketch in other.cells.items():
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = PercentileSketch()
+            cell.merge(sketch)
+
+    def to_dict(self):
+        return {'cells': [[list(key), sketch.to_dict()] for key, sketch in self.cells.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        cube = cls()
+        for key, sketch in data['cells']:
+            cube.cells[tuple(key)] = PercentileSketch.from_dict(sketch)
+        return cube
+
+
+class PercentileStore:
+    """
+    Process-wide live percentiles backed by per-process snapshot files
+
+    Updates go to this process's own sketch; other processes' snapshots are
+    merged in as a read-only base and refreshed every snapshot interval.
+    Every consolidate interval, snapshots whose process has exited are folded
+    into base.json (see consolidate()).
+    """
+
+    def __init__(self, directory=None, interval=None, consolidate_interval=None):
+        self.directory = Path(directory) if directory else Path(__file__).parent / config.PERCENTILE_SNAPSHOT_DIR
+        self.interval = config.PERCENTILE_SNAPSHOT_INTERVAL if interval is None else interval
+        self.consolidate_interval = (config.PERCENTILE_CONSOLIDATE_INTERVAL if consolidate_interval is None
+                                     else consolidate_interval)
+        self._own_path = self.directory / f"sketch-{uuid.uuid4().hex}.json"
+        self._own_lock = self._hold_lock()
+        self._own = SegmentedSketch()
+        self._combined = SegmentedSketch()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_sync = 0.0
+        self._last_consolidate = 0.0
+        self.version = 0  # bumped whenever the combined sketch changes
+        self._sync(force=True)
+
+    def _hold_lock(self):
+        # Held until the process exits; lock under a temporary name, then
+        # rename, so consolidate() never sees the lock file unlocked
+        self.directory.mkdir(parents=True, exist_ok=True)
+        new_path = self._own_path.with_suffix('.new')
+        handle = open(new_path, 'w')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            os.replace(new_path, self._own_path.with_suffix('.lock'))
+        except BaseException:
+            handle.close()
+            new_path.unlink(missing_ok=True)
+            raise
+        return handle
+
+    def _read_base(self):
+        try:
+            data = json.loads((self.directory / "base.json").read_text())
+        except FileNotFoundError:
+            return {'cells': [], 'folded': []}
+        return data
+
+    def _load_others(self):
+        if not self.directory.exists():
+            return SegmentedSketch()
+        try:
+            data = self._read_base()
+        except (OSError, ValueError):
+            data = {'cells': [], 'folded': []}
+        base = SegmentedSketch.from_dict(data)
+        folded = set(data['folded'])  # already in base.json, not yet deleted
+        for path in self.directory.glob("sketch-*.json"):
+            if path == self._own_path or path.name in folded:
+                continue
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # Being replaced or unreadable; picked up next sync
+            if 'cells' in data:
+                base.merge(SegmentedSketch.from_dict(data))
+        return base
+
+    def consolidate(self):
+        """
+        Fold the snapshots of exited processes into base.json and delete them
+
+        Runs in one process at a time (others skip it). base.json lists the
+        snapshots it has folded until the next run deletes them, so readers
+        never count a snapshot twice and a crash between writing base.json and
+        deleting the snapshots loses nothing.
+
+        Returns:
+            Number of snapshots folded, or None if another process is consolidating
+        """
+        with open(self.directory / "consolidate.lock", 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None
+            data = self._read_base()
+            for name in data['folded']:
+                (self.directory / name).unlink(missing_ok=True)
+                (self.directory / name).with_suffix('.lock').unlink(missing_ok=True)
+
+            base = SegmentedSketch.from_dict(data)
+            folded = []
+            for path in sorted(self.directory.glob("sketch-*.json")):
+                if _is_locked(path.with_suffix('.lock')):
+                    continue
+                try:
+                    base.merge(SegmentedSketch.from_dict(json.loads(path.read_text())))
+                except (KeyError, TypeError, ValueError):
+                    continue  # Not a snapshot; left alone
+                folded.append(path.name)
+            for path in self.directory.glob("sketch-*.lock"):
+                if not path.with_suffix('.json').exists() and not _is_locked(path):
+                    path.unlink(missing_ok=True)  # Exited before writing a snapshot
+
+            if folded or data['folded']:
+                tmp_path = self.directory / "base.tmp"
+                tmp_path.write_text(json.dumps(dict(base.to_dict(), folded=folded)))
+                os.replace(tmp_path, self.directory / "base.json")
+            for name in folded:
+                (self.directory / name).unlink()
+                (self.directory / name).with_suffix('.lock').unlink(missing_ok=True)
+            return len(folded)
+
+    def _sync(self, force=False):
+        # Caller holds the lock (or is __init__)
+        now = time.monotonic()
+        if not force and now - self._last_sync < self.interval:
+            return
+        self._last_sync = now
+        if self._dirty:
+            self._write_own()
+        if force or now - self._last_consolidate >= self.consolidate_interval:
+            self._last_consolidate = now
+            try:
+                self.consolidate()
+            except (OSError, ValueError):
+                pass  # Retried next consolidate interval
+        combined = self._load_others()
+        combined.merge(self._own)
+        if combined.to_dict() != self._combined.to_dict():
+            self._combined = combined
+            self.version += 1
+
+    def _write_own(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._own_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self._own.to_dict()))
+        os.replace(tmp_path, self._own_path)
+        self._dirty = False
+
+    def record(self, scores, industry=None, org_size=None):
+        """Add one assessment's scores dict (and its peer segment) to the live population"""
+        with self._lock:
+            self._own.update(scores, industry, org_size, config.FRAMEWORK_VERSION)
+            self._combined.update(scores, industry, org_size, config.FRAMEWORK_VERSION)
+            self._dirty = True
+            self.version += 1
+            self._sync()
+
+    def flush(self):
+        """Write this process's snapshot now"""
+        with self._lock:
+            if self._dirty:
+                self._write_own()
+
+    def sketch(self, industry=None, org_size=None):
+        """Current combined sketch (all processes) for a peer segment of this framework version"""
+        return self.versioned_sketch(industry, org_size)[1]
+
+    def versioned_sketch(self, industry=None, org_size=None, version=None):
+        """
+        (store version, sketch) for one segment, read together
+
+        The sketch is empty if the segment has no data yet.
+        """
+        with self._lock:
+            self._sync()
+            cell = self._combined.cell(industry, org_size, version or config.FRAMEWORK_VERSION)
+            return self.version, cell if cell is not None else PercentileSketch()
+
+    def percentile(self, score, dimension='total'):
+        """Mid-rank percentile (0-100) of a score, or None below the minimum sample size"""
+        sketch = self.sketch()
+        if sketch.count < config.PERCENTILE_MIN_SAMPLE:
+            return None
+        return sketch.histogram(dimension).percentile(score)
+
+
+def _is_locked(path):
+    # A store holds an exclusive flock on its .lock file while its process runs
+    try:
+        with open(path, 'rb') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            fcntl.flock(f, fcntl.LOCK_UN)
+            return False
+    except FileNotFoundError:
+        return False
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_percentile_store():
+    """Return the process-wide PercentileStore"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PercentileStore()
+                atexit.register(_store.flush)
+    return _store
+
+
+def format_percentile(percentile):
+    """Render a percentile as "Top N%" / "Bottom N%" """
+    top = 100.0 - percentile
+    if top <= 50:
+        return f"Top {max(1, math.ceil(top))}%"
+    return f"Bottom {max(1, math.ceil(percentile))}%"
+
+
+def get_percentile_label(score):
+    """
+    Percentile label for a total score from the live population
+
+    Falls back to config.get_percentile's research-based estimate until
+    PERCENTILE_MIN_SAMPLE assessments have been recorded.
+    """
+    percentile = get_percentile_store().percentile(score)
+    if percentile is None:
+        return config.get_percentile(score)
+    return format_percentile(percentile)
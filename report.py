@@ -0,0 +1,302 @@
+"""
+PDF report generation for Job IQ
+
+Reports are rendered in a bounded pool of worker processes, so FPDF's
+CPU-bound work never holds the GIL of the Streamlit server process. Each
+report is fully described by a hashable ReportJob (score vector, level,
+benchmark figures as printed, framework and branding versions), which is
+both the work item and the cache key: finished PDFs are kept in an LRU and
+identical in-flight requests share one future, so no report is rendered
+twice.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fpdf import FPDF
+
+import config
+from caching import register_cache
+from charts import radar_png
+from utils import DIMENSION_KEYS, get_recommendations
+
+ReportJob = namedtuple(
+    "ReportJob",
+    [
+        "dimension_scores",            # tuple of the 7 dimension scores
+        "total",
+        "level_number",
+        "level_name",
+        "benchmark_mean",              # rounded as printed (0.1)
+        "benchmark_dimension_means",   # rounded to 0.01 (radar chart)
+        "percentile_label",
+        "framework_version",
+        "branding_version",
+    ],
+)
+
+
+class ReportQueueFull(Exception):
+    """Too many reports are already being generated; try again shortly"""
+
+
+def build_report_job(scores, level_info, benchmark, percentile_label):
+    """
+    Describe a report
+
+    Benchmark figures are rounded to the precision the report shows, so
+    small live-benchmark movements do not defeat the cache.
+    """
+    return ReportJob(
+        dimension_scores=tuple(scores[key] for key in DIMENSION_KEYS),
+        total=scores["total"],
+        level_number=level_info["number"],
+        level_name=level_info["name"],
+        benchmark_mean=round(benchmark.mean_score, 1),
+        benchmark_dimension_means=tuple(round(mean, 2) for mean in benchmark.dimension_means),
+        percentile_label=percentile_label,
+        framework_version=config.FRAMEWORK_VERSION,
+        branding_version=config.BRANDING_VERSION,
+    )
+
+
+def _pdf_text(text):
+    """Reduce text to the Latin-1 range supported by FPDF's core fonts"""
+    text = text.replace("—", "-").replace("–", "-").replace("’", "'")
+    return text.encode("latin-1", "ignore").decode("latin-1").strip()
+
+
+def create_pdf_report(job):
+    """
+    Generate a PDF report with Job IQ assessment results
+
+    Runs in the report worker processes, so everything the report shows
+    comes from the job (nothing is read from process-wide state).
+
+    Args:
+        job: ReportJob (see build_report_job)
+
+    Returns:
+        PDF bytes
+    """
+    scores = dict(zip(DIMENSION_KEYS, job.dimension_scores), total=job.total)
+    level_info = {"number": job.level_number, "name": job.level_name}
+
+    pdf = FPDF()
+    pdf.add_page()
+
+    # Set up fonts and colors
+    pdf.set_font("Arial", "B", 20)
+    pdf.set_text_color(13, 88, 101)  # JDX teal color
+
+    # Title
+    pdf.cell(0, 20, "Job IQ Assessment Report", ln=True, align="C")
+    pdf.ln(10)
+
+    # Score section
+    pdf.set_font("Arial", "B", 16)
+    pdf.set_text_color(60, 60, 60)  # Dark gray
+    pdf.cell(0, 12, "Your Results:", ln=True)
+    pdf.ln(5)
+
+    # Main score
+    pdf.set_font("Arial", "B", 24)
+    pdf.set_text_color(255, 135, 67)  # JDX orange
+    pdf.cell(0, 15, f"Job IQ Score: {scores['total']}/28", ln=True, align="C")
+    pdf.ln(5)
+
+    # Level info
+    pdf.set_font("Arial", "B", 16)
+    pdf.set_text_color(60, 60, 60)
+    pdf.cell(0, 12, f"Level {level_info['number']}: {level_info['name']}", ln=True, align="C")
+    pdf.ln(10)
+
+    # Benchmarking
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 12, "Industry Benchmarking:", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", "", 12)
+    pdf.cell(0, 8, f"Your Score: {scores['total']}/28", ln=True)
+    pdf.cell(0, 8, f"Industry Average: {job.benchmark_mean:.1f}/28", ln=True)
+    pdf.cell(0, 8, f"Estimated Percentile: {job.percentile_label}", ln=True)
+    pdf.ln(10)
+
+    # Dimension breakdown
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 12, "Dimension Scores:", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", "", 12)
+    dimensions = [
+        "Coverage", "Governance", "Velocity", "Architecture",
+        "Integration", "Controls", "Ability to Act"
+    ]
+
+    for i, dimension in enumerate(dimensions, 1):
+        pdf.cell(0, 8, f"{dimension}: {scores[f'dim{i}']}/4", ln=True)
+
+    pdf.ln(5)
+
+    # Radar chart (native PNG rendering; FPDF 1.7 only embeds images from files)
+    png = radar_png(job.dimension_scores, job.benchmark_dimension_means)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chart_path = os.path.join(tmp_dir, "radar.png")
+        with open(chart_path, "wb") as f:
+            f.write(png)
+        chart_width = 120
+        pdf.image(chart_path, x=(pdf.w - chart_width) / 2, w=chart_width)
+
+    pdf.ln(10)
+
+    # Recommendations (same precomputed index as the results page)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 12, "Personalized Recommendations:", ln=True)
+    pdf.ln(2)
+
+    for i, rec in enumerate(get_recommendations(scores, level_info["number"]), 1):
+        pdf.set_font("Arial", "B", 12)
+        pdf.multi_cell(0, 7, _pdf_text(f"{i}. {rec['title']}"))
+        pdf.set_font("Arial", "", 11)
+        pdf.multi_cell(0, 6, _pdf_text(rec["description"]))
+        pdf.ln(3)
+
+    pdf.ln(5)
+
+    # Footer
+    pdf.set_font("Arial", "I", 10)
+    pdf.set_text_color(100, 100, 100)
+    pdf.cell(0, 8, "Generated by JDX Job IQ Assessment", ln=True, align="C")
+    pdf.cell(0, 8, "Learn more at jdxpert.com", ln=True, align="C")
+
+    return pdf.output(dest="S").encode("latin1")
+
+
+class ReportService:
+    """
+    Generates report PDFs off the calling thread, with caching and a queue limit
+
+    Jobs run in a ProcessPoolExecutor (spawned workers: safe alongside the
+    server's threads). At most max_pending distinct reports may be queued or
+    running; beyond that submit() raises ReportQueueFull instead of letting
+    a burst pile up. With max_workers=0 reports render inline. If a worker
+    process dies, the reports it was running fail and the pool is replaced.
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, cache_size=None):
+        self.max_workers = config.PDF_WORKERS if max_workers is None else max_workers
+        self.max_pending = max_pending or config.PDF_MAX_PENDING
+        self.cache_size = cache_size or config.PDF_CACHE_SIZE
+        self._executor = None
+        self._cache = OrderedDict()  # ReportJob -> PDF bytes, least recently used first
+        self._pending = {}  # ReportJob -> Future
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "shared": 0, "rejected": 0}
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _discard_pool(self, executor):
+        # A worker died (killed, out of memory): the executor refuses all new
+        # work, so the next report starts a fresh pool. Caller holds the lock.
+        if executor is not None and self._executor is executor:
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _store(self, job, future, executor):
+        with self._lock:
+            self._pending.pop(job, None)
+            if isinstance(future.exception(), BrokenProcessPool):
+                self._discard_pool(executor)
+            elif future.exception() is None:
+                self._cache[job] = future.result()
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+    def submit(self, job):
+        """
+        Future for a report's PDF bytes
+
+        Raises:
+            ReportQueueFull: max_pending reports are already queued or running
+        """
+        with self._lock:
+            pdf = self._cache.get(job)
+            if pdf is not None:
+                self._cache.move_to_end(job)
+                self.counters["hits"] += 1
+                future = Future()
+                future.set_result(pdf)
+                return future
+            future = self._pending.get(job)
+            if future is not None:
+                self.counters["shared"] += 1
+                return future
+            if len(self._pending) >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise ReportQueueFull(f"{len(self._pending)} reports already in progress")
+            self.counters["misses"] += 1
+            executor = None
+            if self.max_workers:
+                executor = self._pool()
+                try:
+                    future = executor.submit(create_pdf_report, job)
+                except BrokenProcessPool:
+                    self._discard_pool(executor)
+                    executor = self._pool()
+                    future = executor.submit(create_pdf_report, job)
+            else:
+                future = Future()
+            self._pending[job] = future
+
+        if not self.max_workers:
+            try:
+                future.set_result(create_pdf_report(job))
+            except Exception as e:
+                future.set_exception(e)
+        future.add_done_callback(lambda done: self._store(job, done, executor))
+        return future
+
+    def generate(self, job, timeout=None):
+        """PDF bytes for a report, waiting (without holding the GIL) for a worker"""
+        return self.submit(job).result(timeout or config.PDF_TIMEOUT)
+
+    def stats(self):
+        """Cache and queue counters"""
+        with self._lock:
+            return dict(self.counters, pending=len(self._pending), cached=len(self._cache))
+
+    def cache_counts(self):
+        """(hits, misses, entries) of the report cache (see caching.register_cache)"""
+        stats = self.stats()
+        # Requests that joined an identical in-flight render count as hits
+        return stats["hits"] + stats["shared"], stats["misses"], stats["cached"]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_report_service():
+    """Return the process-wide ReportService"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ReportService()
+                register_cache("reports", _service.cache_counts)
+    return _service
@@ -0,0 +1,238 @@
+"""
+SQLite repository for stored assessments
+
+A zero-service persistence option: one SQLite file in WAL mode (readers
+never block the writer), a small per-process connection pool that is safe
+to use from Streamlit's script threads, batched inserts, and indexes on the
+columns benchmark and admin queries filter by.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import config
+from utils import DIMENSION_KEYS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    submitted_at REAL NOT NULL,
+    assessment_version TEXT NOT NULL,
+    framework_version TEXT NOT NULL,
+    answer_code INTEGER NOT NULL,
+    dim1 INTEGER NOT NULL,
+    dim2 INTEGER NOT NULL,
+    dim3 INTEGER NOT NULL,
+    dim4 INTEGER NOT NULL,
+    dim5 INTEGER NOT NULL,
+    dim6 INTEGER NOT NULL,
+    dim7 INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    industry TEXT,
+    org_size TEXT
+);
+CREATE INDEX IF NOT EXISTS assessments_submitted_at ON assessments (submitted_at);
+CREATE INDEX IF NOT EXISTS assessments_framework ON assessments (framework_version, submitted_at);
+CREATE INDEX IF NOT EXISTS assessments_industry ON assessments (industry, org_size);
+CREATE INDEX IF NOT EXISTS assessments_org_size ON assessments (org_size);
+"""
+
+_COLUMNS = (
+    'submitted_at', 'assessment_version', 'framework_version', 'answer_code',
+) + DIMENSION_KEYS + ('total', 'level', 'industry', 'org_size')
+
+_INSERT = (
+    f"INSERT INTO assessments ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+# Columns that queries may filter on (all indexed)
+_FILTERS = {
+    'framework_version': 'framework_version = ?',
+    'industry': 'industry = ?',
+    'org_size': 'org_size = ?',
+    'since': 'submitted_at >= ?',
+    'until': 'submitted_at < ?',
+}
+
+
+class AssessmentRepository:
+    """
+    Store and query assessments in a SQLite database
+
+    Connections are pooled per process (up to pool_size) and handed to one
+    thread at a time; statements use fixed SQL text so sqlite3's statement
+    cache reuses the prepared statements.
+    """
+
+    def __init__(self, path=None, pool_size=None):
+        self.path = Path(path) if path else Path(__file__).parent / config.ASSESSMENT_DB_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = queue.LifoQueue()
+        self._pool_size = pool_size or config.ASSESSMENT_DB_POOL_SIZE
+        self._created = 0
+        self._created_lock = threading.Lock()
+        with self.connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=64,
+        )
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of the block"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._created_lock:
+                create = self._created < self._pool_size
+                if create:
+                    self._created += 1
+            if not create:
+                conn = self._pool.get()
+            else:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    # Give the slot back, or failed connects would use up the pool
+                    with self._created_lock:
+                        self._created -= 1
+                    raise
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @staticmethod
+    def _row(record):
+        return tuple(record.get(column) for column in _COLUMNS)
+
+    def add(self, record):
+        """
+        Insert one assessment
+
+        Args:
+            record: Dict with the keys of build_record()
+        """
+        with self.connection() as conn:
+            conn.execute(_INSERT, self._row(record))
+
+    def add_many(self, records):
+        """Insert many assessments in one transaction"""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_INSERT, (self._row(record) for record in records))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _where(filters):
+        clauses = []
+        params = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name not in _FILTERS:
+                raise ValueError(f"Unsupported filter: {name}")
+            clauses.append(_FILTERS[name])
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, **filters):
+        """Number of assessments matching the filters (see _FILTERS)"""
+        where, params = self._where(filters)
+        with self.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM assessments{where}", params).fetchone()[0]
+
+    def level_distribution(self, **filters):
+        """Assessments per maturity level, as {level: count}"""
+        where, params = self._where(filters)
+        with self.connection() as conn:
+            rows = conn.execute(
+                f"SELECT level, COUNT(*) FROM assessments{where} GROUP BY level", params
+            ).fetchall()
+        return dict(rows)
+
+    def dimension_means(self, **filters):
+        """Mean of each dimension and the total, or None when nothing matches"""
+        where, params = self._where(filters)
+        columns = DIMENSION_KEYS + ('total',)
+        select = ", ".join(f"AVG({column})" for column in columns)
+        with self.connection() as conn:
+            row = conn.execute(f"SELECT {select} FROM assessments{where}", params).fetchone()
+        if row[0] is None:
+            return None
+        return dict(zip(columns, row))
+
+    def recent(self, limit=100, **filters):
+        """Most recent assessments as dicts, newest first"""
+        where, params = self._where(filters)
+        with self.connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM assessments{where} "
+                f"ORDER BY submitted_at DESC LIMIT ?",
+                params + [limit],
+            )
+            return [dict(zip(_COLUMNS, row)) for row in cursor.fetchall()]
+
+
+def build_record(packed, scores, level_number, industry=None, org_size=None):
+    """Row for AssessmentRepository.add from a scored submission"""
+    record = {
+        'submitted_at': time.time(),
+        'assessment_version': config.ASSESSMENT_VERSION,
+        'framework_version': config.FRAMEWORK_VERSION,
+        'answer_code': packed.code,
+        'total': scores['total'],
+        'level': level_number,
+        'industry': industry or None,
+        'org_size': org_size or None,
+    }
+    for key in DIMENSION_KEYS:
+        record[key] = scores[key]
+    return record
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository():
+    """Return the process-wide repository, or None if ASSESSMENT_DB_PATH is unset"""
+    global _repository
+    if not config.ASSESSMENT_DB_PATH:
+        return None
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = AssessmentRepository()
+    return _repository
+
+
+def store_assessment(packed, scores, level_number, **org_info):
+    """Persist a submitted assessment if the SQLite repository is enabled"""
+    repository = get_repository()
+    if repository is not None:
+        repository.add(build_record(packed, scores, level_number, **org_info))
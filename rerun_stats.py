@@ -0,0 +1,67 @@
+"""
+Script rerun counters for Job IQ
+
+Streamlit re-executes app.py for every interaction it is not told to batch
+(forms) or isolate (fragments). These counters make that work visible: every
+full run and fragment run is counted per process, and each completed
+assessment records how many full runs its session needed from page load to
+submit. Shown in the sidebar when config.DEBUG_MODE is on.
+"""
+
+import threading
+
+
+class RerunStats:
+    """Process-wide, thread-safe rerun counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.script_runs = 0
+        self.fragment_runs = 0
+        self.assessments = 0
+        self.assessment_runs = 0  # full runs behind the completed assessments
+
+    def record_run(self, fragment=False):
+        with self._lock:
+            if fragment:
+                self.fragment_runs += 1
+            else:
+                self.script_runs += 1
+
+    def record_assessment(self, runs):
+        """Count a completed assessment that took `runs` full script runs"""
+        with self._lock:
+            self.assessments += 1
+            self.assessment_runs += runs
+
+    def snapshot(self):
+        """
+        Current counters
+
+        Returns:
+            Dictionary with 'script_runs', 'fragment_runs', 'assessments' and
+            'runs_per_assessment' (None before the first assessment)
+        """
+        with self._lock:
+            return {
+                "script_runs": self.script_runs,
+                "fragment_runs": self.fragment_runs,
+                "assessments": self.assessments,
+                "runs_per_assessment": (
+                    self.assessment_runs / self.assessments if self.assessments else None
+                ),
+            }
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_rerun_stats():
+    """Return the process-wide RerunStats"""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = RerunStats()
+    return _stats
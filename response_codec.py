@@ -0,0 +1,123 @@
+"""
+Compact codec for Job IQ responses
+
+A full response set packs losslessly into a single answer code (< 2^25, so it
+fits a 32-bit integer). The code is the same index used by answer_table, so a
+stored or session-held code can be scored without rebuilding the dict.
+"""
+
+from answer_table import score_code
+from scoring_spec import SPEC
+
+
+class PackedResponses:
+    """
+    One respondent's answers as small integers
+
+    Single-choice fields hold option codes; checkbox fields hold bitmasks
+    (bit i set = the i-th key of that group is checked).
+    """
+
+    __slots__ = SPEC.encoded_fields
+
+    def __init__(self, *values, **fields):
+        """
+        Args:
+            values / fields: One value per SPEC.encoded_fields entry, in that
+                order or by field name
+
+        Raises:
+            TypeError: if a field is missing, repeated or unknown
+            ValueError: if a value is not an integer in range(radix) for its
+                field (see SPEC.field_radices)
+        """
+        if len(values) > len(SPEC.encoded_fields):
+            raise TypeError(f"Expected at most {len(SPEC.encoded_fields)} values, got {len(values)}")
+        positional = dict(zip(SPEC.encoded_fields, values))
+        repeated = positional.keys() & fields.keys()
+        if repeated:
+            raise TypeError(f"Values given twice: {', '.join(sorted(repeated))}")
+        fields.update(positional)
+        if fields.keys() != set(SPEC.encoded_fields):
+            raise TypeError(f"Expected values for exactly {', '.join(SPEC.encoded_fields)}")
+        for field, radix in zip(SPEC.encoded_fields, SPEC.field_radices):
+            value = fields[field]
+            if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value < radix:
+                raise ValueError(f"{field} must be an integer in range(0, {radix}), got {value!r}")
+            setattr(self, field, value)
+
+    @classmethod
+    def from_dict(cls, responses):
+        """
+        Build from a response dict as returned by render_assessment_form
+
+        Raises:
+            ValueError: if a single-choice answer is not one of the form's options
+        """
+        values = {}
+        for field, codes in SPEC.choice_codes.items():
+            answer = responses.get(field)
+            if answer not in codes:
+                raise ValueError(f"Unknown {field} answer: {answer!r}")
+            values[field] = codes[answer]
+        for field, keys in SPEC.checkbox_groups.items():
+            values[field] = sum(1 << bit for bit, key in enumerate(keys) if responses.get(key, False))
+        return cls(**values)
+
+    @classmethod
+    def from_code(cls, code):
+        """Rebuild from a packed answer code"""
+        code = int(code)
+        if not 0 <= code < SPEC.answer_space_size:
+            raise ValueError(f"Answer code out of range: {code}")
+        values = {}
+        for field, radix in zip(SPEC.encoded_fields, SPEC.field_radices):
+            code, values[field] = divmod(code, radix)
+        return cls(**values)
+
+    @property
+    def code(self):
+        """Packed answer code (int in range(SPEC.answer_space_size))"""
+        code = 0
+        weight = 1
+        for field, radix in zip(SPEC.encoded_fields, SPEC.field_radices):
+            code += getattr(self, field) * weight
+            weight *= radix
+        return code
+
+    def to_dict(self):
+        """Expand back into the form's response dict"""
+        responses = {field: SPEC.choice_options[field][getattr(self, field)] for field in SPEC.choice_options}
+        for field, keys in SPEC.checkbox_groups.items():
+            mask = getattr(self, field)
+            for bit, key in enumerate(keys):
+                responses[key] = bool(mask >> bit & 1)
+        return responses
+
+    def scores(self):
+        """Score these answers (same result as calculate_jdmi_score, plus 'level')"""
+        return score_code(self.code)
+
+    def __int__(self):
+        return self.code
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedResponses):
+            return NotImplemented
+        return self.code == other.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __repr__(self):
+        return f"PackedResponses.from_code({self.code})"
+
+
+def pack_responses(responses):
+    """Pack a response dict into a single answer code"""
+    return PackedResponses.from_dict(responses).code
+
+
+def unpack_responses(code):
+    """Expand an answer code back into the form's response dict"""
+    return PackedResponses.from_code(code).to_dict()
@@ -0,0 +1,113 @@
+"""
+Compiler for the declarative questionnaire/scoring spec
+
+config.QUESTIONNAIRE describes every question, its options and how it scores.
+compile_spec turns it into integer option codes and NumPy lookup arrays once,
+at import time; the form renderer, the scalar scorer (utils), the batch scorer
+(batch_scoring) and the packed answer code (response_codec, answer_table) are
+all driven from the compiled result.
+"""
+
+import numpy as np
+
+import config
+
+
+class CompiledSpec:
+    """
+    Lookup structures for one version of the questionnaire
+
+    Attributes:
+        version: Assessment version the spec belongs to
+        questionnaire: The source spec (list of dimension entries)
+        dimension_keys: ('dim1', ...) in form order
+        choice_options: field -> tuple of option labels (index = option code)
+        choice_codes: field -> {label: option code}
+        choice_points: field -> {label: points}
+        points_tables: field -> uint8 array of points by option code, with a
+            trailing 0 so that code -1 (unknown answer) scores 0
+        checkbox_groups: field -> tuple of response keys (bit i = keys[i] checked)
+        rules: one tuple per dimension, either
+            (dimension, 'choice', field) or
+            (dimension, 'checkboxes', ((field, divisor), ...), max_points)
+        encoded_fields: choice fields, then checkbox fields
+        field_radices: number of distinct values per encoded field
+        answer_space_size: number of distinct packed answer codes
+    """
+
+    def __init__(self, questionnaire, version):
+        self.version = version
+        self.questionnaire = questionnaire
+        self.dimension_keys = tuple(entry['dimension'] for entry in questionnaire)
+        self.choice_options = {}
+        self.choice_codes = {}
+        self.choice_points = {}
+        self.points_tables = {}
+        self.checkbox_groups = {}
+        self.rules = []
+
+        for entry in questionnaire:
+            dimension = entry['dimension']
+            if entry['type'] == 'choice':
+                field = entry['field']
+                self._check_new_field(field)
+                labels = tuple(label for label, _ in entry['options'])
+                points = [points for _, points in entry['options']]
+                if len(set(labels)) != len(labels):
+                    raise ValueError(f"Duplicate options for {field}")
+                self._check_points(dimension, max(points))
+                self.choice_options[field] = labels
+                self.choice_codes[field] = {label: code for code, label in enumerate(labels)}
+                self.choice_points[field] = dict(entry['options'])
+                self.points_tables[field] = np.array(points + [0], dtype=np.uint8)
+                self.rules.append((dimension, 'choice', field))
+            elif entry['type'] == 'checkboxes':
+                self._check_points(dimension, entry['max_points'])
+                groups = []
+                for group in entry['groups']:
+                    field = group['field']
+                    self._check_new_field(field)
+                    self.checkbox_groups[field] = tuple(key for key, _ in group['checkboxes'])
+                    groups.append((field, group['divisor']))
+                self.rules.append((dimension, 'checkboxes', tuple(groups), entry['max_points']))
+            else:
+                raise ValueError(f"Unknown question type for {dimension}: {entry['type']!r}")
+
+        self.rules = tuple(self.rules)
+        self.encoded_fields = tuple(self.choice_options) + tuple(self.checkbox_groups)
+        self.field_radices = tuple(len(labels) for labels in self.choice_options.values()) + tuple(
+            1 << len(keys) for keys in self.checkbox_groups.values()
+        )
+        self.answer_space_size = int(np.prod(self.field_radices))
+
+        # Set-bit counts for every possible checkbox mask
+        widest = max((len(keys) for keys in self.checkbox_groups.values()), default=0)
+        self.popcount = np.array([bin(mask).count('1') for mask in range(1 << widest)], dtype=np.uint8)
+
+    def _check_new_field(self, field):
+        if field in self.choice_options or field in self.checkbox_groups:
+            raise ValueError(f"Duplicate field in questionnaire: {field}")
+
+    @staticmethod
+    def _check_points(dimension, max_points):
+        if max_points > config.MAX_SCORE_PER_DIMENSION:
+            raise ValueError(
+                f"{dimension} can score {max_points}, above MAX_SCORE_PER_DIMENSION"
+            )
+
+
+def compile_spec(questionnaire, version=config.ASSESSMENT_VERSION):
+    """Compile a questionnaire spec (see config.QUESTIONNAIRE)"""
+    return CompiledSpec(questionnaire, version)
+
+
+# Compiled specs by assessment version
+SPECS = {config.ASSESSMENT_VERSION: compile_spec(config.QUESTIONNAIRE)}
+
+# Spec for the current assessment version
+SPEC = SPECS[config.ASSESSMENT_VERSION]
+
+
+def get_spec(version=None):
+    """Return the compiled spec for an assessment version (default: current)"""
+    return SPECS[version or config.ASSESSMENT_VERSION]
@@ -0,0 +1,187 @@
+"""
+Compact per-session assessment state for Job IQ
+
+A session that has submitted the form keeps a single SessionResult in
+st.session_state: the packed answer code, the optional org fields, and
+references to process-wide, read-only objects for everything derived from
+the answers:
+
+- scores: one mapping per dimension vector (dim1 .. dim7, total, level),
+  shared by every session with the same scores
+- level_info: one mapping per maturity level, including its description
+- recommendations: the interned entries of utils.recommendation_index()
+
+So an idle session costs a few hundred bytes, however long its level
+description or recommendation texts are.
+
+Report the bytes per session (tracemalloc):
+    python session_result.py [--sessions 10000]
+"""
+
+import argparse
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+import config
+from response_codec import PackedResponses
+from scoring_spec import SPEC
+from utils import DIMENSION_KEYS, dimension_vector_index, get_level_info, get_recommendations
+
+
+@lru_cache(maxsize=None)  # bounded by DIMENSION_VECTOR_COUNT
+def interned_scores(index):
+    """
+    Read-only scores for a dimension vector, shared across sessions
+
+    Args:
+        index: Dimension vector index (see utils.dimension_vector_index)
+
+    Returns:
+        Mapping keyed like PackedResponses.scores(): 'dim1' .. 'dim7',
+        'total' and 'level'
+    """
+    dim_scores = [(index // 5 ** i) % 5 for i in range(len(DIMENSION_KEYS))]
+    total = sum(dim_scores)
+    return MappingProxyType(dict(
+        zip(DIMENSION_KEYS, dim_scores),
+        total=total,
+        level=config.get_level_from_score(total),
+    ))
+
+
+@lru_cache(maxsize=None)
+def interned_level_info(number):
+    """Read-only level info (see utils.get_level_info) for a maturity level, shared across sessions"""
+    return MappingProxyType(get_level_info(config.LEVEL_THRESHOLDS[number][0]))
+
+
+def _intern(value):
+    return sys.intern(value) if value else None
+
+
+class SessionResult(namedtuple("SessionResult", ["answer_code", "scores", "level_info", "industry", "org_size"])):
+    """
+    One session's submitted assessment
+
+    answer_code is the packed answers (see response_codec); scores and
+    level_info are the interned mappings above.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_packed(cls, packed, industry=None, org_size=None):
+        """Build from PackedResponses and the optional org fields"""
+        scores = interned_scores(dimension_vector_index(packed.scores()))
+        return cls(
+            packed.code,
+            scores,
+            interned_level_info(scores["level"]),
+            _intern(industry),
+            _intern(org_size),
+        )
+
+    @property
+    def packed(self):
+        """The answers as PackedResponses"""
+        return PackedResponses.from_code(self.answer_code)
+
+    @property
+    def org_info(self):
+        """The org fields that were given, as keyword arguments for the sinks and peer lookups"""
+        return {
+            key: value
+            for key, value in (("industry", self.industry), ("org_size", self.org_size))
+            if value
+        }
+
+    @property
+    def recommendations(self):
+        """Interned recommendation entries (see utils.get_recommendations)"""
+        return get_recommendations(self.scores, self.level_info["number"])
+
+
+def measure_session_bytes(sessions=10000, seed=0):
+    """
+    Measure what idle sessions on the results page keep in memory
+
+    Builds, for random answers, the values app.py leaves in st.session_state
+    after an assessment (the SessionResult, the session cache with its
+    benchmark and percentile label, the run counters) and traces their
+    allocations. Streamlit's own per-session bookkeeping is not included.
+
+    Args:
+        sessions: Sessions to build
+        seed: Random seed for the answers
+
+    Returns:
+        Dictionary with 'sessions', 'bytes_per_session' and 'shared_bytes'
+        (interned score/level objects first created for these sessions)
+    """
+    import random
+    import tracemalloc
+
+    from benchmarks import get_benchmark_service
+    from caching import SessionCache
+    from percentiles import get_percentile_label
+
+    rng = random.Random(seed)
+    industries = [option for option in config.INDUSTRY_OPTIONS if option]
+    org_sizes = [option for option in config.ORG_SIZE_OPTIONS if option]
+    answers = [
+        (rng.randrange(SPEC.answer_space_size), rng.choice(industries), rng.choice(org_sizes))
+        for _ in range(sessions)
+    ]
+    benchmark = get_benchmark_service().snapshot()
+    labels = {total: sys.intern(get_percentile_label(total)) for total in range(config.MAX_SCORE + 1)}
+    SessionResult.from_packed(PackedResponses.from_code(0))  # answer table, recommendation index
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for code, _, _ in answers:
+            SessionResult.from_packed(PackedResponses.from_code(code)).recommendations
+        shared = tracemalloc.get_traced_memory()[0] - baseline
+
+        baseline = tracemalloc.get_traced_memory()[0]
+        states = []
+        for code, industry, org_size in answers:
+            result = SessionResult.from_packed(PackedResponses.from_code(code), industry, org_size)
+            cache = SessionCache()
+            cache.get("benchmark", lambda: benchmark)
+            cache.get("peer", lambda: None)
+            cache.get("percentile_label", lambda: labels[result.scores["total"]])
+            states.append({
+                "assessment_complete": True,
+                "result": result,
+                "script_runs": 3,
+                "actions_script_run": 3,
+                "session_cache": cache,
+            })
+        per_session = (tracemalloc.get_traced_memory()[0] - baseline) / sessions
+    finally:
+        tracemalloc.stop()
+
+    return {"sessions": sessions, "bytes_per_session": per_session, "shared_bytes": shared}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the memory each idle Job IQ session holds")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.sessions < 1:
+        parser.error("--sessions must be at least 1")
+
+    result = measure_session_bytes(args.sessions, args.seed)
+    per_session = result["bytes_per_session"]
+    print(f"{per_session:,.0f} bytes per session ({result['sessions']:,} sessions on the results page)")
+    print(f"{result['shared_bytes'] / 1024 ** 2:,.1f} MB shared by all sessions (interned scores and levels)")
+    for count in (10_000, 50_000):
+        print(f"{count:,} idle sessions: {count * per_session / 1024 ** 2:,.1f} MB of session state")
+
+
+if __name__ == "__main__":
+    main()
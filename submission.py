@@ -0,0 +1,344 @@
+"""
+Durable asynchronous submission of assessments to API_ENDPOINT_SUBMIT_ASSESSMENT
+
+The "Calculate My Job IQ" handler only appends to a local SQLite outbox;
+a background worker drains it in batches over one persistent HTTP
+connection, retrying with exponential backoff. Every assessment carries an
+idempotency key, so retries (or two processes racing on the same row) never
+create duplicates on the server.
+"""
+
+import http.client
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import config
+from utils import DIMENSION_KEYS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+class Outbox:
+    """
+    Durable, multi-process-safe queue of pending submissions (SQLite, WAL mode)
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else Path(__file__).parent / config.OUTBOX_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.wakeup = threading.Event()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connection(self):
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def append(self, payload, idempotency_key=None):
+        """
+        Queue a payload for submission (one local insert; never waits on the network)
+
+        Returns:
+            The idempotency key assigned to the payload
+        """
+        key = idempotency_key or uuid.uuid4().hex
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR IGNORE INTO outbox (idempotency_key, payload, created_at, next_attempt_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, json.dumps(payload), now, now),
+        )
+        self.wakeup.set()
+        return key
+
+    def claim(self, limit, lease_seconds):
+        """
+        Claim up to `limit` due rows for sending
+
+        Claimed rows are leased (not re-claimable) for lease_seconds, so
+        concurrent workers in other processes skip them.
+
+        Returns:
+            List of (id, idempotency_key, payload_dict, attempts)
+        """
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, idempotency_key, payload, attempts FROM outbox "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ? WHERE id = ?",
+                [(now + lease_seconds, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return [(row_id, key, json.loads(payload), attempts) for row_id, key, payload, attempts in rows]
+
+    def acknowledge(self, ids):
+        """Remove delivered rows"""
+        self._connection().executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def retry_later(self, ids, delay, error):
+        """Record a failed attempt and schedule the next one"""
+        self._connection().executemany(
+            "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            [(time.time() + delay, error, i) for i in ids],
+        )
+
+    def dead_letter(self, ids, error):
+        """Park rows the server permanently rejected (kept for inspection)"""
+        self._connection().executemany(
+            "UPDATE outbox SET attempts = attempts + 1, status = 'dead', last_error = ? WHERE id = ?",
+            [(error, i) for i in ids],
+        )
+
+    def stats(self):
+        """Queue depth, dead-lettered count and age of the oldest pending row"""
+        pending, oldest = self._connection().execute(
+            "SELECT COUNT(*), MIN(created_at) FROM outbox WHERE status = 'pending'"
+        ).fetchone()
+        dead = self._connection().execute(
+            "SELECT COUNT(*) FROM outbox WHERE status = 'dead'"
+        ).fetchone()[0]
+        return {
+            'queue_depth': pending,
+            'dead_lettered': dead,
+            'oldest_pending_age_seconds': time.time() - oldest if oldest else 0.0,
+        }
+
+
+class SubmissionError(Exception):
+    """A batch could not be delivered"""
+
+    def __init__(self, message, retryable=True, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class SubmissionWorker(threading.Thread):
+    """
+    Background thread that drains an Outbox to the submission endpoint
+
+    Keeps one persistent (keep-alive) HTTP connection, reopening it after
+    errors. Failed batches back off exponentially with jitter, honoring
+    Retry-After; 4xx responses other than 408/429 are dead-lettered.
+    """
+
+    def __init__(self, outbox, base_url=None, endpoint=None, batch_size=None,
+                 timeout=10.0, backoff_base=None, backoff_max=None):
+        super().__init__(name="jobiq-submission-worker", daemon=True)
+        base_url = base_url or config.API_BASE_URL
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            raise ValueError(f"Invalid API base URL: {base_url!r}")
+        self.outbox = outbox
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._path = parts.path.rstrip('/') + (endpoint or config.API_ENDPOINT_SUBMIT_ASSESSMENT)
+        self.batch_size = batch_size or config.OUTBOX_BATCH_SIZE
+        self.timeout = timeout
+        self.backoff_base = config.OUTBOX_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = config.OUTBOX_BACKOFF_MAX if backoff_max is None else backoff_max
+        self._conn = None
+        self._stopping = threading.Event()
+        self._counters_lock = threading.Lock()
+        self.counters = {
+            'sent': 0,
+            'batches': 0,
+            'failed_attempts': 0,
+            'in_flight': 0,
+            'last_error': None,
+            'last_success_at': None,
+        }
+
+    def _count(self, **changes):
+        with self._counters_lock:
+            for name, value in changes.items():
+                if name in ('last_error', 'last_success_at'):
+                    self.counters[name] = value
+                else:
+                    self.counters[name] += value
+
+    def _connection(self):
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self._scheme == 'https' else http.client.HTTPConnection
+            self._conn = cls(self._netloc, timeout=self.timeout)
+        return self._conn
+
+    def _reset_connection(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _post(self, rows):
+        batch_key = uuid.uuid5(uuid.NAMESPACE_OID, ",".join(key for _, key, _, _ in rows)).hex
+        body = json.dumps({
+            'assessments': [dict(payload, idempotency_key=key) for _, key, payload, _ in rows]
+        }).encode()
+        headers = {
+            'Content-Type': 'application/json',
+            'Idempotency-Key': batch_key,
+        }
+        try:
+            conn = self._connection()
+            conn.request('POST', self._path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._reset_connection()
+            raise SubmissionError(f"{type(e).__name__}: {e}") from e
+
+        if 200 <= response.status < 300:
+            return
+        retry_after = response.getheader('Retry-After')
+        retryable = response.status >= 500 or response.status in (408, 429)
+        raise SubmissionError(
+            f"HTTP {response.status}",
+            retryable=retryable,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+        )
+
+    def _backoff(self, attempts):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempts))
+        return delay * random.uniform(0.5, 1.0)
+
+    def drain_once(self):
+        """
+        Send one batch of due rows
+
+        Returns:
+            Number of rows claimed (0 when nothing is due)
+        """
+        rows = self.outbox.claim(self.batch_size, lease_seconds=self.timeout * 3)
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+        self._count(in_flight=len(rows))
+        try:
+            self._post(rows)
+        except SubmissionError as e:
+            self._count(failed_attempts=1, last_error=str(e))
+            if e.retryable:
+                attempts = max(row[3] for row in rows)
+                self.outbox.retry_later(ids, e.retry_after or self._backoff(attempts), str(e))
+            else:
+                self.outbox.dead_letter(ids, str(e))
+        else:
+            self.outbox.acknowledge(ids)
+            self._count(sent=len(rows), batches=1, last_success_at=time.time())
+        finally:
+            self._count(in_flight=-len(rows))
+        return len(rows)
+
+    def run(self):
+        while not self._stopping.is_set():
+            try:
+                claimed = self.drain_once()
+            except sqlite3.Error as e:
+                self._count(last_error=f"outbox: {e}")
+                claimed = 0
+            if not claimed:
+                # Idle: wait for a new append (or poll for rows whose backoff expired)
+                self.outbox.wakeup.wait(config.OUTBOX_POLL_INTERVAL)
+                self.outbox.wakeup.clear()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self.outbox.wakeup.set()
+        if self.ident is not None:  # Not started when driven through drain_once()
+            self.join(timeout)
+        self._reset_connection()
+
+    def metrics(self):
+        """Backpressure and delivery metrics for the queue"""
+        with self._counters_lock:
+            metrics = dict(self.counters)
+        metrics.update(self.outbox.stats())
+        metrics['saturated'] = metrics['queue_depth'] >= config.OUTBOX_HIGH_WATER_MARK
+        return metrics
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_submission_worker():
+    """
+    Return the process-wide worker, starting it on first use
+
+    Returns None when config.API_BASE_URL is not set.
+    """
+    global _worker
+    if not config.API_BASE_URL:
+        return None
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                worker = SubmissionWorker(Outbox())
+                worker.start()
+                _worker = worker
+    return _worker
+
+
+def build_payload(packed, scores, level_number, industry=None, org_size=None):
+    """Assessment payload sent to API_ENDPOINT_SUBMIT_ASSESSMENT"""
+    return {
+        'assessment_version': config.ASSESSMENT_VERSION,
+        'framework_version': config.FRAMEWORK_VERSION,
+        'submitted_at': time.time(),
+        'answer_code': packed.code,
+        'responses': packed.to_dict(),
+        'scores': {key: scores[key] for key in DIMENSION_KEYS},
+        'total': scores['total'],
+        'level': level_number,
+        'industry': industry or None,
+        'org_size': org_size or None,
+    }
+
+
+def submit_assessment(packed, scores, level_number, **org_info):
+    """
+    Queue an assessment for delivery if an API is configured
+
+    Args:
+        org_info: Optional industry and org_size, as given on the form
+
+    Returns:
+        The idempotency key, or None when submission is disabled
+    """
+    worker = get_submission_worker()
+    if worker is None:
+        return None
+    return worker.outbox.append(build_payload(packed, scores, level_number, **org_info))
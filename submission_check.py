@@ -0,0 +1,207 @@
+"""
+Delivery check for the submission outbox (submission.py)
+
+Runs a SubmissionWorker against a stand-in HTTP server (http.server) that
+answers a batch with 503, then 429 with Retry-After, then drops the
+connection after storing the batch, then 200. The server stores
+assessments by idempotency key, like the real endpoint. Checks that every
+queued assessment is stored exactly once, that the worker backs off between
+attempts and honors Retry-After, that retries resend the same idempotency
+keys, and that a 400 dead-letters its rows without retrying them.
+
+Usage:
+    python submission_check.py [--rows 5] [--retry-after 1]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from response_codec import PackedResponses
+from submission import Outbox, SubmissionWorker, build_payload
+
+SUBMIT_PATH = "/api/assessments"
+REJECT_PATH = "/api/rejects"
+
+# Stand-in action that stores the batch, then closes the connection unanswered
+DROP = "drop"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        keys = [item["idempotency_key"] for item in json.loads(body)["assessments"]]
+        server = self.server
+        with server.lock:
+            script = server.scripts.get(self.path, [])
+            action = script.pop(0) if script else (200, {})
+            server.requests.append({
+                "at": time.monotonic(),
+                "path": self.path,
+                "batch_key": self.headers.get("Idempotency-Key"),
+                "keys": keys,
+                "action": action,
+            })
+            if action == DROP or action[0] == 200:
+                for key in keys:
+                    if key in server.stored:
+                        server.duplicates += 1  # Idempotent: stored once, repeat acknowledged
+                    else:
+                        server.stored[key] = self.path
+
+        if action == DROP:
+            self.close_connection = True
+            return
+        status, headers = action
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in(scripts):
+    """
+    Start the stand-in endpoint on a free local port
+
+    Args:
+        scripts: Per path, the responses to give in order, as (status, headers)
+            or DROP; once a script runs out the path answers 200
+
+    Returns:
+        (server, base URL); stop it with server.shutdown()
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.scripts = {path: list(actions) for path, actions in scripts.items()}
+    server.requests = []
+    server.stored = {}
+    server.duplicates = 0
+    threading.Thread(target=server.serve_forever, name="jobiq-stand-in-api", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _queue(outbox, rows, first_code=0):
+    keys = []
+    for code in range(first_code, first_code + rows):
+        packed = PackedResponses.from_code(code)
+        scores = packed.scores()
+        keys.append(outbox.append(build_payload(packed, scores, scores["level"])))
+    return keys
+
+
+def _drain(worker, deadline):
+    # drain_once until nothing is pending (rows in backoff count as pending)
+    while worker.outbox.stats()["queue_depth"] and time.monotonic() < deadline:
+        if not worker.drain_once():
+            time.sleep(0.01)
+
+
+def check_delivery(rows=5, retry_after=1, backoff_base=0.05, timeout=30.0):
+    """
+    Deliver one batch through the scripted failures and one to a rejecting path
+
+    Args:
+        rows: Assessments per batch (each case sends one batch)
+        retry_after: Seconds sent in the 429's Retry-After header
+        backoff_base: Worker backoff base, in seconds
+        timeout: Seconds to wait for the outbox to drain
+
+    Returns:
+        Dictionary with 'failures' (list of failed expectations; empty on
+        success), 'requests' (as seen by the stand-in) and 'metrics' (the
+        submit worker's metrics once drained)
+    """
+    scripts = {
+        SUBMIT_PATH: [(503, {}), (429, {"Retry-After": str(retry_after)}), DROP],
+        REJECT_PATH: [(400, {})],
+    }
+    server, base_url = start_stand_in(scripts)
+    failures = []
+
+    def expect(condition, message):
+        if not condition:
+            failures.append(message)
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            deadline = time.monotonic() + timeout
+            outbox = Outbox(Path(directory) / "outbox.sqlite3")
+            worker = SubmissionWorker(outbox, base_url, SUBMIT_PATH, batch_size=rows,
+                                      backoff_base=backoff_base, backoff_max=1.0)
+            keys = _queue(outbox, rows)
+            _drain(worker, deadline)
+            metrics = worker.metrics()
+            worker.stop()
+
+            rejects = Outbox(Path(directory) / "rejects.sqlite3")
+            reject_worker = SubmissionWorker(rejects, base_url, REJECT_PATH, batch_size=rows,
+                                             backoff_base=backoff_base)
+            reject_keys = _queue(rejects, rows, first_code=rows)
+            _drain(reject_worker, deadline)
+            reject_stats = rejects.stats()
+            reject_worker.stop()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    submits = [request for request in server.requests if request["path"] == SUBMIT_PATH]
+    expect([request["action"] for request in submits] == scripts[SUBMIT_PATH] + [(200, {})],
+           f"expected 503, 429, dropped, 200; got {[request['action'] for request in submits]}")
+    expect(all(request["keys"] == keys for request in submits),
+           "retries did not resend the same assessments")
+    expect(len({request["batch_key"] for request in submits}) == 1,
+           "retries did not reuse the batch Idempotency-Key")
+    stored = sorted(key for key, path in server.stored.items() if path == SUBMIT_PATH)
+    expect(stored == sorted(keys), f"stored {len(stored)} of {rows} assessments")
+    expect(server.duplicates == rows,
+           f"expected the retry after the dropped response to repeat {rows} assessments, got {server.duplicates}")
+    if len(submits) == 4:
+        gaps = [later["at"] - earlier["at"] for earlier, later in zip(submits, submits[1:])]
+        expect(gaps[0] >= 0.5 * backoff_base, f"no backoff after the 503 ({gaps[0]:.3f}s)")
+        expect(gaps[1] >= retry_after, f"Retry-After not honored ({gaps[1]:.3f}s < {retry_after}s)")
+    expect(metrics["queue_depth"] == 0 and metrics["sent"] == rows,
+           f"outbox not drained: {metrics['queue_depth']} pending, {metrics['sent']} sent")
+    expect(metrics["failed_attempts"] == 3, f"expected 3 failed attempts, got {metrics['failed_attempts']}")
+
+    rejected = [request for request in server.requests if request["path"] == REJECT_PATH]
+    expect(len(rejected) == 1 and rejected[0]["keys"] == reject_keys,
+           f"a 400 should be sent once and not retried ({len(rejected)} requests)")
+    expect(reject_stats["dead_lettered"] == rows and reject_stats["queue_depth"] == 0,
+           f"expected {rows} dead-lettered rows, got {reject_stats['dead_lettered']}")
+    return {"failures": failures, "requests": server.requests, "metrics": metrics}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check outbox delivery against a stand-in endpoint")
+    parser.add_argument("--rows", type=int, default=5, help="assessments per batch")
+    parser.add_argument("--retry-after", type=int, default=1, help="seconds in the 429's Retry-After")
+    args = parser.parse_args(argv)
+    if args.rows < 1:
+        parser.error("--rows must be at least 1")
+
+    result = check_delivery(args.rows, args.retry_after)
+    start = result["requests"][0]["at"]
+    for request in result["requests"]:
+        action = "dropped" if request["action"] == DROP else f"HTTP {request['action'][0]}"
+        print(f"{request['at'] - start:7.3f}s  {request['path']}  {len(request['keys'])} assessments  {action}")
+    for failure in result["failures"]:
+        print(f"FAIL: {failure}")
+    if result["failures"]:
+        sys.exit(1)
+    print("OK: each assessment delivered exactly once; the rejected batch was dead-lettered")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+/*
+ * Job IQ helper scripts, bundled by assets.py and loaded from a data URI.
+ * Runs inside a components.html iframe; acts on the parent Streamlit page.
+ */
+(function () {
+  // Force the viewport to scroll to the top after layout is rendered
+  const goTop = () => {
+    try {
+      // Disable automatic scroll restoration
+      if ('scrollRestoration' in window.history) {
+        window.history.scrollRestoration = 'manual';
+      }
+
+      const doc = window.parent && window.parent.document ? window.parent.document : document;
+
+      // Try Streamlit main container first
+      const main = doc.querySelector('section.main')
+                || doc.querySelector('main')
+                || doc.body;
+
+      if (main && main.scrollTo) {
+        main.scrollTo({ top: 0, left: 0, behavior: 'auto' });
+      }
+
+      // Also scroll window as a fallback
+      window.scrollTo(0, 0);
+      if (window.parent && window.parent.scrollTo) {
+        window.parent.scrollTo(0, 0);
+      }
+    } catch (e) {
+      window.scrollTo(0, 0);
+    }
+  };
+
+  // Run immediately and once more after layout has likely settled
+  goTop();
+  setTimeout(goTop, 150);
+})();
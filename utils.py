@@ -2,108 +2,44 @@
 Utility functions for Job IQ scoring and recommendations
 """
 
-def calculate_jdmi_score(responses):
+from functools import lru_cache
+from types import MappingProxyType
+
+from config import get_level_from_score
+from scoring_spec import get_spec
+
+
+def calculate_jdmi_score(responses, version=None):
     """
     Calculate Job IQ score across 7 dimensions based on user responses
     
     Args:
         responses: Dictionary of user responses from the form
+        version: Assessment version whose scoring spec to apply (default: current)
         
     Returns:
         Dictionary with dimensional scores and total score
     """
     
-    scores = {
-        'dim1': 0,  # Coverage
-        'dim2': 0,  # Governance
-        'dim3': 0,  # Velocity
-        'dim4': 0,  # Architecture
-        'dim5': 0,  # Integration
-        'dim6': 0,  # Controls
-        'dim7': 0,  # Ability to Act
-        'total': 0
-    }
-    
-    # Dimension 1: Coverage/Completeness
-    coverage_map = {
-        "<25%": 0,
-        "25-49%": 1,
-        "50-74%": 2,
-        "75-89%": 3,
-        "≥90%": 4
-    }
-    scores['dim1'] = coverage_map.get(responses.get('coverage', ''), 0)
-    
-    # Dimension 2: Governance/Ownership
-    governance_map = {
-        "Ongoing governed program with clear ownership and regular reviews": 4,
-        "Primarily project-based with temporary ownership": 2,
-        "Decentralized — each function manages independently": 1,
-        "We do not actively manage job/skills data today": 0
-    }
-    scores['dim2'] = governance_map.get(responses.get('governance', ''), 0)
-    
-    # Dimension 3: Freshness/Velocity
-    velocity_map = {
-        "More than 30 days": 0,
-        "15-30 days": 1,
-        "8-14 days": 2,
-        "3-7 days": 3,
-        "Less than 3 days": 4
-    }
-    scores['dim3'] = velocity_map.get(responses.get('velocity', ''), 0)
-    
-    # Dimension 4: Architecture Alignment (count selected items, max 4)
-    arch_count = sum([
-        responses.get('arch_mobility', False),
-        responses.get('arch_comp', False),
-        responses.get('arch_planning', False)
-    ])
-    scores['dim4'] = min(arch_count, 4)
-    
-    # Dimension 5: System Integration
-    integration_map = {
-        "All core systems fully synchronized (HRIS, ATS, Comp, LMS)": 4,
-        "Most systems integrated (3 of 4)": 3,
-        "Some systems connected, but significant manual work": 1,
-        "Systems operate independently (manual exports/imports)": 0
-    }
-    scores['dim5'] = integration_map.get(responses.get('integration', ''), 0)
-    
-    # Dimension 6: Controls/Compliance (count selected items, max 4)
-    control_count = sum([
-        responses.get('control_ownership', False),
-        responses.get('control_approvals', False),
-        responses.get('control_lineage', False),
-        responses.get('control_bias', False)
-    ])
-    scores['dim6'] = min(control_count, 4)
-    
-    # Dimension 7: Ability to Act (count decision drivers + metrics, max 4)
-    act_decisions = sum([
-        responses.get('act_reskilling', False),
-        responses.get('act_mobility', False),
-        responses.get('act_comp', False),
-        responses.get('act_hiring', False),
-        responses.get('act_planning', False)
-    ])
-    
-    act_metrics = sum([
-        responses.get('metric_cycle', False),
-        responses.get('metric_exception', False),
-        responses.get('metric_ttp', False),
-        responses.get('metric_mobility', False)
-    ])
-    
-    # Score = min(4, decisions/2 + metrics)
-    # This gives weight to both making decisions AND tracking metrics
-    scores['dim7'] = min(4, int(act_decisions / 2) + act_metrics)
+    spec = get_spec(version)
+    scores = {}
+    
+    for rule in spec.rules:
+        if rule[1] == 'choice':
+            # Single-choice dimension: points of the selected option
+            dimension, _, field = rule
+            scores[dimension] = spec.choice_points[field].get(responses.get(field, ''), 0)
+        else:
+            # Checkbox dimension: checked count per group // divisor, capped
+            dimension, _, groups, max_points = rule
+            points = 0
+            for field, divisor in groups:
+                checked = sum([responses.get(key, False) for key in spec.checkbox_groups[field]])
+                points += int(checked / divisor)
+            scores[dimension] = min(points, max_points)
     
     # Calculate total
-    scores['total'] = sum([
-        scores['dim1'], scores['dim2'], scores['dim3'], scores['dim4'],
-        scores['dim5'], scores['dim6'], scores['dim7']
-    ])
+    scores['total'] = sum([scores[key] for key in spec.dimension_keys])
     
     return scores
 
@@ -222,143 +158,205 @@ def get_level_info(total_score):
         }
 
 
-def get_recommendations(scores, level):
-    """
-    Generate personalized recommendations based on scores and level
-    
-    Args:
-        scores: Dictionary of dimensional scores
-        level: Maturity level (1-5)
-        
-    Returns:
-        List of recommendation dictionaries
-    """
-    
-    recommendations = []
-    
-    # Get dimension scores as list
-    dim_scores = [
-        scores['dim1'], scores['dim2'], scores['dim3'], scores['dim4'],
-        scores['dim5'], scores['dim6'], scores['dim7']
-    ]
+def _recommendation(title, description):
+    return MappingProxyType({'title': title, 'description': description})
+
+
+# Shared, immutable recommendation catalog (id -> entry)
+RECOMMENDATIONS = MappingProxyType({
+    # Level-specific strategic recommendations
+    'level1_governance': _recommendation(
+        'Establish Foundational Governance',
+        'Assign a clear owner for job data governance. Start with 10-20 critical roles and establish a governed process for maintaining them. This creates the foundation for scaling.'
+    ),
+    'level1_pilot': _recommendation(
+        'Build Your Pilot',
+        'Choose one high-value use case (e.g., critical hiring roles or equity audit). Define skills, implement basic approval workflow, and track cycle time improvement. Use this to build executive support.'
+    ),
+    'level2_operating_model': _recommendation(
+        'Formalize Your Operating Model',
+        'Move from ad-hoc projects to an ongoing governed program. Define ownership across HR, Talent Acquisition, and Comp. Establish regular review cadences (quarterly minimum).'
+    ),
+    'level2_integration': _recommendation(
+        'Integrate Your Core Systems',
+        'Connect HRIS, ATS, and Compensation systems to ensure job data flows automatically. This eliminates manual rework and ensures consistency across recruiting, hiring, and comp decisions.'
+    ),
+    'level3_coverage_gap': _recommendation(
+        '⚠️ Address the Coverage-Governance Gap',
+        'You likely have decent coverage but weak governance—the exact trap our research identified. Before expanding coverage further, implement formal approval workflows, version control, and system synchronization. Otherwise your data becomes stale technical debt.'
+    ),
+    'level3_change_management': _recommendation(
+        'Implement Change Management Process',
+        'Establish SLAs for job updates (target: <7 days from request to publish). Create lightweight approval workflows that balance control with velocity. Track time-to-publish as a key metric.'
+    ),
+    'level4_analytics': _recommendation(
+        'Build Advanced Analytics Capabilities',
+        'Move from descriptive to predictive analytics. Build dashboards that surface skill gaps, succession risks, and mobility opportunities. Empower business leaders with self-service insights.'
+    ),
+    'level4_workforce_planning': _recommendation(
+        'Expand to Strategic Workforce Planning',
+        'Link your job architecture to 3-year workforce planning. Model future skill needs, identify build-vs-buy decisions, and quantify cost of skill gaps. Your governance foundation enables this.'
+    ),
+    'level5_leadership': _recommendation(
+        'Drive Industry Leadership',
+        'Share your practices at conferences and with industry peers. Your maturity model can influence how the broader market approaches job data governance. Consider publishing case studies.'
+    ),
+    'level5_innovation': _recommendation(
+        'Continuous Innovation',
+        'Explore AI-driven job description generation, real-time labor market intelligence integration, and predictive skill obsolescence modeling. Stay at the forefront of the field.'
+    ),
+    # Dimension-specific recommendations
+    'dim1_coverage': _recommendation(
+        'Expand Skills Coverage Strategically',
+        'Start with high-impact roles: critical hiring needs, executive positions, or roles with equity concerns. Use JDX\'s AI-assisted tools to accelerate inventory creation while maintaining quality.'
+    ),
+    'dim2_governance': _recommendation(
+        'Establish Governance Program',
+        'Assign a dedicated owner (e.g., Talent Management, HRBP lead). Define approval workflows with 3-5 day SLAs. Implement version control and audit trails. Move from projects to program.'
+    ),
+    'dim3_velocity': _recommendation(
+        'Accelerate Time-to-Publish',
+        'Your current cycle time is slowing hiring and comp decisions. Streamline approvals, automate status notifications, and implement async review processes. Target: <7 days for standard updates, <3 days for urgent.'
+    ),
+    'dim4_architecture': _recommendation(
+        'Build Job Architecture Framework',
+        'Define job levels, families, and career paths. Link skills to career progression and compensation bands. This scaffolding enables mobility, equity, and workforce planning initiatives.'
+    ),
+    'dim5_integration': _recommendation(
+        'Integrate HR Systems',
+        'Connect HRIS, ATS, LMS, and Compensation systems to create a single source of truth. Automate data propagation when jobs are updated. Eliminate manual exports/imports and version conflicts.'
+    ),
+    'dim6_controls': _recommendation(
+        'Implement Governance Controls',
+        'Add formal approval workflows, version history, and bias review checks. These controls ensure quality, compliance, and auditability—critical for legal defensibility and AI readiness.'
+    ),
+    'dim7_ability_to_act': _recommendation(
+        'Enable Data-Driven Decisions',
+        'Build analytics dashboards and link skills data to business processes (hiring, promotion, reskilling). Track metrics like cycle time, mobility rate, and time-to-fill. Demonstrate ROI to sustain investment.'
+    ),
+    # Cross-cutting recommendations
+    'prioritize_integration': _recommendation(
+        'Prioritize System Integration',
+        'Siloed systems create version conflicts and manual rework. Integrating HRIS, ATS, and Comp systems will have outsized impact on data quality and operational efficiency.'
+    ),
+    'ai_readiness': _recommendation(
+        'Prepare for AI-Driven Workforce Decisions',
+        'AI tools require clean, governed skills data. Without strong controls and analytics, AI will amplify existing data quality issues. Treat governance as a prerequisite for AI adoption—not an afterthought.'
+    ),
+})
+
+_LEVEL_RECOMMENDATIONS = {
+    1: ('level1_governance', 'level1_pilot'),
+    2: ('level2_operating_model', 'level2_integration'),
+    3: ('level3_coverage_gap', 'level3_change_management'),
+    4: ('level4_analytics', 'level4_workforce_planning'),
+    5: ('level5_leadership', 'level5_innovation'),
+}
+
+_DIMENSION_RECOMMENDATIONS = (
+    'dim1_coverage',
+    'dim2_governance',
+    'dim3_velocity',
+    'dim4_architecture',
+    'dim5_integration',
+    'dim6_controls',
+    'dim7_ability_to_act',
+)
+
+DIMENSION_KEYS = ('dim1', 'dim2', 'dim3', 'dim4', 'dim5', 'dim6', 'dim7')
+
+# Every dimension scores 0-4, so there are 5^7 possible dimension vectors
+DIMENSION_VECTOR_COUNT = 5 ** len(DIMENSION_KEYS)
+
+
+def dimension_vector_index(scores):
+    """Map a scores dict to its dimension vector index (base-5, dim1 least significant)"""
+    index = 0
+    for key in reversed(DIMENSION_KEYS):
+        index = index * 5 + scores[key]
+    return index
+
+
+def _select_recommendation_ids(dim_scores, level):
+    """Pick recommendation IDs for one dimension vector (the selection rules)"""
     
-    dim_names = [
-        "Coverage/Completeness",
-        "Governance/Ownership",
-        "Freshness/Velocity",
-        "Architecture Alignment",
-        "System Integration",
-        "Controls/Compliance",
-        "Ability to Act"
-    ]
+    # Level-specific strategic recommendations
+    ids = list(_LEVEL_RECOMMENDATIONS.get(level, _LEVEL_RECOMMENDATIONS[5]))
     
     # Find lowest scoring dimensions (priority gaps)
     lowest_score = min(dim_scores)
     lowest_dims = [i for i, score in enumerate(dim_scores) if score == lowest_score]
     
-    # Level-specific strategic recommendations
-    if level == 1:
-        recommendations.append({
-            'title': 'Establish Foundational Governance',
-            'description': 'Assign a clear owner for job data governance. Start with 10-20 critical roles and establish a governed process for maintaining them. This creates the foundation for scaling.'
-        })
-        recommendations.append({
-            'title': 'Build Your Pilot',
-            'description': 'Choose one high-value use case (e.g., critical hiring roles or equity audit). Define skills, implement basic approval workflow, and track cycle time improvement. Use this to build executive support.'
-        })
-    
-    elif level == 2:
-        recommendations.append({
-            'title': 'Formalize Your Operating Model',
-            'description': 'Move from ad-hoc projects to an ongoing governed program. Define ownership across HR, Talent Acquisition, and Comp. Establish regular review cadences (quarterly minimum).'
-        })
-        recommendations.append({
-            'title': 'Integrate Your Core Systems',
-            'description': 'Connect HRIS, ATS, and Compensation systems to ensure job data flows automatically. This eliminates manual rework and ensures consistency across recruiting, hiring, and comp decisions.'
-        })
-    
-    elif level == 3:
-        recommendations.append({
-            'title': '⚠️ Address the Coverage-Governance Gap',
-            'description': 'You likely have decent coverage but weak governance—the exact trap our research identified. Before expanding coverage further, implement formal approval workflows, version control, and system synchronization. Otherwise your data becomes stale technical debt.'
-        })
-        recommendations.append({
-            'title': 'Implement Change Management Process',
-            'description': 'Establish SLAs for job updates (target: <7 days from request to publish). Create lightweight approval workflows that balance control with velocity. Track time-to-publish as a key metric.'
-        })
-    
-    elif level == 4:
-        recommendations.append({
-            'title': 'Build Advanced Analytics Capabilities',
-            'description': 'Move from descriptive to predictive analytics. Build dashboards that surface skill gaps, succession risks, and mobility opportunities. Empower business leaders with self-service insights.'
-        })
-        recommendations.append({
-            'title': 'Expand to Strategic Workforce Planning',
-            'description': 'Link your job architecture to 3-year workforce planning. Model future skill needs, identify build-vs-buy decisions, and quantify cost of skill gaps. Your governance foundation enables this.'
-        })
-    
-    else:  # level == 5
-        recommendations.append({
-            'title': 'Drive Industry Leadership',
-            'description': 'Share your practices at conferences and with industry peers. Your maturity model can influence how the broader market approaches job data governance. Consider publishing case studies.'
-        })
-        recommendations.append({
-            'title': 'Continuous Innovation',
-            'description': 'Explore AI-driven job description generation, real-time labor market intelligence integration, and predictive skill obsolescence modeling. Stay at the forefront of the field.'
-        })
-    
-    # Dimension-specific recommendations (add top 2-3 gaps)
-    dim_recommendations = {
-        0: {  # Coverage
-            'title': 'Expand Skills Coverage Strategically',
-            'description': 'Start with high-impact roles: critical hiring needs, executive positions, or roles with equity concerns. Use JDX\'s AI-assisted tools to accelerate inventory creation while maintaining quality.'
-        },
-        1: {  # Governance
-            'title': 'Establish Governance Program',
-            'description': 'Assign a dedicated owner (e.g., Talent Management, HRBP lead). Define approval workflows with 3-5 day SLAs. Implement version control and audit trails. Move from projects to program.'
-        },
-        2: {  # Velocity
-            'title': 'Accelerate Time-to-Publish',
-            'description': 'Your current cycle time is slowing hiring and comp decisions. Streamline approvals, automate status notifications, and implement async review processes. Target: <7 days for standard updates, <3 days for urgent.'
-        },
-        3: {  # Architecture
-            'title': 'Build Job Architecture Framework',
-            'description': 'Define job levels, families, and career paths. Link skills to career progression and compensation bands. This scaffolding enables mobility, equity, and workforce planning initiatives.'
-        },
-        4: {  # Integration
-            'title': 'Integrate HR Systems',
-            'description': 'Connect HRIS, ATS, LMS, and Compensation systems to create a single source of truth. Automate data propagation when jobs are updated. Eliminate manual exports/imports and version conflicts.'
-        },
-        5: {  # Controls
-            'title': 'Implement Governance Controls',
-            'description': 'Add formal approval workflows, version history, and bias review checks. These controls ensure quality, compliance, and auditability—critical for legal defensibility and AI readiness.'
-        },
-        6: {  # Ability to Act
-            'title': 'Enable Data-Driven Decisions',
-            'description': 'Build analytics dashboards and link skills data to business processes (hiring, promotion, reskilling). Track metrics like cycle time, mobility rate, and time-to-fill. Demonstrate ROI to sustain investment.'
-        }
-    }
-    
     # Add top 2 dimension-specific recommendations
     for dim_idx in lowest_dims[:2]:
         if dim_scores[dim_idx] <= 2:  # Only add if significant gap
-            recommendations.append(dim_recommendations[dim_idx])
+            ids.append(_DIMENSION_RECOMMENDATIONS[dim_idx])
     
     # Add cross-cutting recommendation if system integration is low
-    if scores['dim5'] <= 1 and 4 not in lowest_dims:
-        recommendations.append({
-            'title': 'Prioritize System Integration',
-            'description': 'Siloed systems create version conflicts and manual rework. Integrating HRIS, ATS, and Comp systems will have outsized impact on data quality and operational efficiency.'
-        })
+    if dim_scores[4] <= 1 and 4 not in lowest_dims:
+        ids.append('prioritize_integration')
     
     # Add AI readiness recommendation for Level 3+ organizations
-    if level >= 3 and (scores['dim6'] <= 2 or scores['dim7'] <= 2):
-        recommendations.append({
-            'title': 'Prepare for AI-Driven Workforce Decisions',
-            'description': 'AI tools require clean, governed skills data. Without strong controls and analytics, AI will amplify existing data quality issues. Treat governance as a prerequisite for AI adoption—not an afterthought.'
-        })
+    if level >= 3 and (dim_scores[5] <= 2 or dim_scores[6] <= 2):
+        ids.append('ai_readiness')
+    
+    return tuple(ids[:5])  # Keep top 5 recommendations
+
+
+@lru_cache(maxsize=None)
+def recommendation_index():
+    """
+    Precompute recommendation IDs for every possible dimension vector
+
+    Built once per process. Identical ID tuples (and their catalog entries)
+    are shared between vectors.
+
+    Returns:
+        (ids_by_vector, entries_by_vector): tuples of length
+        DIMENSION_VECTOR_COUNT, indexed by dimension_vector_index
+    """
+    interned = {}
+    ids_by_vector = []
+    entries_by_vector = []
+    for index in range(DIMENSION_VECTOR_COUNT):
+        dim_scores = [(index // 5 ** i) % 5 for i in range(len(DIMENSION_KEYS))]
+        ids = _select_recommendation_ids(dim_scores, get_level_from_score(sum(dim_scores)))
+        if ids not in interned:
+            interned[ids] = (ids, tuple(RECOMMENDATIONS[rec_id] for rec_id in ids))
+        ids, entries = interned[ids]
+        ids_by_vector.append(ids)
+        entries_by_vector.append(entries)
+    return tuple(ids_by_vector), tuple(entries_by_vector)
+
+
+def get_recommendation_ids(scores):
+    """
+    Look up recommendation IDs (keys of RECOMMENDATIONS) for a scores dict
+
+    Returns:
+        Tuple of up to 5 recommendation IDs, shared across callers
+    """
+    return recommendation_index()[0][dimension_vector_index(scores)]
+
+
+def get_recommendations(scores, level):
+    """
+    Generate personalized recommendations based on scores and level
+    
+    Args:
+        scores: Dictionary of dimensional scores
+        level: Maturity level (1-5)
+        
+    Returns:
+        Tuple of up to 5 read-only recommendation mappings ('title', 'description')
+    """
+    
+    dim_scores = [scores[key] for key in DIMENSION_KEYS]
+    if level != get_level_from_score(sum(dim_scores)):
+        # Level not derived from these scores; apply the rules directly
+        return tuple(RECOMMENDATIONS[rec_id] for rec_id in _select_recommendation_ids(dim_scores, level))
     
-    return recommendations[:5]  # Return top 5 recommendations
+    return recommendation_index()[1][dimension_vector_index(scores)]
 
 
 def get_dimension_descriptions():